@@ -0,0 +1,165 @@
+import numpy as np
+from estimation import Variables, Approximation
+
+
+class Adjoint(Variables):
+    """
+    Discrete adjoint of one explicit Runge-Kutta step
+
+    For y1 = y0 + h * sum_i b_i k_i with stages Y_i = y0 + h * sum_j a_ij k_j,
+    the adjoint variable lam = dG/dy1 is pulled back through the stages in
+    reverse order:
+
+        w_i = h * (b_i * lam + sum_{j > i} a_ji * v_j)
+        v_i = J_y(Y_i)^T w_i,   mu += J_p(Y_i)^T w_i
+
+    and dG/dy0 = lam + sum_i v_i. This gives the exact gradient of the
+    discrete solution on the accepted grid. The products J^T w are vector-
+    Jacobian products (Jacobian.vjp), so no Jacobian matrix is formed when
+    a vjp is supplied.
+
+    Book: Solving Ordinary Differential Equations II: Stiff and
+          Differential-Algebraic Problems (1996)
+    Author(s): E. Hairer, G. Wanner
+    Chapter: VI.9 Adjoint methods
+
+    """
+
+    def __init__(self, jacobian, t0, y_init, h, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jacobian = jacobian
+        self.t = t0
+        self.y = y_init
+        self.h = h
+        self.slopes()
+
+    def slopes(self):
+        f = self.jacobian.f
+        params = self.jacobian.params
+
+        self.k = np.zeros((self.stages, len(self.y)))
+        self.ystages = np.zeros((self.stages, len(self.y)))
+        for i in range(self.stages):
+            matA = 0.0
+            for j in range(i):
+                matA += self.a[i, j] * self.h * self.k[j, :]
+            self.ystages[i, :] = self.y + matA
+            self.k[i, :] = f(self.t + self.c[i] * self.h, self.ystages[i, :], params)
+        self.jacobian.nfev += self.stages
+
+        return self.k
+
+    def backward(self, lam, weights):
+        v = np.zeros((self.stages, len(self.y)))
+        mu = 0.0
+        for i in reversed(range(self.stages)):
+            w = weights[i] * lam
+            for j in range(i + 1, self.stages):
+                w = w + self.a[j, i] * v[j, :]
+            w = self.h * w
+
+            if not np.any(w):
+                continue
+
+            v[i, :], wp = self.jacobian.vjp(
+                self.t + self.c[i] * self.h, self.ystages[i, :], w
+            )
+            mu = mu + wp
+
+        return lam + np.sum(v, axis=0), mu
+
+
+class Checkpoints:
+    """
+    Storage schedule for the states of the forward pass
+
+    'all'       -- every accepted state is kept, no recomputation.
+    integer k   -- every k-th state is kept; each segment is recomputed once
+                   during the backward pass, O(N / k + k) states in memory.
+    'bisection' -- only the initial state is kept; segments are split
+                   recursively in halves, O(log N) states in memory at the
+                   price of O(N log N) recomputed steps.
+
+    """
+
+    def __init__(self, f, params, method, weights, schedule):
+        self.f = f
+        self.params = params
+        self.method = method
+        self.weights = weights
+        self.schedule = schedule.lower() if type(schedule) == str else int(schedule)
+        if self.schedule not in ("all", "bisection") and type(self.schedule) == str:
+            raise RuntimeError(
+                "Checkpoint schedule is unknown. Available schedules are: 'all', 'bisection', or an integer spacing."
+            )
+        if type(self.schedule) == int and self.schedule < 1:
+            raise ValueError("Checkpoint spacing must be at least 1")
+
+        self.states = {}
+        self.nrecomputed = 0
+        self.nstored = 0
+
+    def keep(self, i):
+        if self.schedule == "all":
+            return True
+        elif self.schedule == "bisection":
+            return i == 0
+        return i % self.schedule == 0
+
+    def store(self, i, y):
+        if self.keep(i):
+            self.states[i] = y
+            self.nstored = max(self.nstored, len(self.states))
+
+    def advance(self, tsol, hsol, i, j, y):
+        for m in range(i, j):
+            yt = Approximation(self.f, tsol[m], y, self.params, hsol[m], self.method)
+            t, y = yt.y_approx(self.weights)
+        self.nrecomputed += j - i
+        return y
+
+    def segment(self, tsol, hsol, i, j):
+        # States y_i, ..., y_{j-1} of one checkpoint segment
+        ys = [self.states[i]]
+        for m in range(i, j - 1):
+            ys.append(self.advance(tsol, hsol, m, m + 1, ys[-1]))
+        return ys
+
+    def step(self, jacobian, tsol, hsol, i, y, lam, mu):
+        adj = Adjoint(jacobian, tsol[i], y, hsol[i], self.method)
+        lam, dmu = adj.backward(lam, self.weights)
+        return lam, mu + dmu
+
+    def bisect(self, jacobian, tsol, hsol, i, j, y, lam, mu):
+        if j - i == 1:
+            return self.step(jacobian, tsol, hsol, i, y, lam, mu)
+
+        mid = (i + j) // 2
+        ymid = self.advance(tsol, hsol, i, mid, y)
+
+        self.nheld += 1
+        self.nstored = max(self.nstored, self.nheld)
+        lam, mu = self.bisect(jacobian, tsol, hsol, mid, j, ymid, lam, mu)
+        self.nheld -= 1
+
+        return self.bisect(jacobian, tsol, hsol, i, mid, y, lam, mu)
+
+    def reverse(self, jacobian, tsol, hsol, lam):
+        nsteps = len(hsol)
+        mu = np.zeros(len(self.params))
+
+        if self.schedule == "bisection":
+            self.nheld = len(self.states)
+            return self.bisect(
+                jacobian, tsol, hsol, 0, nsteps, self.states[0], lam, mu
+            )
+
+        spacing = 1 if self.schedule == "all" else self.schedule
+        for i in sorted([i for i in self.states if i < nsteps], reverse=True):
+            j = min(i + spacing, nsteps)
+            ys = self.segment(tsol, hsol, i, j)
+            self.nstored = max(self.nstored, len(self.states) + len(ys) - 1)
+            for m in reversed(range(i, j)):
+                lam, mu = self.step(jacobian, tsol, hsol, m, ys[m - i], lam, mu)
+
+        return lam, mu
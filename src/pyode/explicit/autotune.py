@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import hashlib
+import numpy as np
+from cache import fingerprint
+from step_size import Propagator
+
+
+class Autotune:
+    """
+    Choice of the explicit tableau by pilot integrations
+
+    Every candidate integrates the first part of the interval (window, as a
+    fraction of t_range) with the requested tolerances. The cost is the
+    wall time per unit of simulated time, the number of right-hand side
+    evaluations per unit time is reported alongside. Candidates that fail
+    on the window are ruled out. The cheapest one is used for the full
+    solve.
+
+    With a store (path of a JSON file), decisions are kept under a key made
+    of the right-hand side fingerprint, the number of equations and the
+    tolerances, and later runs of the same problem skip the pilots. The
+    parameters and initial values are not part of the key, so that a sweep
+    over them reuses one decision.
+
+    """
+
+    def __init__(self, f, params, candidates=None, window=0.1, store=None):
+        self.f = f
+        self.params = params
+        self.candidates = candidates or [
+            "cash-karp",
+            "rkv56",
+            "rkf45",
+            "rkf78",
+            "rk78",
+            "default",
+        ]
+        self.window = window
+        self.store = store
+
+    def key(self, n, abstol, reltol):
+        h = hashlib.sha256()
+        h.update(fingerprint(self.f).encode())
+        h.update(f"{n}:{abstol!r}:{reltol!r}:{sorted(self.candidates)}".encode())
+        return h.hexdigest()
+
+    def load(self):
+        if self.store is None or not os.path.exists(self.store):
+            return {}
+        with open(self.store) as fh:
+            return json.load(fh)
+
+    def save(self, key, decision):
+        decisions = self.load()
+        decisions[key] = decision
+        tmp = f"{self.store}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(decisions, fh, indent=1)
+        os.replace(tmp, self.store)
+
+    def pilot(self, method, t_range, yinit, abstol, reltol):
+        prop = Propagator(self.f, self.params, method)
+        start = time.perf_counter()
+        try:
+            tsol, ysol = prop.solve(t_range, yinit, abstol, reltol)
+        except (ValueError, FloatingPointError, OverflowError):
+            return np.inf, np.inf
+        elapsed = time.perf_counter() - start
+        span = abs(t_range[-1] - t_range[0])
+        return elapsed / span, prop.nfev / span
+
+    def choose(self, t_range, yinit, abstol, reltol):
+        key = self.key(len(yinit), abstol, reltol)
+        decisions = self.load()
+        if key in decisions:
+            decision = dict(decisions[key])
+            decision["stored"] = True
+            return decision["method"], decision
+
+        t0, tend = t_range[0], t_range[-1]
+        window = np.array([t0, t0 + self.window * (tend - t0)])
+
+        results = {}
+        for method in self.candidates:
+            cost, nfev = self.pilot(method, window, yinit, abstol, reltol)
+            results[method] = {"time per unit time": cost, "evaluations per unit time": nfev}
+
+        best = min(results, key=lambda m: results[m]["time per unit time"])
+        if not np.isfinite(results[best]["time per unit time"]):
+            raise ValueError("No candidate method completed the pilot integration")
+
+        decision = {"method": best, "pilots": results}
+        if self.store is not None:
+            self.save(key, decision)
+        decision["stored"] = False
+        return best, decision
@@ -0,0 +1,241 @@
+import os
+import json
+import types
+import hashlib
+import functools
+import numpy as np
+from collections import OrderedDict
+
+
+def digest(h, value, seen):
+    """
+    Feed a stable description of value into the hash h
+
+    Numbers, strings and arrays are hashed by content. Functions are hashed
+    by their byte code, constants, closure cells, defaults and the globals
+    they reference, recursively, so that editing the right-hand side or a
+    constant it reads changes the key. Modules, builtins and classes are
+    hashed by name. Objects that are already on the stack are only hashed
+    by type, which ends recursive references.
+
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        h.update(f"{value.dtype.str}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}[{len(value)}];".encode())
+        for v in value:
+            digest(h, v, seen)
+    elif isinstance(value, dict):
+        h.update(f"dict[{len(value)}];".encode())
+        for k in sorted(value, key=repr):
+            digest(h, k, seen)
+            digest(h, value[k], seen)
+    elif isinstance(value, types.ModuleType):
+        h.update(f"module:{value.__name__};".encode())
+    elif isinstance(value, type):
+        h.update(f"type:{value.__module__}.{value.__qualname__};".encode())
+    elif id(value) in seen:
+        h.update(f"seen:{type(value).__name__};".encode())
+    elif isinstance(value, types.FunctionType):
+        seen.add(id(value))
+        code(h, value.__code__, value.__globals__, seen)
+        digest(h, value.__defaults__, seen)
+        digest(h, value.__kwdefaults__, seen)
+        cells = value.__closure__ or ()
+        digest(h, [c.cell_contents for c in cells if cell_filled(c)], seen)
+        seen.discard(id(value))
+    elif isinstance(value, types.MethodType):
+        digest(h, value.__func__, seen)
+        digest(h, value.__self__, seen)
+    elif isinstance(value, functools.partial):
+        digest(h, (value.func, value.args, value.keywords), seen)
+    elif isinstance(value, (types.BuiltinFunctionType, np.ufunc)):
+        h.update(f"builtin:{getattr(value, '__module__', '')}.{value.__name__};".encode())
+    elif hasattr(value, "__dict__"):
+        seen.add(id(value))
+        h.update(f"object:{type(value).__module__}.{type(value).__qualname__};".encode())
+        digest(h, vars(value), seen)
+        if hasattr(type(value), "__call__") and callable(value):
+            digest(h, type(value).__call__, seen)
+        seen.discard(id(value))
+    else:
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def cell_filled(cell):
+    try:
+        cell.cell_contents
+    except ValueError:
+        return False
+    return True
+
+
+def code(h, co, globs, seen):
+    h.update(co.co_code)
+    h.update(repr(co.co_names).encode())
+    for c in co.co_consts:
+        if isinstance(c, types.CodeType):
+            code(h, c, globs, seen)
+        else:
+            digest(h, c, seen)
+    # Globals read by the function (and its nested functions)
+    for name in co.co_names:
+        if name in globs:
+            h.update(f"global:{name};".encode())
+            digest(h, globs[name], seen)
+
+
+def fingerprint(func):
+    h = hashlib.sha256()
+    digest(h, func, set())
+    return h.hexdigest()
+
+
+###------------------------------###
+
+
+class ResultCache:
+    """
+    Memoisation of solver results under content-addressed keys
+
+    The key is a SHA-256 hash of the right-hand side fingerprint (code,
+    closure and referenced globals) and of all inputs that change the
+    result. Results are kept in an in-process LRU that is bounded by
+    max_bytes; the least recently used entries are dropped first. With a
+    directory, every result is also written there as .npy files and read
+    back as memory-mapped arrays, so the store survives the process and is
+    shared between processes. Memory-mapped arrays do not count against the
+    in-process budget. The remaining values are kept as JSON next to the
+    arrays, and nothing in the directory is unpickled on reading; entries
+    holding values that JSON cannot represent stay in memory only.
+
+    A hit returns a new Solution around the stored arrays, which are read
+    only, without integrating.
+
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, func, *inputs):
+        h = hashlib.sha256()
+        h.update(fingerprint(func).encode())
+        digest(h, inputs, set())
+        return h.hexdigest()
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+        if self.directory is not None:
+            entry = self.load(key)
+            if entry is not None:
+                self.hits += 1
+                self.remember(key, entry, 0)
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, key, entry):
+        # entry: dict of arrays and plain values; arrays are stored read-only
+        frozen = {}
+        nbytes = 0
+        for name, value in entry.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+                value.setflags(write=False)
+                nbytes += value.nbytes
+            frozen[name] = value
+
+        if self.directory is not None:
+            self.save(key, frozen)
+        self.remember(key, frozen, nbytes)
+
+    def remember(self, key, entry, nbytes):
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+        if nbytes > self.max_bytes:
+            return
+        self.entries[key] = (entry, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            old, (e, n) = self.entries.popitem(last=False)
+            self.nbytes -= n
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def save(self, key, entry):
+        path = self.path(key)
+        if os.path.isdir(path):
+            return
+
+        # Written to a temporary directory and renamed, so that readers
+        # never see a partial entry
+        tmp = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        files = []
+
+        def encode(value):
+            # Arrays, also nested ones such as stats, go to .npy files
+            if isinstance(value, np.ndarray) and value.dtype != object:
+                name = f"{len(files)}.npy"
+                np.save(os.path.join(tmp, name), value, allow_pickle=False)
+                files.append(name)
+                return {"__npy__": name}
+            if isinstance(value, np.generic):
+                return value.item()
+            raise TypeError(f"{type(value).__name__} cannot be stored")
+
+        try:
+            with open(os.path.join(tmp, "meta.json"), "w") as fh:
+                json.dump(entry, fh, default=encode)
+        except (TypeError, ValueError):
+            remove(tmp)
+            return
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # Stored by another process in the meantime
+            remove(tmp)
+
+    def load(self, key):
+        path = self.path(key)
+        meta = os.path.join(path, "meta.json")
+        if not os.path.isfile(meta):
+            return None
+
+        def decode(obj):
+            if list(obj) == ["__npy__"]:
+                name = os.path.basename(obj["__npy__"])
+                return np.load(os.path.join(path, name), mmap_mode="r")
+            return obj
+
+        with open(meta) as fh:
+            return json.load(fh, object_hook=decode)
+
+
+def remove(directory):
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
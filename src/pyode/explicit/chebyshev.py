@@ -0,0 +1,215 @@
+import numpy as np
+from step_size import StepSize, ErrorControl
+
+
+class Chebyshev:
+    """
+    Second order Runge-Kutta-Chebyshev integration for mildly stiff problems
+
+    An s-stage step follows the three-term recurrence of the shifted
+    Chebyshev polynomials,
+
+        Y_j = (1 - mu_j - nu_j) y + mu_j Y_{j-1} + nu_j Y_{j-2}
+              + mut_j h f(Y_{j-1}) + gamt_j h f(y)
+
+    and is stable on the negative real axis up to beta(s) ~ 0.653 s^2, so
+    the number of stages grows only with the square root of h * rho, rho
+    being the spectral radius of the Jacobian. rho is estimated by a
+    nonlinear power iteration on f (no Jacobian is formed), kept for
+    several steps and refreshed after a rejected step. Only the current
+    and two previous stages are stored.
+
+    Title: RKC: An explicit solver for parabolic PDEs
+    Author(s): B.P. Sommeijer, L.F. Shampine and J.G. Verwer
+    Journal of Computational and Applied Mathematics, Vol 88, No 2, 1998
+
+    """
+
+    def __init__(self, f, params, spectral_radius=None, refresh=25, smax=250):
+        self.f = f
+        self.params = params
+        self.radius = spectral_radius
+        self.refresh = refresh
+        self.smax = smax
+        self.eps = 2 / 13
+        self.p = 2
+
+        self.cache = {}
+        self.v = None  # last dominant direction of the power iteration
+        self.nfev = 0
+        self.nrho = 0
+
+    def coefficients(self, s):
+        if s in self.cache:
+            return self.cache[s]
+
+        w0 = 1 + self.eps / s**2
+        T = np.zeros(s + 1)
+        dT = np.zeros(s + 1)
+        ddT = np.zeros(s + 1)
+        T[0], T[1] = 1.0, w0
+        dT[1] = 1.0
+        for j in range(2, s + 1):
+            T[j] = 2 * w0 * T[j - 1] - T[j - 2]
+            dT[j] = 2 * T[j - 1] + 2 * w0 * dT[j - 1] - dT[j - 2]
+            ddT[j] = 4 * dT[j - 1] + 2 * w0 * ddT[j - 1] - ddT[j - 2]
+        w1 = dT[s] / ddT[s]
+
+        b = np.zeros(s + 1)
+        b[2:] = ddT[2:] / dT[2:] ** 2
+        b[0] = b[1] = b[2]
+        a = 1 - b * T
+
+        mu = np.zeros(s + 1)
+        nu = np.zeros(s + 1)
+        mut = np.zeros(s + 1)
+        gamt = np.zeros(s + 1)
+        c = np.zeros(s + 1)
+        mut[1] = b[1] * w1
+        c[1] = mut[1]
+        for j in range(2, s + 1):
+            mu[j] = 2 * b[j] * w0 / b[j - 1]
+            nu[j] = -b[j] / b[j - 2]
+            mut[j] = 2 * b[j] * w1 / b[j - 1]
+            gamt[j] = -a[j - 1] * mut[j]
+            c[j] = mu[j] * c[j - 1] + nu[j] * c[j - 2] + mut[j] + gamt[j]
+
+        self.cache[s] = (mu, nu, mut, gamt, c)
+        return self.cache[s]
+
+    def spectral_radius(self, t, y, fy):
+        self.nrho += 1
+        if self.radius is not None:
+            return self.radius(t, y, self.params)
+
+        # Nonlinear power iteration, started from the last direction
+        v = self.v if self.v is not None else fy.copy()
+        if not np.any(v):
+            v = np.ones_like(y)
+        ynrm = np.sqrt(np.sum(y**2))
+        delta = np.sqrt(np.finfo(float).eps) * max(ynrm, 1.0)
+
+        rho = 0.0
+        for i in range(50):
+            v = delta * v / max(np.sqrt(np.sum(v**2)), np.finfo(float).tiny)
+            fv = self.f(t, y + v, self.params)
+            self.nfev += 1
+            v = fv - fy
+            rho_old = rho
+            rho = np.sqrt(np.sum(v**2)) / delta
+            if i > 0 and abs(rho - rho_old) <= 0.01 * max(rho, 1.0):
+                break
+
+        self.v = v
+        return 1.2 * rho
+
+    def stages(self, h, rho):
+        s = int(1 + np.sqrt(1 + 1.54 * h * rho))
+        return min(max(s, 2), self.smax)
+
+    def step(self, t, y, fy, h, s):
+        mu, nu, mut, gamt, c = self.coefficients(s)
+
+        Y0 = y
+        Y1 = y + mut[1] * h * fy
+        for j in range(2, s + 1):
+            F = self.f(t + c[j - 1] * h, Y1, self.params)
+            Y2 = (
+                (1 - mu[j] - nu[j]) * y
+                + mu[j] * Y1
+                + nu[j] * Y0
+                + mut[j] * h * F
+                + gamt[j] * h * fy
+            )
+            Y0, Y1 = Y1, Y2
+        self.nfev += s - 1
+
+        return Y1
+
+    def solve(self, t_range, yinit, abstol, reltol):
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        ss = StepSize(self.f, t, yinit, self.params, "default", 2)
+        hh, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+
+        ya = yinit.copy()
+        fa = self.f(t, ya, self.params)
+        self.nfev += 1
+        rho = self.spectral_radius(t, ya, fa)
+        age = 0
+
+        tsol = [t]
+        ysol = [ya]
+
+        nsteps = 1
+        nfailed = 0
+        maxstages = 0
+
+        while tdir * (tend - t) > 0:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+            # Largest step that the stage limit can keep stable
+            hh = min(hh, 0.653 * (self.smax**2 - 1) / max(rho, np.finfo(float).tiny))
+            if 1.1 * hh >= abs(tend - t):
+                hh = abs(tend - t)
+
+            noFailed = True
+
+            while True:
+                h = tdir * hh
+                s = self.stages(hh, rho)
+                y = self.step(t, ya, fa, h, s)
+                fy = self.f(t + h, y, self.params)
+                self.nfev += 1
+
+                # Local error estimate of RKC
+                est = 0.8 * (ya - y) + 0.4 * h * (fa + fy)
+                err = ctrl.error(ya, y, est)
+
+                if err > rtol:
+                    nfailed += 1
+                    if hh < hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    hh = ctrl.reject(hh, hmin, err)
+                    rho = self.spectral_radius(t, ya, fa)
+                    age = 0
+                    continue
+
+                break
+
+            if noFailed:
+                hh = ctrl.accept(hh, err)
+
+            maxstages = max(maxstages, s)
+            t1 = t + h
+            t = tend if abs(tend - t1) <= hmin else t1
+            ya, fa = y, fy
+            tsol.append(t)
+            ysol.append(ya)
+            nsteps += 1
+
+            age += 1
+            if age >= self.refresh:
+                rho = self.spectral_radius(t, ya, fa)
+                age = 0
+
+        return (
+            np.array(tsol),
+            np.array(ysol),
+            {
+                "total steps": nsteps,
+                "failed steps": nfailed,
+                "function evaluations": self.nfev,
+                "spectral radius estimates": self.nrho,
+                "max stages": maxstages,
+                "absolute error": ctrl.atol,
+                "relative error": rtol,
+            },
+        )
@@ -0,0 +1,295 @@
+import numpy as np
+from estimation import Variables
+from step_size import StepSize, ErrorControl
+
+
+class History:
+    """
+    Ring buffer of dense-output segments
+
+    Every accepted step [t0, t1] is stored as a cubic Hermite segment
+    (y0, y1, f0, f1) in preallocated arrays. Once the buffer is full, the
+    oldest segment is overwritten. The segment start times are sorted on
+    both sides of the write position, so a lookup is two binary searches
+    (O(log n)) and never scans the stored trajectory.
+
+    Times before the initial time are served by the history function. Times
+    after the last segment are extrapolated from it (delays shorter than
+    the current step).
+
+    """
+
+    def __init__(self, history, t0, n_odes, params, capacity=4096):
+        self.history = history
+        self.t0 = t0
+        self.params = params
+        self.capacity = capacity
+
+        self.ts = np.zeros((capacity,))
+        self.te = np.zeros((capacity,))
+        self.y0 = np.zeros((capacity, n_odes))
+        self.y1 = np.zeros((capacity, n_odes))
+        self.f0 = np.zeros((capacity, n_odes))
+        self.f1 = np.zeros((capacity, n_odes))
+
+        self.head = 0  # next write position
+        self.count = 0
+
+    def push(self, t0, t1, y0, y1, f0, f1):
+        i = self.head
+        self.ts[i], self.te[i] = t0, t1
+        self.y0[i, :], self.y1[i, :] = y0, y1
+        self.f0[i, :], self.f1[i, :] = f0, f1
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def oldest(self):
+        return self.ts[self.head if self.count == self.capacity else 0]
+
+    def locate(self, tq):
+        if self.count < self.capacity:
+            idx = np.searchsorted(self.ts[: self.count], tq, side="right") - 1
+            return np.clip(idx, 0, self.count - 1)
+
+        # Full ring: [head:] holds the older segments, [:head] the newer ones
+        newer = (self.head > 0) & (tq >= self.ts[0])
+        idx = np.where(
+            newer,
+            np.searchsorted(self.ts[: self.head], tq, side="right") - 1,
+            np.searchsorted(self.ts[self.head :], tq, side="right") - 1 + self.head,
+        )
+        return np.clip(idx, 0, self.capacity - 1)
+
+    def __call__(self, tq):
+        tq = np.atleast_1d(tq)
+        out = np.zeros((len(tq), self.y0.shape[1]))
+
+        # Before the first step, later times are held at the initial value
+        past = tq <= self.t0 if self.count > 0 else np.ones(len(tq), dtype=bool)
+        for j in np.nonzero(past)[0]:
+            if callable(self.history):
+                out[j, :] = self.history(min(tq[j], self.t0), self.params)
+            else:
+                out[j, :] = self.history
+
+        rest = ~past
+        if np.any(rest):
+            if self.count == 0 or np.any(tq[rest] < self.oldest()):
+                raise ValueError(
+                    "Delay reaches beyond the stored history, increase the history capacity"
+                )
+            idx = self.locate(tq[rest])
+            h = (self.te[idx] - self.ts[idx])[:, None]
+            th = ((tq[rest] - self.ts[idx]) / (self.te[idx] - self.ts[idx]))[:, None]
+            h00 = (1 + 2 * th) * (1 - th) ** 2
+            h10 = th * (1 - th) ** 2
+            h01 = th**2 * (3 - 2 * th)
+            h11 = th**2 * (th - 1)
+            out[rest, :] = (
+                h00 * self.y0[idx, :]
+                + h10 * h * self.f0[idx, :]
+                + h01 * self.y1[idx, :]
+                + h11 * h * self.f1[idx, :]
+            )
+
+        return out
+
+
+###------------------------------###
+
+
+class Delay(Variables):
+    """
+    Explicit Runge-Kutta integration of delay differential equations
+
+        y'(t) = f(t, y(t), Z, params),   Z[j, :] = y(t - tau_j)
+
+    The lags tau_j are constants or functions tau_j(t, y, params)
+    (state-dependent). Delayed states are read from the History ring buffer.
+
+    The initial time is a discontinuity of the solution derivatives, and it
+    propagates along the lags: t0 + tau_j, t0 + tau_j + tau_k, ... Up to
+    order p + 1 of the method, these points are hit exactly by the steps.
+    For constant lags they are known in advance; for state-dependent lags a
+    new point is located on every accepted step where t - tau_j(t, y(t))
+    crosses a known one, and the step is retried to end on it.
+
+    Title: Solving DDEs in MATLAB
+    Author(s): L.F. Shampine and S. Thompson
+    Applied Numerical Mathematics, Vol 37, No 4, 2001
+
+    """
+
+    def __init__(self, f, lags, history, params, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.f = f
+        self.lags = lags
+        self.history = history
+        self.params = params
+        self.constant = all(not callable(lag) for lag in lags)
+
+        self.fsal = self.c[-1] == 1.0 and np.allclose(self.a[-1, :], self.bt)
+        self.nfev = 0
+
+    def delays(self, t, y):
+        return np.array(
+            [lag(t, y, self.params) if callable(lag) else lag for lag in self.lags],
+            dtype=float,
+        )
+
+    def rhs(self, hist, t, y):
+        self.nfev += 1
+        Z = hist(t - self.delays(t, y))
+        return self.f(t, y, Z, self.params)
+
+    def step(self, hist, t, y, h, k0):
+        k = np.zeros((self.stages, len(y)))
+        k[0, :] = k0
+        for i in range(1, self.stages):
+            k[i, :] = self.rhs(
+                hist, t + self.c[i] * h, y + h * (self.a[i, :i] @ k[:i, :])
+            )
+        return y + h * (self.bt @ k), y + h * (self.bhat @ k), k
+
+    def breaks(self, t0, tend):
+        # Propagated discontinuities of constant lags, up to order p + 1
+        points = {t0: 0}
+        level = [t0]
+        for m in range(1, self.p + 2):
+            level = sorted({d + lag for d in level for lag in self.lags if lag > 0})
+            level = [d for d in level if d < tend]
+            for d in level:
+                points.setdefault(d, m)
+        return points
+
+    def crossing(self, seg, t, t1, d):
+        # Root of s - tau(s, y(s)) = d on the step, by bisection on the dense output
+        def g(s):
+            y = seg(s)
+            return s - self.delays(s, y) - d
+
+        lo, hi = t, t1
+        glo = g(lo)
+        for i in range(60):
+            mid = 0.5 * (lo + hi)
+            gm = g(mid)
+            if np.any(np.sign(gm) != np.sign(glo)):
+                hi = mid
+            else:
+                lo, glo = mid, gm
+        return hi
+
+    def solve(self, t_range, yinit, abstol, reltol, capacity=4096):
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        if tend <= t:
+            raise ValueError("Delay equations are integrated forward in time")
+
+        hist = History(self.history, t, len(yinit), self.params, capacity)
+        rhs0 = lambda s, y, params: self.rhs(hist, s, y)
+
+        ss = StepSize(rhs0, t, yinit, self.params, self.method, 2)
+        hh, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+
+        if self.constant:
+            points = self.breaks(t, tend)
+        else:
+            points = {t: 0}
+
+        ya = yinit.copy()
+        k0 = self.rhs(hist, t, ya)
+        tsol = [t]
+        ysol = [ya]
+
+        nsteps = 1
+        nfailed = 0
+
+        while t < tend:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+
+            # Next discontinuity (or the end) is hit exactly
+            tnext = min([d for d in points if d > t + hmin] + [tend])
+            if 1.1 * hh >= tnext - t:
+                hh = tnext - t
+
+            noFailed = True
+
+            while True:
+                y, yhat, k = self.step(hist, t, ya, hh, k0)
+                err = ctrl.error(ya, y, y - yhat)
+
+                if err > rtol:
+                    nfailed += 1
+                    if hh < hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    hh = ctrl.reject(hh, hmin, err)
+                    continue
+
+                t1 = t + hh
+                f1 = k[-1, :] if self.fsal else None
+                if f1 is None:
+                    f1 = self.rhs(hist, t1, y)
+
+                # State-dependent lags: new discontinuities inside the step
+                if not self.constant:
+                    seg = lambda s, t=t, y0=ya, y1=y, f0=k0, f1=f1, h=hh: hermite(
+                        t, h, y0, y1, f0, f1, s
+                    )
+                    dnew = None
+                    for d, m in points.items():
+                        if m > self.p or d >= t1:
+                            continue
+                        g0 = t - self.delays(t, ya) - d
+                        g1 = t1 - self.delays(t1, y) - d
+                        if np.any((g0 < 0) & (g1 >= 0)):
+                            s = self.crossing(seg, t, t1, d)
+                            if s > t + hmin and (dnew is None or s < dnew[0]):
+                                dnew = (s, m + 1)
+                    if dnew is not None and dnew[0] < t1 - hmin:
+                        points[dnew[0]] = dnew[1]
+                        hh = dnew[0] - t
+                        noFailed = False
+                        continue
+                    if dnew is not None:
+                        points.setdefault(dnew[0], dnew[1])
+
+                break
+
+            if noFailed:
+                hh = ctrl.accept(hh, err)
+
+            hist.push(t, t1, ya, y, k0, f1)
+            t = tnext if abs(tnext - t1) <= hmin else t1
+            ya = y
+            k0 = f1
+            tsol.append(t)
+            ysol.append(ya)
+            nsteps += 1
+
+        return (
+            np.array(tsol),
+            np.array(ysol),
+            {
+                "total steps": nsteps,
+                "failed steps": nfailed,
+                "function evaluations": self.nfev,
+                "discontinuities": len(points),
+                "absolute error": ctrl.atol,
+                "relative error": rtol,
+            },
+        )
+
+
+def hermite(t, h, y0, y1, f0, f1, s):
+    th = (s - t) / h
+    h00 = (1 + 2 * th) * (1 - th) ** 2
+    h10 = th * (1 - th) ** 2
+    h01 = th**2 * (3 - 2 * th)
+    h11 = th**2 * (th - 1)
+    return h00 * y0 + h10 * h * f0 + h01 * y1 + h11 * h * f1
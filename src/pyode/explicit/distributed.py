@@ -0,0 +1,390 @@
+import os
+import time
+import pickle
+import hashlib
+import threading
+import numpy as np
+from multiprocessing.connection import Listener, Client
+from cache import fingerprint, digest
+from step_size import propagate
+
+
+class ChunkStore:
+    """
+    Directory of sweep results, one file per chunk of grid points
+
+    A chunk covering grid points [start, stop) is written to a temporary
+    file and renamed to chunk-<start>-<stop>.npz, so readers never see a
+    partial chunk, and a chunk that is already present is not written
+    again. Completing a chunk twice (a retried chunk whose first worker
+    finishes late) is therefore harmless. The directory is tied to one
+    sweep by a key over the right-hand side and all inputs; opening it for
+    a different sweep raises ValueError. A coordinator that is restarted on
+    the same directory skips the chunks that are already there.
+
+    """
+
+    def __init__(self, directory, key):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        path = os.path.join(directory, "sweep")
+        if os.path.exists(path):
+            with open(path) as fh:
+                if fh.read().strip() != key:
+                    raise ValueError(f"{directory} holds the results of another sweep")
+        else:
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as fh:
+                fh.write(key)
+            os.replace(tmp, path)
+
+    def path(self, start, stop):
+        return os.path.join(self.directory, f"chunk-{start}-{stop}.npz")
+
+    def write(self, start, stop, arrays):
+        path = self.path(start, stop)
+        if os.path.exists(path):
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def chunks(self):
+        # Completed (start, stop) ranges
+        out = []
+        for name in os.listdir(self.directory):
+            if name.startswith("chunk-") and name.endswith(".npz"):
+                start, stop = name[6:-4].split("-")
+                out.append((int(start), int(stop)))
+        return sorted(out)
+
+    def assemble(self, npoints):
+        results = {}
+        for start, stop in self.chunks():
+            with np.load(self.path(start, stop)) as data:
+                for name in data.files:
+                    if name not in results:
+                        shape = (npoints,) + data[name].shape[1:]
+                        fill = np.nan if data[name].dtype.kind == "f" else 0
+                        results[name] = np.full(shape, fill, dtype=data[name].dtype)
+                    results[name][start:stop] = data[name]
+        return results
+
+
+###------------------------------###
+
+
+class Coordinator:
+    """
+    Distribution of a parameter sweep over workers on several machines
+
+    Every point of the parameter grid is one RKExplicit-type solve over
+    t_range from yinit. The coordinator listens on a socket (address) and
+    hands out chunks of consecutive grid points to the workers that ask for
+    them; the workers write their results to the shared ChunkStore and
+    report back. Messages are pickled over multiprocessing connections and
+    authenticated with authkey.
+
+    Chunk sizes follow the measured cost. Each chunk is sized so that it
+    takes about target seconds, using the cost per point of the nearest
+    completed chunk in the grid, since expensive (stiff) points tend to sit
+    next to each other. Chunks start small until costs are known and never
+    exceed an equal share of the remaining points, so the last chunks do
+    not leave workers idle.
+
+    A chunk is leased to one worker. When the worker disconnects, reports
+    an error, or does not finish within lease seconds, the chunk goes back
+    to the queue with its boundaries unchanged, at most retries times.
+
+    """
+
+    def __init__(
+        self,
+        func,
+        t_range,
+        yinit,
+        grid,
+        store,
+        method="default",
+        abstol=1e-6,
+        reltol=1e-3,
+        target=1.0,
+        max_chunk=1024,
+        retries=3,
+        lease=600.0,
+        address=("127.0.0.1", 0),
+        authkey=None,
+    ):
+        self.job = {
+            "func": func,
+            "t_range": t_range,
+            "yinit": yinit,
+            "method": method,
+            "abstol": abstol,
+            "reltol": reltol,
+        }
+        self.grid = grid
+        self.npoints = len(grid)
+
+        # The job goes to the workers pickled; fail here rather than in serve
+        try:
+            pickle.dumps((self.job, grid))
+        except Exception as exc:
+            raise ValueError(
+                "The right-hand side must be picklable to be sent to the workers, "
+                "use a module level function instead of a lambda or local function"
+            ) from exc
+
+        self.target = target
+        self.max_chunk = max_chunk
+        self.retries = retries
+        self.lease = lease
+        self.authkey = os.urandom(16) if authkey is None else authkey
+
+        h = hashlib.sha256()
+        h.update(fingerprint(func).encode())
+        digest(h, (t_range, yinit, grid, method, abstol, reltol), set())
+        self.key = h.hexdigest()
+        self.store = ChunkStore(store, self.key)
+
+        self.lock = threading.Condition()
+        self.done = self.store.chunks()
+        self.pending = self.complement(self.done)
+        self.retry = []
+        self.leases = {}  # (start, stop) -> (worker, deadline)
+        self.attempts = {}
+        self.costs = {}  # (start, stop) -> seconds per point
+        self.error = None
+        self.nworkers = 0
+
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+        self.thread = None
+
+    def complement(self, done):
+        pending = []
+        start = 0
+        for a, b in done:
+            if a > start:
+                pending.append([start, a])
+            start = max(start, b)
+        if start < self.npoints:
+            pending.append([start, self.npoints])
+        return pending
+
+    def remaining(self):
+        return sum(b - a for a, b in self.pending) + sum(b - a for a, b in self.retry)
+
+    def finished(self):
+        return self.error is not None or (
+            not self.pending and not self.retry and not self.leases
+        )
+
+    def cost(self, start):
+        # Seconds per point of the completed chunk nearest to start
+        if not self.costs:
+            return None
+        nearest = min(
+            self.costs, key=lambda c: min(abs(c[0] - start), abs(c[1] - 1 - start))
+        )
+        return self.costs[nearest]
+
+    def size(self, start):
+        share = -(-self.remaining() // max(1, self.nworkers))
+        est = self.cost(start)
+        size = 1 if est is None else int(self.target / max(est, 1e-9))
+        return max(1, min(size, self.max_chunk, share))
+
+    def expire(self):
+        now = time.monotonic()
+        for chunk, (worker, deadline) in list(self.leases.items()):
+            if deadline < now:
+                self.release(chunk, "lease expired")
+
+    def release(self, chunk, reason):
+        # Puts a leased chunk back, or gives up after too many attempts
+        del self.leases[chunk]
+        if self.attempts[chunk] > self.retries:
+            self.error = RuntimeError(
+                f"Chunk {chunk} failed {self.attempts[chunk]} times, last: {reason}"
+            )
+        else:
+            self.retry.append(chunk)
+        self.lock.notify_all()
+
+    def assign(self, worker):
+        with self.lock:
+            self.expire()
+            if self.error is not None:
+                return None
+            if self.retry:
+                chunk = self.retry.pop(0)
+            elif self.pending:
+                interval = self.pending[0]
+                stop = min(interval[1], interval[0] + self.size(interval[0]))
+                chunk = (interval[0], stop)
+                interval[0] = stop
+                if interval[0] == interval[1]:
+                    self.pending.pop(0)
+            else:
+                return None
+            self.attempts[chunk] = self.attempts.get(chunk, 0) + 1
+            self.leases[chunk] = (worker, time.monotonic() + self.lease)
+            return chunk
+
+    def complete(self, chunk, seconds):
+        with self.lock:
+            if chunk in self.costs:
+                return  # completed before, by another worker
+            self.costs[chunk] = seconds / (chunk[1] - chunk[0])
+            self.leases.pop(chunk, None)
+            if chunk in self.retry:
+                self.retry.remove(chunk)
+            self.done.append(chunk)
+            self.lock.notify_all()
+
+    def fail(self, chunk, reason):
+        with self.lock:
+            if chunk in self.leases:
+                self.release(chunk, reason)
+
+    def serve(self, conn):
+        worker = id(conn)
+        with self.lock:
+            self.nworkers += 1
+        held = set()
+        try:
+            conn.send(("job", self.job, self.grid, self.key))
+            while True:
+                msg = conn.recv()
+                if msg[0] == "done":
+                    held.discard(msg[1])
+                    self.complete(msg[1], msg[2])
+                elif msg[0] == "failed":
+                    held.discard(msg[1])
+                    self.fail(msg[1], msg[2])
+
+                chunk = self.assign(worker)
+                while chunk is None:
+                    with self.lock:
+                        if self.finished():
+                            conn.send(("stop",))
+                            return
+                        self.lock.wait(min(1.0, self.lease))
+                    chunk = self.assign(worker)
+                held.add(chunk)
+                conn.send(("chunk", chunk))
+        except (EOFError, OSError):
+            pass
+        except Exception as exc:
+            # Anything else stops the sweep; wait() raises it
+            with self.lock:
+                if self.error is None:
+                    self.error = exc
+                self.lock.notify_all()
+        finally:
+            with self.lock:
+                self.nworkers -= 1
+                for chunk in held:
+                    if self.leases.get(chunk, (None,))[0] == worker:
+                        self.release(chunk, "worker disconnected")
+            conn.close()
+
+    def accept(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                return  # listener closed
+            except Exception:
+                continue  # failed authentication
+            threading.Thread(target=self.serve, args=(conn,), daemon=True).start()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.accept, daemon=True)
+        self.thread.start()
+        return self.address
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            while not self.finished():
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError("Sweep did not finish in time")
+                self.expire()
+                self.lock.wait(1.0)
+        self.listener.close()
+        if self.error is not None:
+            raise self.error
+        return self.store.assemble(self.npoints)
+
+
+###------------------------------###
+
+
+def solve_chunk(job, grid, start, stop):
+    t_range = job["t_range"]
+    yinit = job["yinit"]
+    n = len(yinit)
+    k = stop - start
+    out = {
+        "y": np.full((k, n), np.nan),
+        "total steps": np.zeros(k, dtype=int),
+        "function evaluations": np.zeros(k, dtype=int),
+        "seconds": np.zeros(k),
+        "ok": np.zeros(k, dtype=bool),
+    }
+    for i in range(k):
+        begin = time.perf_counter()
+        try:
+            tsol, ysol, nfev = propagate(
+                job["func"],
+                grid[start + i],
+                job["method"],
+                t_range,
+                yinit,
+                job["abstol"],
+                job["reltol"],
+            )
+        except (ValueError, FloatingPointError, OverflowError):
+            # Tolerance not met at this grid point; recorded, not retried
+            pass
+        else:
+            out["y"][i] = ysol[-1]
+            out["total steps"][i] = len(tsol)
+            out["function evaluations"][i] = nfev
+            out["ok"][i] = True
+        out["seconds"][i] = time.perf_counter() - begin
+    return out
+
+
+def work(address, authkey, store):
+    """
+    Worker loop: pull chunks from the coordinator at address until it stops
+
+    store is the sweep directory as seen from this machine.
+
+    """
+    conn = Client(address, authkey=authkey)
+    try:
+        msg, job, grid, key = conn.recv()
+        chunks = ChunkStore(store, key)
+        conn.send(("ready",))
+        while True:
+            msg = conn.recv()
+            if msg[0] == "stop":
+                return
+            start, stop = msg[1]
+            begin = time.perf_counter()
+            try:
+                out = solve_chunk(job, grid, start, stop)
+                chunks.write(start, stop, out)
+            except Exception as exc:
+                conn.send(("failed", msg[1], repr(exc)))
+            else:
+                conn.send(("done", msg[1], time.perf_counter() - begin))
+    except (EOFError, OSError):
+        pass  # coordinator gone
+    finally:
+        conn.close()
@@ -0,0 +1,170 @@
+import numpy as np
+from estimation import Variables
+
+
+class Ensemble(Variables):
+    """
+    Adaptive integration of many trajectories of the same system at once
+
+    The states of M trajectories are stacked in an (M, n) array and every
+    stage is computed for all of them together. Each trajectory keeps its
+    own time, step size and end time, and is accepted, rejected or finished
+    on its own, with the error control of RKExplicit applied row by row.
+    Only the active rows enter a stage.
+
+    With vectorized=True the right-hand side is called once per stage as
+    f(t, y, params) with t of shape (m,), y of shape (m, n) and params of
+    shape (m, n_params), and returns an (m, n) array. Otherwise it is
+    called row by row, which still shares the stage and controller work.
+
+    The states and stages are kept in the dtype given to Variables; time and
+    error norms in accumulate, which may be wider (mixed precision).
+
+    A trajectory whose tolerance cannot be met, or whose error estimate is
+    no longer finite, is stopped and left out of the following stages; the
+    others carry on. Its result holds the steps accepted until then, and the
+    stats of every trajectory report success and a message.
+
+    """
+
+    def __init__(
+        self, f, params, vectorized=False, *args, accumulate=np.float64, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.f = f
+        self.params = params
+        self.vectorized = vectorized
+        self.acc = accumulate
+        wd = Variables(self.method)
+        self.bdiff = (wd.bt - wd.bhat).astype(accumulate)
+        self.nfev = 0
+
+    def rhs(self, t, y, rows):
+        self.nfev += len(rows)
+        if self.vectorized:
+            return np.asarray(self.f(t, y, self.params[rows]))
+        return np.array(
+            [self.f(t[i], y[i], self.params[r]) for i, r in enumerate(rows)]
+        )
+
+    def init_step(self, t, tend, y, f0, atol, rtol):
+        # Vectorised StepSize.init_step_v3
+        span = np.abs(tend - t)
+        hmax = span / 10
+        threshold = atol / rtol
+        d0 = np.sqrt(np.sum(y.astype(self.acc) ** 2, axis=1))
+        nf0 = np.sqrt(np.sum(np.asarray(f0, self.acc) ** 2, axis=1))
+        rh = (nf0 / np.maximum(d0, threshold)) / (0.8 * rtol ** (1 / (self.p + 1)))
+        hh = np.minimum(hmax, span)
+        big = hh * rh > 1
+        hh[big] = 1 / rh[big]
+        return np.maximum(hh, 16 * np.spacing(t)), hmax
+
+    def solve(self, t_range, yinit, abstol, reltol):
+        # t_range (M, 2), yinit (M, n); abstol and reltol scalars or (M,)
+        M, n = yinit.shape
+        atol = np.broadcast_to(np.abs(abstol), (M,)).astype(self.acc)
+        rtol = np.broadcast_to(np.abs(reltol), (M,)).astype(self.acc)
+        t = t_range[:, 0].astype(self.acc)
+        tend = t_range[:, -1].astype(self.acc)
+        tdir = np.sign(tend - t)
+
+        rows = np.arange(M)
+        ya = yinit.astype(self.dtype)
+        hh, hmax = self.init_step(t, tend, ya, self.rhs(t, ya, rows), atol, rtol)
+
+        tsol = [[t[i]] for i in range(M)]
+        ysol = [[ya[i].copy()] for i in range(M)]
+        yhatsol = [[ya[i].copy()] for i in range(M)]
+        nsteps = np.ones(M, dtype=int)
+        nfailed = np.zeros(M, dtype=int)
+        noFailed = np.ones(M, dtype=bool)
+        message = ["Integration finished"] * M
+        failed = np.zeros(M, dtype=bool)
+
+        active = tdir * (tend - t) > 0
+        e = 1 / (self.p + 1)
+
+        while np.any(active):
+            r = rows[active]
+            hmin = 16 * np.spacing(t[r])
+            hh[r] = np.minimum(hmax[r], np.maximum(hmin, hh[r]))
+            last = 1.1 * hh[r] >= np.abs(tend[r] - t[r])
+            hh[r] = np.where(last, np.abs(tend[r] - t[r]), hh[r])
+            h = (tdir[r] * hh[r])[:, None]
+            hy = h.astype(self.dtype)
+
+            k = np.zeros((self.stages, len(r), n), dtype=self.dtype)
+            k[0] = self.rhs(t[r], ya[r], r)
+            for i in range(1, self.stages):
+                yi = ya[r] + hy * np.tensordot(self.a[i, :i], k[:i], axes=1)
+                k[i] = self.rhs(t[r] + self.c[i] * h[:, 0], yi, r)
+            y = ya[r] + hy * np.tensordot(self.bt, k, axes=1)
+            yhat = ya[r] + hy * np.tensordot(self.bhat, k, axes=1)
+
+            # Error control of RKExplicit, row by row
+            if self.dtype == np.float64:
+                ydiff = y - yhat
+            else:
+                # Free of the rounding of y and yhat, as in RKExplicit
+                ydiff = h * np.tensordot(self.bdiff, k.astype(self.acc), axes=1)
+            sc = atol[r] + rtol[r] * np.maximum(
+                np.sqrt(np.sum(ya[r].astype(self.acc) ** 2, axis=1)),
+                np.sqrt(np.sum(y.astype(self.acc) ** 2, axis=1)),
+            )
+            err = np.sqrt(np.sum(ydiff**2, axis=1) / n) / sc
+
+            # Rows that cannot go on are stopped, the others are not affected
+            bad = ~np.isfinite(err)
+            for i in r[bad]:
+                message[i] = "Integration produced non-finite values!"
+            rej = (err > rtol[r]) & ~bad
+            # A step already at hmin is not made smaller by a rejection
+            stuck = rej & (hh[r] <= hmin)
+            for i in r[stuck]:
+                message[i] = "Integration tolerance not met!"
+            failed[r[bad | stuck]] = True
+            rej &= ~stuck
+
+            rr = r[rej]
+            nfailed[rr] += 1
+            noFailed[rr] = False
+            fac = np.minimum(0.5, np.maximum(0.1, 0.8 * (1.0 / err[rej]) ** e))
+            hh[rr] = np.maximum(hmin[rej], hh[rr] * fac)
+
+            acc = ~(rej | bad | stuck)
+            ra = r[acc]
+            t1 = t[ra] + h[acc, 0]
+            t[ra] = np.where(np.abs(tend[ra] - t1) <= hmin[acc], tend[ra], t1)
+            ya[ra] = y[acc]
+            for j, i in enumerate(ra):
+                tsol[i].append(t[i])
+                ysol[i].append(y[acc][j])
+                yhatsol[i].append(yhat[acc][j])
+            nsteps[ra] += 1
+
+            grow = ra[noFailed[ra]]
+            temp = 1.25 * (err[acc][noFailed[ra]] / rtol[grow]) ** e
+            hh[grow] = np.where(
+                temp > 0.2, hh[grow] / np.maximum(temp, 0.2), 5.0 * hh[grow]
+            )
+            noFailed[ra] = True
+
+            active = (tdir * (tend - t) > 0) & ~failed
+
+        return [
+            (
+                np.array(tsol[i]),
+                np.array(ysol[i]),
+                np.array(yhatsol[i]),
+                {
+                    "total steps": int(nsteps[i]),
+                    "failed steps": int(nfailed[i]),
+                    "success": not failed[i],
+                    "message": message[i],
+                    "absolute error": atol[i],
+                    "relative error": rtol[i],
+                },
+            )
+            for i in range(M)
+        ]
@@ -15,10 +15,17 @@ from tableaux import (
 
 
 class Variables:
-    def __init__(self, method):
+    def __init__(self, method, dtype=np.float64):
         self.method = method
         self.coefficients()
 
+        # Stage weights in the precision of the states; the nodes c stay in
+        # double precision with the time
+        self.dtype = np.dtype(dtype)
+        self.a = self.a.astype(self.dtype, copy=False)
+        self.bt = self.bt.astype(self.dtype, copy=False)
+        self.bhat = self.bhat.astype(self.dtype, copy=False)
+
     def coefficients(self):
         if self.method == "cash-karp":
             self.c = CashKarp().coeff_c()
@@ -65,33 +72,48 @@ class Variables:
 
 class Approximation(Variables):
     def __init__(self, f, t0, y_init, params, h, *args, **kwargs):
+        kwargs.setdefault("dtype", y_init.dtype)
         super().__init__(*args, **kwargs)
         self.y = copy.deepcopy(y_init)
         self.f = f
         self.t = t0
         self.params = params
         self.h = h
+        self.hy = self.dtype.type(h)  # step in the precision of the states
         self.n_odes = len(y_init)
         self.slopes()
 
     def slopes(self):
-        self.k = np.zeros((self.stages, self.n_odes))
-        self.k[0, :] = self.f(self.t, self.y, self.params)
+        self.k = np.zeros((self.stages, self.n_odes), dtype=self.dtype)
+        self.stage(0, self.t, self.y)
         for i in range(1, self.stages):
             matA = 0.0
             for j in range(i):
-                matA += self.a[i, j] * self.h * self.k[j, :]
-            self.k[i, :] = self.f(
-                self.t + self.c[i] * self.h, self.y + matA, self.params
-            )
+                matA += self.a[i, j] * self.hy * self.k[j, :]
+            self.stage(i, self.t + self.c[i] * self.h, self.y + matA)
 
         return self.k
 
+    def stage(self, i, t, y):
+        # Right-hand sides of structured states write into the stage row
+        if getattr(self.f, "inplace", False):
+            self.f(t, y, self.params, out=self.k[i, :])
+        else:
+            self.k[i, :] = self.f(t, y, self.params)
+
+    def y_estimate(self, weights):
+        # Same as y_approx, but leaves the state of the step untouched
+        tmp = 0.0
+        for i in range(self.stages):
+            tmp += weights[i] * self.k[i, :]
+
+        return self.y + self.hy * tmp
+
     def y_approx(self, weights):
         tmp = 0.0
         for i in range(self.stages):
             tmp += weights[i] * self.k[i, :]
 
-        self.y += self.h * tmp
+        self.y += self.hy * tmp
         self.t += self.h
         return self.t, self.y
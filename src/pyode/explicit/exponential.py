@@ -0,0 +1,365 @@
+import numpy as np
+from step_size import StepSize, ErrorControl
+
+
+def expm(A):
+    # Scaling and squaring with the diagonal (6, 6) Pade approximant
+    nrm = np.max(np.sum(np.abs(A), axis=0)) if A.size else 0.0
+    s = max(0, int(np.ceil(np.log2(nrm / 0.5)))) if nrm > 0.5 else 0
+    A = A / 2**s
+
+    c = [1.0]
+    for k in range(1, 7):
+        c.append(c[-1] * (6 - k + 1) / (k * (12 - k + 1)))
+
+    I = np.eye(A.shape[0], dtype=A.dtype)
+    A2 = A @ A
+    U = A @ (c[1] * I + c[3] * A2 + c[5] * A2 @ A2)
+    V = c[0] * I + c[2] * A2 + c[4] * A2 @ A2 + c[6] * A2 @ A2 @ A2
+    E = np.linalg.solve(V - U, V + U)
+
+    for i in range(s):
+        E = E @ E
+    return E
+
+
+def phi_diag(z, kmax=3, npoints=32):
+    """
+    phi_0(z), ..., phi_kmax(z) elementwise, where phi_0 = exp and
+
+        phi_{k+1}(z) = (phi_k(z) - 1 / k!) / z
+
+    The formula cancels for small |z|, so it is averaged over a circle of
+    unit radius around every z (Cauchy integral formula).
+
+    Title: Fourth-order time-stepping for stiff PDEs
+    Author(s): A.-K. Kassam and L.N. Trefethen
+    SIAM Journal on Scientific Computing, Vol 26, No 4, 2005
+
+    """
+    real = np.isrealobj(z)
+    r = np.exp(2j * np.pi * (np.arange(npoints) + 0.5) / npoints)
+    zr = np.asarray(z, dtype=complex)[..., None] + r
+
+    out = [np.exp(zr)]
+    fact = 1.0
+    for k in range(1, kmax + 1):
+        out.append((out[-1] - 1 / fact) / zr)
+        fact *= k
+    out = [np.mean(p, axis=-1) for p in out]
+    if real:
+        out = [p.real for p in out]
+    return out
+
+
+def phi_dense(A, kmax=3):
+    # phi_k(A) is block (0, k) of the exponential of the augmented matrix
+    # [[A, I, 0, ...], [0, 0, I, ...], ..., [0, ..., 0]]
+    n = A.shape[0]
+    B = np.zeros(((kmax + 1) * n, (kmax + 1) * n), dtype=A.dtype)
+    B[:n, :n] = A
+    for k in range(kmax):
+        B[k * n : (k + 1) * n, (k + 1) * n : (k + 2) * n] = np.eye(n)
+    E = expm(B)
+    return [E[:n, k * n : (k + 1) * n] for k in range(kmax + 1)]
+
+
+###------------------------------###
+
+
+class Krylov:
+    """
+    phi-function actions for a linear operator given only by products
+
+    Evaluates phi_0(tau L) w_0 + tau phi_1(tau L) w_1 + ... + tau^p phi_p(tau L) w_p
+    as the exponential of an augmented operator of size n + p acting on
+    [w_0, 0, ..., 1], projected onto a Krylov subspace by the Arnoldi process.
+
+    The subspace is grown until the residual estimate beta h_{j+1,j}
+    |tau [phi_1(tau H_j)]_{j,0}| and the change from the previous dimension
+    are both below tol. The residual goes through phi_1 and not exp, whose
+    entries vanish for stiff H and would accept a single vector. The
+    interval is split into sub-steps so that tau ||L|| stays within the
+    dimension limit, and further if the subspace still does not converge.
+
+    Title: Computing the action of the matrix exponential, with an
+           application to exponential integrators
+    Author(s): A.H. Al-Mohy and N.J. Higham
+    SIAM Journal on Scientific Computing, Vol 33, No 2, 2011
+
+    """
+
+    def __init__(self, lin, params, dim=30, tol=1e-10):
+        self.lin = lin
+        self.params = params
+        self.dim = dim
+        self.tol = tol
+        self.nmv = 0
+        self.nrm = None
+
+    def matvec(self, v):
+        self.nmv += 1
+        if callable(self.lin):
+            return self.lin(v, self.params)
+        if self.lin.ndim == 1:
+            return self.lin * v
+        return self.lin @ v
+
+    def norm(self, n):
+        # ||L||_1 for arrays; a few power iterations for an operator, which
+        # is linear and does not change, so the estimate is kept
+        if self.nrm is None:
+            if not callable(self.lin):
+                A = np.abs(self.lin)
+                self.nrm = np.max(A) if A.ndim == 1 else np.max(np.sum(A, axis=0))
+            else:
+                v = np.ones(n) / np.sqrt(n)
+                for i in range(10):
+                    v = self.matvec(v)
+                    self.nrm = np.sqrt(np.sum(np.abs(v) ** 2))
+                    if self.nrm == 0.0:
+                        break
+                    v = v / self.nrm
+        return self.nrm
+
+    def arnoldi(self, tau, W, x):
+        # One sub-step exp(tau Ahat) x of the augmented operator
+        n, p = W.shape[0], W.shape[1]
+        J = np.eye(p, k=1)
+
+        def op(u):
+            return np.concatenate((self.matvec(u[:n]) + W @ u[n:], J @ u[n:]))
+
+        beta = np.sqrt(np.sum(np.abs(x) ** 2))
+        if beta == 0.0:
+            return x, True
+        m = min(self.dim, n + p)
+        V = np.zeros((m + 1, n + p), dtype=np.result_type(x, W, float))
+        H = np.zeros((m + 1, m + 1), dtype=V.dtype)
+        V[0] = x / beta
+
+        for j in range(m):
+            w = op(V[j])
+            for i in range(j + 1):
+                H[i, j] = np.vdot(V[i], w)
+                w = w - H[i, j] * V[i]
+            hnext = np.sqrt(np.sum(np.abs(w) ** 2))
+
+            # exp(tau H) e_1 and phi_1(tau H) e_1 from [[tau H, e_1], [0, 0]]
+            B = np.zeros((j + 2, j + 2), dtype=H.dtype)
+            B[: j + 1, : j + 1] = tau * H[: j + 1, : j + 1]
+            B[0, j + 1] = 1.0
+            E = expm(B)
+            y = beta * (E[: j + 1, 0] @ V[: j + 1])
+            if hnext <= 1e-12 * beta:
+                return y, True
+
+            err = beta * hnext * abs(tau * E[j, j + 1])
+            if j > 0:
+                err = max(err, np.sqrt(np.sum(np.abs(y - yprev) ** 2)))
+            ok = j > 0 and err <= self.tol * beta
+            if ok or j == m - 1:
+                return y, ok
+            yprev = y
+            H[j + 1, j] = hnext
+            V[j + 1] = w / hnext
+
+    def phiv(self, tau, ws):
+        n, p = len(ws[0]), max(len(ws) - 1, 1)
+        # Columns w_p, ..., w_1 and the start vector [w_0, 0, ..., 0, 1]
+        W = np.zeros((n, p), dtype=np.result_type(*ws))
+        for k in range(1, len(ws)):
+            W[:, p - k] = ws[k]
+        x = np.concatenate((ws[0], np.zeros(p - 1), [1.0 if len(ws) > 1 else 0.0]))
+
+        # exp(tau Ahat) = exp(tau / r Ahat)^r, so sub-steps simply compose
+        sub = max(1, int(np.ceil(abs(tau) * self.norm(n) / self.dim)))
+        while True:
+            y = x
+            for i in range(sub):
+                y, ok = self.arnoldi(tau / sub, W, y)
+                if not ok:
+                    break
+            if ok or sub >= 1024:
+                return y[:n]
+            sub *= 2
+
+
+###------------------------------###
+
+
+class Exponential:
+    """
+    Fourth order exponential time differencing for semilinear systems
+
+        y' = L y + N(t, y, params)
+
+    The stiff linear part is integrated exactly through the phi functions of
+    h L, so the step size is limited by N only (ETDRK4):
+
+        a = phi_0(h/2 L) y + h/2 phi_1(h/2 L) N(t, y)
+        b = phi_0(h/2 L) y + h/2 phi_1(h/2 L) N(t + h/2, a)
+        c = phi_0(h/2 L) a + h/2 phi_1(h/2 L) (2 N(t + h/2, b) - N(t, y))
+        y1 = phi_0(h L) y + h phi_1 N_y + h phi_2 (-3 N_y + 2 N_a + 2 N_b - N_c)
+             + h phi_3 (4 N_y - 4 N_a - 4 N_b + 4 N_c)
+
+    L is a vector (diagonal operator, e.g. in Fourier space), a matrix, or a
+    function L(v, params) returning the product L v. For vectors and
+    matrices, the phi functions are computed once per step size and cached,
+    so that a step costs about as much as an explicit RK step. For large
+    operators (krylov=True), their action on the stage vectors is computed
+    in a Krylov subspace instead. The adaptive mode controls the error by
+    step doubling and keeps the step sizes on powers of two of the initial
+    step, so that cached phi functions are reused after a change.
+
+    Title: Exponential time differencing for stiff systems
+    Author(s): S.M. Cox and P.C. Matthews
+    Journal of Computational Physics, Vol 176, No 2, 2002
+
+    """
+
+    def __init__(self, lin, nonlin, params, krylov=False, dim=30, cache_size=16):
+        self.lin = lin
+        self.nonlin = nonlin
+        self.params = params
+        self.krylov = krylov or callable(lin)
+        self.cache_size = cache_size
+        self.p = 4
+
+        self.cache = {}
+        self.kry = Krylov(lin, params, dim) if self.krylov else None
+        self.nfev = 0
+        self.nphi = 0
+
+    def N(self, t, y):
+        self.nfev += 1
+        return self.nonlin(t, y, self.params)
+
+    def phi(self, tau):
+        if tau in self.cache:
+            return self.cache[tau]
+
+        self.nphi += 1
+        if self.lin.ndim == 1:
+            phis = phi_diag(tau * self.lin)
+        else:
+            phis = phi_dense(tau * self.lin)
+
+        if len(self.cache) >= self.cache_size:
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[tau] = phis
+        return phis
+
+    def apply(self, M, v):
+        return M * v if M.ndim == 1 else M @ v
+
+    def combine(self, tau, ws):
+        # phi_0(tau L) w_0 + sum_k tau^k phi_k(tau L) w_k
+        if self.krylov:
+            return self.kry.phiv(tau, ws)
+        phis = self.phi(tau)
+        out = self.apply(phis[0], ws[0])
+        for k in range(1, len(ws)):
+            out = out + tau**k * self.apply(phis[k], ws[k])
+        return out
+
+    def step(self, t, y, Ny, h):
+        h2 = h / 2
+
+        a = self.combine(h2, [y, Ny])
+        Na = self.N(t + h2, a)
+        b = self.combine(h2, [y, Na])
+        Nb = self.N(t + h2, b)
+        c = self.combine(h2, [a, 2 * Nb - Ny])
+        Nc = self.N(t + h, c)
+
+        # h phi_k = h^k phi_k / h^(k - 1)
+        w2 = (-3 * Ny + 2 * Na + 2 * Nb - Nc) / h
+        w3 = 4 * (Ny - Na - Nb + Nc) / h**2
+        return self.combine(h, [y, Ny, w2, w3])
+
+    def solve(self, t_range, yinit, h=None, abstol=1e-6, reltol=1e-3):
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        adaptive = h is None
+        if adaptive:
+            # The step size of the nonlinear part decides
+            ss = StepSize(
+                lambda t, y, params: self.N(t, y), t, yinit, self.params, "default", 2
+            )
+            href, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+            hh = href
+        else:
+            hh = abs(h)
+            hmax = abs(tend - t)
+
+        ya = yinit.copy()
+        tsol = [t]
+        ysol = [ya]
+
+        nsteps = 1
+        nfailed = 0
+
+        while tdir * (tend - t) > 0:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+            if 1.1 * hh >= abs(tend - t):
+                hh = abs(tend - t)
+
+            Ny = self.N(t, ya)
+
+            if not adaptive:
+                h = tdir * hh
+                y = self.step(t, ya, Ny, h)
+            else:
+                noFailed = True
+
+                while True:
+                    h = tdir * hh
+                    y1 = self.step(t, ya, Ny, h)
+                    ym = self.step(t, ya, Ny, h / 2)
+                    y = self.step(t + h / 2, ym, self.N(t + h / 2, ym), h / 2)
+                    err = ctrl.error(ya, y, (y - y1) / 15)
+
+                    if err > rtol:
+                        nfailed += 1
+                        if hh < hmin:
+                            raise ValueError("Integration tolerance not met!")
+                        noFailed = False
+                        hh = self.quantize(ctrl.reject(hh, hmin, err), href)
+                        continue
+
+                    break
+
+                hnew = ctrl.accept(hh, err) if noFailed else hh
+                hh = self.quantize(hnew, href)
+
+            t1 = t + h
+            t = tend if abs(tend - t1) <= hmin else t1
+            ya = y
+            tsol.append(t)
+            ysol.append(ya)
+            nsteps += 1
+
+        stats = {
+            "total steps": nsteps,
+            "failed steps": nfailed,
+            "function evaluations": self.nfev,
+            "phi evaluations": self.nphi,
+        }
+        if self.krylov:
+            stats["operator products"] = self.kry.nmv
+        stats["absolute error"] = ctrl.atol
+        stats["relative error"] = rtol
+
+        return np.array(tsol), np.array(ysol), stats
+
+    def quantize(self, hh, href):
+        # Largest href * 2^k not above hh
+        return href * 2.0 ** np.floor(np.log2(hh / href))
@@ -0,0 +1,179 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from step_size import StepSize, ErrorControl
+
+
+class Extrapolation:
+    """
+    Gragg-Bulirsch-Stoer extrapolation with order and step size control
+
+    Column j of the table is the modified midpoint rule over the step H with
+    n_j = 2j sub-steps. Its error has an expansion in even powers of H / n_j,
+    which is eliminated by Aitken-Neville extrapolation:
+
+        T_{j,k+1} = T_{j,k} + (T_{j,k} - T_{j-1,k}) / ((n_j / n_{j-k})^2 - 1)
+
+    so T_{k,k} has order 2k. The columns only share f(t, y) and are
+    independent otherwise, so they are computed concurrently in a thread
+    pool (NumPy right-hand sides release the GIL). The order k and the next
+    step size are chosen to minimise the work per unit step, A_k / H_k.
+
+    Book: Solving Ordinary Differential Equations I: Nonstiff Problems (1993)
+    Author(s): E. Hairer, S.P. Norsett, G. Wanner
+    Chapter: II.9 Extrapolation Methods (code ODEX)
+
+    """
+
+    def __init__(self, f, params, kmax=9, workers=None):
+        self.f = f
+        self.params = params
+        self.kmax = kmax
+        self.workers = os.cpu_count() if workers is None else workers
+
+        self.seq = 2 * np.arange(1, kmax + 1)
+        # Work of column k: one shared f(t, y) plus the midpoint sub-steps
+        self.work = np.append(0, 1 + np.cumsum(self.seq - 1))
+        self.nfev = 0
+
+    def midpoint(self, t, y, f0, H, n):
+        h = H / n
+        z0 = y
+        z1 = y + h * f0
+        for m in range(1, n):
+            z0, z1 = z1, z0 + 2 * h * self.f(t + m * h, z1, self.params)
+        return z1
+
+    def table(self, pool, t, y, f0, H, k):
+        if pool is None:
+            T = [self.midpoint(t, y, f0, H, n) for n in self.seq[:k]]
+        else:
+            T = list(
+                pool.map(lambda n: self.midpoint(t, y, f0, H, n), self.seq[:k])
+            )
+        self.nfev += int(np.sum(self.seq[:k]) - k)
+
+        # Aitken-Neville: rows[j][m] = T_{j+1,m+1}
+        rows = []
+        for j in range(k):
+            row = [T[j]]
+            for m in range(1, j + 1):
+                ratio = (self.seq[j] / self.seq[j - m]) ** 2 - 1
+                row.append(row[m - 1] + (row[m - 1] - rows[j - 1][m - 1]) / ratio)
+            rows.append(row)
+
+        # Diagonal T_{j,j} and its neighbour T_{j,j-1} for the error estimate
+        return [r[-1] for r in rows], [r[-2] if len(r) > 1 else None for r in rows]
+
+    def solve(self, t_range, yinit, abstol, reltol):
+        ctrl = ErrorControl(abstol, reltol, 1)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        # Starting column as in ODEX
+        k = int(max(2, min(self.kmax - 1, np.floor(-np.log10(rtol + 1e-40) * 0.6 + 1.5))))
+
+        ss = StepSize(self.f, t, yinit, self.params, "default", 2)
+        HH, Hmax = ss.init_step_v3(t_range, threshold, rtol, 2 * k - 1)
+        Hmax = abs(tend - t)  # high orders take long steps, as in ODEX
+
+        ya = yinit.copy()
+        tsol = [t]
+        ysol = [ya]
+
+        nsteps = 1
+        nfailed = 0
+
+        pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+        try:
+            while tdir * (tend - t) > 0:
+                Hmin = 16 * np.spacing(t)
+                HH = min(Hmax, max(Hmin, HH))
+                if 1.1 * HH >= abs(tend - t):
+                    HH = abs(tend - t)
+
+                f0 = self.f(t, ya, self.params)
+                self.nfev += 1
+                reject = False
+
+                while True:
+                    H = tdir * HH
+                    # Columns 1..k+1, so that order k + 1 can be tried too
+                    kc = min(k + 1, self.kmax)
+                    diag, sub = self.table(pool, t, ya, f0, H, kc)
+
+                    err = np.zeros(kc + 1)
+                    Hk = np.zeros(kc + 1)
+                    for j in range(2, kc + 1):
+                        e = ctrl.error(ya, diag[j - 1], diag[j - 1] - sub[j - 1]) / rtol
+                        err[j] = e
+                        # Error of column j behaves like H^(2j - 1)
+                        fac = 0.94 * (0.65 / max(e, 1e-300)) ** (1 / (2 * j - 1))
+                        Hk[j] = HH * min(4.0, max(0.02, fac))
+                    work = self.work[: kc + 1] / np.where(Hk > 0, Hk, np.inf)
+
+                    if err[k] <= 1.0:
+                        y = diag[k - 1]
+                        kacc = k
+                    elif kc > k and err[kc] <= 1.0:
+                        y = diag[kc - 1]
+                        kacc = kc
+                    else:
+                        nfailed += 1
+                        if HH < Hmin:
+                            raise ValueError("Integration tolerance not met!")
+                        reject = True
+                        if k > 2 and work[k - 1] < 0.8 * work[k]:
+                            k -= 1
+                        HH = min(Hk[k], 0.5 * HH)
+                        continue
+
+                    break
+
+                # -- Order and step size for the next step --#
+                knew = kacc
+                if kacc > 2 and work[kacc - 1] < 0.8 * work[kacc]:
+                    knew = kacc - 1
+                elif (
+                    not reject
+                    and kacc < self.kmax - 1
+                    and (kacc == 2 or work[kacc] < 0.9 * work[kacc - 1])
+                ):
+                    knew = kacc + 1
+
+                Hnew = HH
+                if knew > kacc:
+                    HH = Hk[kacc] * self.work[knew] / self.work[kacc]
+                else:
+                    HH = Hk[knew]
+                # No increase right after a rejected attempt
+                if reject:
+                    HH = min(HH, Hnew)
+                k = knew
+
+                t1 = t + H
+                t = tend if abs(tend - t1) <= Hmin else t1
+                ya = y
+                tsol.append(t)
+                ysol.append(ya)
+                nsteps += 1
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return (
+            np.array(tsol),
+            np.array(ysol),
+            {
+                "total steps": nsteps,
+                "failed steps": nfailed,
+                "function evaluations": self.nfev,
+                "absolute error": ctrl.atol,
+                "relative error": rtol,
+            },
+        )
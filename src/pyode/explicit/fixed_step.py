@@ -0,0 +1,55 @@
+import numpy as np
+from estimation import Variables
+
+
+class FixedStep(Variables):
+    """
+    Runge-Kutta integration with a constant step size
+
+    No embedded solution is formed, so trailing stages that only serve the
+    error estimate (bt[i] = 0 for all later i, e.g. the FSAL stage of
+    Dormand-Prince) are not evaluated. The stage matrix and the output grid
+    are allocated once, and every stage is a single matrix-vector product.
+
+    """
+
+    def __init__(self, f, params, n_odes, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.f = f
+        self.params = params
+        self.nstages = int(np.nonzero(self.bt)[0][-1]) + 1
+        self.k = np.zeros((self.nstages, n_odes), dtype=self.dtype)
+        self.nfev = 0
+
+    def step(self, t, y, h):
+        hy = self.dtype.type(h)
+        self.stage(0, t, y)
+        for i in range(1, self.nstages):
+            self.stage(i, t + self.c[i] * h, y + hy * (self.a[i, :i] @ self.k[:i, :]))
+        self.nfev += self.nstages
+
+        return y + hy * (self.bt[: self.nstages] @ self.k)
+
+    def stage(self, i, t, y):
+        # Right-hand sides of structured states write into the stage row
+        if getattr(self.f, "inplace", False):
+            self.f(t, y, self.params, out=self.k[i, :])
+        else:
+            self.k[i, :] = self.f(t, y, self.params)
+
+    def grid(self, t_range, h):
+        span = t_range[-1] - t_range[0]
+        nsteps = max(1, int(np.ceil(abs(span) / h - 1e-10)))
+        tsol = t_range[0] + np.sign(span) * h * np.arange(nsteps + 1)
+        tsol[-1] = t_range[-1]
+        return tsol
+
+    def solve(self, t_range, yinit, h):
+        tsol = self.grid(t_range, h)
+        ysol = np.empty((len(tsol), len(yinit)), dtype=self.dtype)
+        ysol[0, :] = yinit
+
+        for i in range(len(tsol) - 1):
+            ysol[i + 1, :] = self.step(tsol[i], ysol[i, :], tsol[i + 1] - tsol[i])
+
+        return tsol, ysol
@@ -0,0 +1,49 @@
+import numpy as np
+from estimation import Approximation
+
+
+class GlobalError:
+    """
+    Richardson-type estimate of the global error
+
+    The accepted time grid of a solution is integrated a second time with
+    every step split into two halves. Both solutions share the same grid, so
+    their difference approximates the global error of the original one:
+
+        e(t_n) = (y_h(t_n) - y_h/2(t_n)) * 2^p / (2^p - 1)
+
+    Book: Solving Ordinary Differential Equations I: Nonstiff Problems (1993)
+    Author(s): E. Hairer, S.P. Norsett, G. Wanner
+    Chapter: II.4 Practical Error Estimation
+    Pages: 164 - 165
+
+    """
+
+    def __init__(self, f, tsol, ysol, params, method, weights, p):
+        self.f = f
+        self.tsol = tsol
+        self.ysol = ysol
+        self.params = params
+        self.method = method
+        self.weights = weights
+        self.p = p
+
+    def estimate(self):
+        self.esol = np.zeros(self.ysol.shape)
+        factor = 2**self.p / (2**self.p - 1)
+
+        y = self.ysol[0, :].copy()
+        for i in range(len(self.tsol) - 1):
+            t = self.tsol[i]
+            hh = 0.5 * (self.tsol[i + 1] - self.tsol[i])
+            for j in range(2):
+                yt = Approximation(self.f, t, y, self.params, hh, self.method)
+                t, y = yt.y_approx(self.weights)
+            self.esol[i + 1, :] = factor * (self.ysol[i + 1, :] - y)
+
+        return self.esol
+
+    def relative(self, threshold):
+        ynorm = np.sqrt(np.sum(self.ysol**2, axis=1))
+        enorm = np.sqrt(np.sum(self.esol**2, axis=1))
+        return max(enorm / np.maximum(ynorm, threshold))
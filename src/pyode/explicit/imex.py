@@ -0,0 +1,316 @@
+import numpy as np
+from step_size import StepSize, ErrorControl
+from tableaux_imex import KennedyCarpenter43, KennedyCarpenter54
+from newton_krylov import NewtonKrylov
+
+
+def lu_factor(M):
+    # Doolittle LU decomposition with partial pivoting, L and U packed in one array
+    lu = np.array(M, dtype=float)
+    n = lu.shape[0]
+    piv = np.arange(n)
+    for k in range(n - 1):
+        p = k + np.argmax(np.abs(lu[k:, k]))
+        if lu[p, k] == 0.0:
+            raise ValueError("Iteration matrix is singular")
+        if p != k:
+            lu[[k, p], :] = lu[[p, k], :]
+            piv[[k, p]] = piv[[p, k]]
+        lu[k + 1 :, k] /= lu[k, k]
+        lu[k + 1 :, k + 1 :] -= np.outer(lu[k + 1 :, k], lu[k, k + 1 :])
+    if lu[-1, -1] == 0.0:
+        raise ValueError("Iteration matrix is singular")
+    return lu, piv
+
+
+def lu_solve(lu, piv, b):
+    n = lu.shape[0]
+    x = b[piv].astype(float)
+    for i in range(1, n):
+        x[i] -= lu[i, :i] @ x[:i]
+    for i in range(n - 1, -1, -1):
+        x[i] = (x[i] - lu[i, i + 1 :] @ x[i + 1 :]) / lu[i, i]
+    return x
+
+
+###------------------------------###
+
+
+class IMEX:
+    """
+    Adaptive additive Runge-Kutta integration of y' = fe(t, y) + fi(t, y)
+
+    The non-stiff part fe is treated by the explicit tableau (a) and the
+    stiff part fi by the diagonally implicit one (ai), with shared weights:
+
+        Y_i = y + h sum_{j<i} (a_ij fe(Y_j) + ai_ij fi(Y_j)) + h gamma fi(Y_i)
+        y1  = y + h sum_i bt_i (fe(Y_i) + fi(Y_i))
+
+    Each implicit stage is solved by simplified Newton iterations with the
+    matrix I - h gamma J, J = dfi/dy. The LU factors of this matrix are
+    kept across stages and steps. They are recomputed when the step size
+    moves by more than 20 % from the factorised one, and J itself only
+    when Newton converges slowly. The embedded weights bhat give the error
+    estimate, which is used by the same controller as in RKExplicit.
+
+    For systems too large for a Jacobian matrix (newton="krylov"), the
+    stages are solved by Jacobian-free Newton-Krylov iterations instead,
+    optionally with a preconditioner precond(t, y, h * gamma, v, params)
+    that approximates (I - h gamma J)^{-1} v.
+
+    Title: Additive Runge-Kutta schemes for convection-diffusion-reaction equations
+    Author(s): C.A. Kennedy and M.H. Carpenter
+    Applied Numerical Mathematics, Vol 44, No 1-2, 2003
+
+    """
+
+    def __init__(
+        self, fe, fi, params, method, jac=None, newton="direct", precond=None, restart=20
+    ):
+        self.fe = fe
+        self.fi = fi
+        self.params = params
+        self.jac = jac
+        self.precond = precond
+
+        if newton == "direct":
+            self.nk = None
+        elif newton == "krylov":
+            self.nk = NewtonKrylov(restart)
+        else:
+            raise RuntimeError(
+                "Newton solver is unknown. Available solvers are: 'Direct' and 'Krylov'."
+            )
+
+        if method == "default" or method == "ark43":
+            tab = KennedyCarpenter43()
+        elif method == "ark54":
+            tab = KennedyCarpenter54()
+        else:
+            raise RuntimeError(
+                "Method is unknown. Available IMEX methods are: 'ARK43', 'ARK54', and 'Default'."
+            )
+        self.a = tab.coeff_matA()
+        self.ai = tab.coeff_matAi()
+        self.c = tab.coeff_c()
+        self.bt = tab.coeff_bt()
+        self.bhat = tab.coeff_bhat()
+        self.gamma = tab.gamma
+        self.p = tab.order
+        self.stages = len(self.c)
+
+        # The last stage is the new solution only if both last rows equal bt
+        ai_last = self.ai[-1, :].copy()
+        ai_last[-1] = self.gamma
+        self.fsal = np.allclose(self.a[-1, :], self.bt) and np.allclose(
+            ai_last, self.bt
+        )
+
+        self.J = None
+        self.fresh = False  # J evaluated at the current step
+        self.lu = None
+        self.hfact = None
+
+        self.nfev = 0
+        self.nfev_implicit = 0
+        self.njev = 0
+        self.nlu = 0
+        self.nnewton = 0
+
+    def explicit(self, t, y):
+        self.nfev += 1
+        return self.fe(t, y, self.params)
+
+    def implicit(self, t, y):
+        self.nfev_implicit += 1
+        return self.fi(t, y, self.params)
+
+    def jacobian(self, t, y, fy):
+        self.njev += 1
+        self.fresh = True
+        self.lu = None
+        if self.jac is not None:
+            self.J = np.atleast_2d(self.jac(t, y, self.params))
+            return
+
+        # Forward differences, one column per evaluation
+        n = len(y)
+        self.J = np.zeros((n, n))
+        for j in range(n):
+            dy = np.sqrt(np.finfo(float).eps) * max(1e-5, abs(y[j]))
+            yd = y.copy()
+            yd[j] += dy
+            self.J[:, j] = (self.implicit(t, yd) - fy) / dy
+
+    def factor(self, h):
+        self.nlu += 1
+        self.hfact = h
+        self.lu = lu_factor(np.eye(self.J.shape[0]) - h * self.gamma * self.J)
+
+    def newton(self, ctrl, t, known, guess, h):
+        # Solve Y = known + h gamma fi(t, Y); returns (Y, fi(Y)) or None
+        hg = h * self.gamma
+        if self.nk is not None:
+            return self.newton_krylov(ctrl, t, known, guess, hg)
+
+        Y = guess
+        dnorm_old = None
+        for it in range(10):
+            self.nnewton += 1
+            fY = self.implicit(t, Y)
+            dY = lu_solve(*self.lu, known + hg * fY - Y)
+            Y = Y + dY
+
+            dnorm = ctrl.error(known, Y, dY)
+            if dnorm_old is not None:
+                theta = dnorm / dnorm_old
+                if theta >= 0.9:
+                    return None
+                # Converged once the remaining iterations cannot matter
+                if theta / (1 - theta) * dnorm <= 0.05 * ctrl.rtol:
+                    break
+            elif dnorm <= 1e-3 * ctrl.rtol:
+                break
+            dnorm_old = dnorm
+        else:
+            return None
+
+        # Slope from the stage equation, exact at the converged value
+        return Y, (Y - known) / hg
+
+    def newton_krylov(self, ctrl, t, known, guess, hg):
+        F = lambda Y: Y - known - hg * self.implicit(t, Y)
+        norm = lambda Y, dY: ctrl.error(known, Y, dY)
+        precond = None
+        if self.precond is not None:
+            precond = lambda v: self.precond(t, guess, hg, v, self.params)
+
+        niter = self.nk.niter
+        Y = self.nk.solve(F, guess, norm, 0.05 * ctrl.rtol, precond)
+        self.nnewton += self.nk.niter - niter
+        if Y is None:
+            return None
+        return Y, (Y - known) / hg
+
+    def step(self, ctrl, t, y, ke0, ki0, h):
+        ke = np.zeros((self.stages, len(y)))
+        ki = np.zeros((self.stages, len(y)))
+        ke[0, :] = ke0
+        ki[0, :] = ki0
+
+        for i in range(1, self.stages):
+            known = y + h * (self.a[i, :i] @ ke[:i, :] + self.ai[i, :i] @ ki[:i, :])
+            # Predictor: explicit continuation of the previous stage slope
+            guess = known + h * self.gamma * ki[i - 1, :]
+            out = self.newton(ctrl, t + self.c[i] * h, known, guess, h)
+            if out is None:
+                return None
+            Y, ki[i, :] = out
+            ke[i, :] = self.explicit(t + self.c[i] * h, Y)
+
+        y1 = y + h * (self.bt @ (ke + ki))
+        yhat = y + h * (self.bhat @ (ke + ki))
+        return y1, yhat, ke[-1, :], ki[-1, :]
+
+    def solve(self, t_range, yinit, abstol, reltol):
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        f = lambda t, y, params: self.fe(t, y, params) + self.fi(t, y, params)
+        ss = StepSize(f, t, yinit, self.params, "default", 2)
+        hh, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+
+        ya = yinit.copy()
+        ke0 = self.explicit(t, ya)
+        ki0 = self.implicit(t, ya)
+        if self.nk is None:
+            self.jacobian(t, ya, ki0)
+
+        tsol = [t]
+        ysol = [ya]
+
+        nsteps = 1
+        nfailed = 0
+
+        while tdir * (tend - t) > 0:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+            if 1.1 * hh >= abs(tend - t):
+                hh = abs(tend - t)
+
+            noFailed = True
+
+            while True:
+                h = tdir * hh
+                # Keep the factors while h stays close to the factorised value
+                if self.nk is None and (
+                    self.lu is None or not (0.8 <= h / self.hfact <= 1.2)
+                ):
+                    self.factor(h)
+
+                out = self.step(ctrl, t, ya, ke0, ki0, h)
+                if out is None:
+                    # Newton failed: fresh Jacobian first, then a smaller step
+                    nfailed += 1
+                    if self.nk is None and not self.fresh:
+                        self.jacobian(t, ya, ki0)
+                    else:
+                        if hh < hmin:
+                            raise ValueError("Integration tolerance not met!")
+                        hh = max(hmin, 0.5 * hh)
+                        self.lu = None
+                    noFailed = False
+                    continue
+
+                y, yhat, ke1, ki1 = out
+                err = ctrl.error(ya, y, y - yhat)
+
+                if err > rtol:
+                    nfailed += 1
+                    if hh < hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    hh = ctrl.reject(hh, hmin, err)
+                    continue
+
+                break
+
+            if noFailed:
+                hh = ctrl.accept(hh, err)
+
+            t1 = t + h
+            t = tend if abs(tend - t1) <= hmin else t1
+            ya = y
+            if self.fsal:
+                # Last stage is the new solution, its slopes start the next step
+                ke0, ki0 = ke1, ki1
+            else:
+                # Only the implicit tableau is stiffly accurate: the explicit
+                # last stage differs from y1, so both slopes are evaluated anew
+                ke0 = self.explicit(t, ya)
+                ki0 = self.implicit(t, ya)
+            tsol.append(t)
+            ysol.append(ya)
+            nsteps += 1
+            self.fresh = False
+
+        stats = {
+            "total steps": nsteps,
+            "failed steps": nfailed,
+            "function evaluations": self.nfev,
+            "implicit evaluations": self.nfev_implicit,
+            "jacobian evaluations": self.njev,
+            "factorizations": self.nlu,
+            "newton iterations": self.nnewton,
+        }
+        if self.nk is not None:
+            stats["linear iterations"] = self.nk.nlin
+        stats["absolute error"] = ctrl.atol
+        stats["relative error"] = rtol
+
+        return np.array(tsol), np.array(ysol), stats
@@ -2,21 +2,34 @@ import numpy as np
 
 
 class ArrayInitialization:
-    def array_check(self, arr):
+    def array_check(self, arr, dtype=float):
         if type(arr) == list:
-            self.new_arr = np.array(arr, dtype=float)
+            self.new_arr = np.array(arr, dtype=dtype)
         elif type(arr) == np.ndarray:
             if len(arr.shape) == 1:
-                self.new_arr = np.array(arr, dtype=float)
+                self.new_arr = np.array(arr, dtype=dtype)
             else:
                 if arr.shape[0] < arr.shape[1]:
                     self.new_arr = np.squeeze(arr, axis=0)
                 else:
                     self.new_arr = np.squeeze(arr, axis=1)
-                self.new_arr = np.array(self.new_arr, dtype=float)
+                self.new_arr = np.array(self.new_arr, dtype=dtype)
 
         return self.new_arr
 
+    def precision(self, precision):
+        # dtype of the states and stages, and dtype of time and error norms
+        if precision == "double":
+            return np.float64, np.float64
+        elif precision == "single":
+            return np.float32, np.float32
+        elif precision == "mixed":
+            return np.float32, np.float64
+        else:
+            raise RuntimeError(
+                "Precision is unknown. Available precisions are: 'Double', 'Single', and 'Mixed'."
+            )
+
     def gen_init_arrays(self, t0, y0):
         self.ysol = np.empty(0)
         self.yhatsol = np.empty(0)
@@ -1,4 +1,5 @@
 import bisect
+import numpy as np
 
 
 class FirstOrder:
@@ -72,3 +73,91 @@ class SecondOrder:
 
     def spline2(self):
         pass
+
+
+class Resample:
+    """
+    Interpolation of a stored trajectory at many query times at once
+
+    t holds the stored (monotonic, increasing or decreasing) times and y
+    the states, one row per time. All query times are located with a
+    single searchsorted, and every method evaluates all components and
+    times in one pass over arrays of shape (len(tq), n). A scalar or
+    multidimensional tq gives states of shape np.shape(tq) + (n,). Query
+    times outside the stored range are extrapolated from the first or last
+    segment.
+
+        linear    -- straight line through the two ends of the segment
+        quadratic -- Newton form through the segment and its left
+                     neighbour (the three points of SecondOrder)
+        cubic     -- cubic Hermite through the ends of the segment, with the
+                     derivatives dy (e.g. f(t, y)); without dy they are
+                     estimated by second-order finite differences
+
+    """
+
+    def __init__(self, t, y, dy=None):
+        self.t = np.asarray(t)
+        self.y = np.asarray(y)
+        self.dy = dy
+        self.n = len(self.t)
+
+    def locate(self, tq):
+        # Left end of the segment that contains each query time
+        tdir = np.sign(self.t[-1] - self.t[0]) or 1.0
+        idx = np.searchsorted(tdir * self.t, tdir * tq, side="right") - 1
+        return np.clip(idx, 0, self.n - 2)
+
+    def queries(self, tq):
+        # Query times as a flat array, and the shape to restore
+        tq = np.asarray(tq, dtype=float)
+        return np.atleast_1d(tq).ravel(), tq.shape
+
+    def restore(self, yq, shape):
+        return yq.reshape(shape + yq.shape[1:])
+
+    def linear(self, tq):
+        tq, shape = self.queries(tq)
+        i = self.locate(tq)
+        x0, x1 = self.t[i], self.t[i + 1]
+        th = ((tq - x0) / (x1 - x0))[:, None]
+        return self.restore(self.y[i] + th * (self.y[i + 1] - self.y[i]), shape)
+
+    def quadratic(self, tq):
+        if self.n < 3:
+            return self.linear(tq)
+        tq, shape = self.queries(tq)
+        i = np.clip(self.locate(tq) - 1, 0, self.n - 3)
+        x0, x1, x2 = self.t[i], self.t[i + 1], self.t[i + 2]
+        fx0, fx1, fx2 = self.y[i], self.y[i + 1], self.y[i + 2]
+
+        b1 = (fx1 - fx0) / (x1 - x0)[:, None]
+        tmp = (fx2 - fx1) / (x2 - x1)[:, None]
+        b2 = (tmp - b1) / (x2 - x0)[:, None]
+        yq = fx0 + b1 * (tq - x0)[:, None] + b2 * ((tq - x0) * (tq - x1))[:, None]
+        return self.restore(yq, shape)
+
+    def derivatives(self):
+        if self.dy is None:
+            edge = 2 if self.n > 2 else 1
+            self.dy = np.gradient(self.y, self.t, axis=0, edge_order=edge)
+        return np.asarray(self.dy)
+
+    def cubic(self, tq):
+        tq, shape = self.queries(tq)
+        dy = self.derivatives()
+        i = self.locate(tq)
+
+        h = (self.t[i + 1] - self.t[i])[:, None]
+        th = (tq[:, None] - self.t[i][:, None]) / h
+        h00 = (1 + 2 * th) * (1 - th) ** 2
+        h10 = th * (1 - th) ** 2
+        h01 = th**2 * (3 - 2 * th)
+        h11 = th**2 * (th - 1)
+        yq = (
+            h00 * self.y[i]
+            + h10 * h * dy[i]
+            + h01 * self.y[i + 1]
+            + h11 * h * dy[i + 1]
+        )
+        return self.restore(yq, shape)
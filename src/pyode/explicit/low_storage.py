@@ -0,0 +1,407 @@
+import numpy as np
+from step_size import StepSize, ErrorControl
+
+
+class Williamson32:
+    """
+    Low-storage Runge-Kutta, 2N registers
+
+    Coefficients in this scheme were developed by Williamson in:
+
+    Title: Low-Storage Runge-Kutta Schemes
+    Author(s): J.H. Williamson
+    Journal of Computational Physics, Vol 35, No 1, 1980
+
+    RK3(2)3[2N]: the 2nd order embedded weights use stages 1 and 2 and
+    satisfy the order conditions of the equivalent Butcher tableau.
+
+    """
+
+    def __init__(self):
+        self.A = np.zeros((3,), dtype=float)
+        self.B = np.zeros((3,), dtype=float)
+        self.lstype = "2N"
+        self.order = 2
+        self.embedded_stages = [0, 1]
+
+    def coeff_A(self):
+        self.A[1] = -5 / 9
+        self.A[2] = -153 / 128
+        return self.A
+
+    def coeff_B(self):
+        self.B[0] = 1 / 3
+        self.B[1] = 15 / 16
+        self.B[2] = 8 / 15
+        return self.B
+
+
+class CarpenterKennedy45:
+    """
+    Low-storage Runge-Kutta, 2N registers
+
+    Coefficients in this scheme were developed by Carpenter and Kennedy in:
+
+    Title: Fourth-Order 2N-Storage Runge-Kutta Schemes
+    Author(s): M.H. Carpenter and C.A. Kennedy
+    NASA Technical Memorandum 109112, 1994
+
+    RK4(3)5[2N]: the 3rd order embedded weights use stages 1, 3, 4 and 5,
+    which is the only choice of four stages with positive weights, and
+    satisfy the order conditions of the equivalent Butcher tableau.
+
+    """
+
+    def __init__(self):
+        self.A = np.zeros((5,), dtype=float)
+        self.B = np.zeros((5,), dtype=float)
+        self.lstype = "2N"
+        self.order = 3
+        self.embedded_stages = [0, 2, 3, 4]
+
+    def coeff_A(self):
+        self.A[1] = -567301805773 / 1357537059087
+        self.A[2] = -2404267990393 / 2016746695238
+        self.A[3] = -3550918686646 / 2091501179385
+        self.A[4] = -1275806237668 / 842570457699
+        return self.A
+
+    def coeff_B(self):
+        self.B[0] = 1432997174477 / 9575080441755
+        self.B[1] = 5161836677717 / 13612068292357
+        self.B[2] = 1720146321549 / 2090206949498
+        self.B[3] = 3134564353537 / 4481467310338
+        self.B[4] = 2277821191437 / 14882151754819
+        return self.B
+
+
+class KennedyCarpenterLewis43:
+    """
+    Low-storage Runge-Kutta pair, 2R registers
+
+    Coefficients in this scheme were developed by Kennedy, Carpenter and
+    Lewis in:
+
+    Title: Low-storage, explicit Runge-Kutta schemes for the compressible
+           Navier-Stokes equations
+    Author(s): C.A. Kennedy, M.H. Carpenter and R.M. Lewis
+    Applied Numerical Mathematics, Vol 35, No 3, 2000
+
+    RK4(3)5[2R+]C
+
+    """
+
+    def __init__(self):
+        self.a = np.zeros((4,), dtype=float)
+        self.bt = np.zeros((5,), dtype=float)
+        self.bhat = np.zeros((5,), dtype=float)
+        self.lstype = "2R"
+        self.order = 3
+
+    # -- First subdiagonal of A --#
+    def coeff_a(self):
+        self.a[0] = 970286171893 / 4311952581923
+        self.a[1] = 6584761158862 / 12103376702013
+        self.a[2] = 2251764453980 / 15575788980749
+        self.a[3] = 26877169314380 / 34165994151039
+        return self.a
+
+    # -- 4th order weights --#
+    def coeff_bt(self):
+        self.bt[0] = 1153189308089 / 22510343858157
+        self.bt[1] = 1772645290293 / 4653164025191
+        self.bt[2] = -1672844663538 / 4480602732383
+        self.bt[3] = 2114624349019 / 3568978502595
+        self.bt[4] = 5198255086312 / 14908931495163
+        return self.bt
+
+    # -- 3rd order weights --#
+    def coeff_bhat(self):
+        self.bhat[0] = 1016888040809 / 7410784769900
+        self.bhat[1] = 11231460423587 / 58533540763752
+        self.bhat[2] = -1563879915014 / 6823010717585
+        self.bhat[3] = 606302364029 / 971179775848
+        self.bhat[4] = 1097981568119 / 3980877426909
+        return self.bhat
+
+
+class KennedyCarpenterLewis54:
+    """
+    Low-storage Runge-Kutta pair, 2R registers
+
+    Coefficients in this scheme were developed by Kennedy, Carpenter and
+    Lewis in:
+
+    Title: Low-storage, explicit Runge-Kutta schemes for the compressible
+           Navier-Stokes equations
+    Author(s): C.A. Kennedy, M.H. Carpenter and R.M. Lewis
+    Applied Numerical Mathematics, Vol 35, No 3, 2000
+
+    RK5(4)9[2R+]S
+
+    """
+
+    def __init__(self):
+        self.a = np.zeros((8,), dtype=float)
+        self.bt = np.zeros((9,), dtype=float)
+        self.bhat = np.zeros((9,), dtype=float)
+        self.lstype = "2R"
+        self.order = 4
+
+    # -- First subdiagonal of A --#
+    def coeff_a(self):
+        self.a[0] = 1107026461565 / 5417078080134
+        self.a[1] = 38141181049399 / 41724347789894
+        self.a[2] = 493273079041 / 11940823631197
+        self.a[3] = 1851571280403 / 6147804934346
+        self.a[4] = 11782306865191 / 62590030070788
+        self.a[5] = 9452544825720 / 13648368537481
+        self.a[6] = 4435885630781 / 26285702406235
+        self.a[7] = 2357909744247 / 11371140753790
+        return self.a
+
+    # -- 5th order weights --#
+    def coeff_bt(self):
+        self.bt[0] = 2274579626619 / 23610510767302
+        self.bt[1] = 693987741272 / 12394497460941
+        self.bt[2] = -347131529483 / 15096185902911
+        self.bt[3] = 1144057200723 / 32081666971178
+        self.bt[4] = 1562491064753 / 11797114684756
+        self.bt[5] = 13113619727965 / 44346030145118
+        self.bt[6] = 393957816125 / 7825732611452
+        self.bt[7] = 720647959663 / 6565743875477
+        self.bt[8] = 3559252274877 / 14424734981077
+        return self.bt
+
+    # -- 4th order weights --#
+    def coeff_bhat(self):
+        self.bhat[0] = 266888888871 / 3040372307578
+        self.bhat[1] = 34125631160 / 2973680843661
+        self.bhat[2] = -653811289250 / 9267220972999
+        self.bhat[3] = 323544662297 / 2461529853637
+        self.bhat[4] = 1105885670474 / 4964345317203
+        self.bhat[5] = 1408484642121 / 8758221613943
+        self.bhat[6] = 1454774750537 / 11112645198328
+        self.bhat[7] = 772137014323 / 4386814405182
+        self.bhat[8] = 277420604269 / 1857595682219
+        return self.bhat
+
+
+###------------------------------###
+
+
+class LowStorage:
+    """
+    Adaptive integration with low-storage Runge-Kutta schemes
+
+    A step only holds the registers of the scheme (two vectors of size n for
+    2N and 2R schemes), the accumulated difference to the embedded solution,
+    and the solution at the start of the step for retrying rejected steps.
+    These four vectors are allocated once per solve and updated in place,
+    and the output of the right-hand side serves as scratch, so no stage
+    matrix or other temporary of size n is allocated. With store='none'
+    or a stride, the memory does not grow with the number of steps. The
+    array returned by the right-hand side is overwritten, so f must return
+    a fresh array rather than one it keeps.
+
+    """
+
+    def __init__(self, f, params, method):
+        self.f = f
+        self.params = params
+        self.method = method
+
+        if method == "2n-rk3":
+            tab = Williamson32()
+        elif method == "2n-rk4":
+            tab = CarpenterKennedy45()
+        elif method == "2r-rk4":
+            tab = KennedyCarpenterLewis43()
+        elif method == "2r-rk5":
+            tab = KennedyCarpenterLewis54()
+        else:
+            raise RuntimeError(
+                "Method is unknown. Available low-storage methods are: '2N-RK3', '2N-RK4', '2R-RK4', and '2R-RK5'."
+            )
+        self.lstype = tab.lstype
+        self.p = tab.order
+
+        if self.lstype == "2N":
+            self.A = tab.coeff_A()
+            self.B = tab.coeff_B()
+            self.butcher()
+            self.bhat = self.embedded(tab.order, tab.embedded_stages)
+        else:
+            self.asub = tab.coeff_a()
+            self.bt = tab.coeff_bt()
+            self.bhat = tab.coeff_bhat()
+            self.butcher()
+
+        # Weights of the error estimate y1 - yhat
+        self.be = self.bt - self.bhat
+        self.stages = len(self.bt)
+        self.nfev = 0
+
+    def butcher(self):
+        s = len(self.B) if self.lstype == "2N" else len(self.bt)
+        self.a = np.zeros((s, s))
+
+        if self.lstype == "2N":
+            # Track the stage coefficients held in the two registers
+            ycoef = np.zeros((s,))
+            dycoef = np.zeros((s,))
+            for i in range(s):
+                self.a[i, :] = ycoef
+                dycoef = self.A[i] * dycoef
+                dycoef[i] += 1.0
+                ycoef = ycoef + self.B[i] * dycoef
+            self.bt = ycoef
+        else:
+            for i in range(1, s):
+                self.a[i, i - 1] = self.asub[i - 1]
+                self.a[i, : i - 1] = self.bt[: i - 1]
+
+        self.c = np.sum(self.a, axis=1)
+
+    def embedded(self, q, stages):
+        # Weights of order q (q <= 3) on as many stages as there are
+        # order conditions: 1, 2 and 4 conditions for q = 1, 2, 3
+        a, c = self.a, self.c
+        m = [1, 2, 4][q - 1]
+        rows = np.array([np.ones(len(c)), c, c**2, a @ c])[:m, stages]
+        rhs = np.array([1.0, 1 / 2, 1 / 3, 1 / 6])[:m]
+        bhat = np.zeros(len(c))
+        bhat[stages] = np.linalg.solve(rows, rhs)
+        return bhat
+
+    def registers(self, y):
+        # Allocated once per solve and updated in place by every step
+        self.S1 = np.empty_like(y)
+        self.S2 = np.empty_like(y)
+        self.e = np.empty_like(y)
+
+    def rhs(self, t, x):
+        # The result is overwritten, so it must not alias the registers
+        F = self.f(t, x, self.params)
+        if type(F) != np.ndarray or F.dtype != x.dtype or np.may_share_memory(F, x):
+            F = np.array(F, dtype=x.dtype)
+        return F
+
+    def step(self, t, y, h):
+        # y is left untouched for retries; the new solution is in S2. The
+        # output F of the right-hand side is scaled in place and then used
+        # as scratch, so no other temporary of size n is created.
+        S1, S2, e = self.S1, self.S2, self.e
+        S2[:] = y
+        e[:] = 0.0
+
+        if self.lstype == "2N":
+            # S2 = solution, S1 = accumulated increment
+            S1[:] = 0.0
+            for i in range(self.stages):
+                F = self.rhs(t + self.c[i] * h, S2)
+                F *= h
+                S1 *= self.A[i]
+                S1 += F
+                F *= self.be[i]
+                e += F
+                np.multiply(S1, self.B[i], out=F)
+                S2 += F
+        else:
+            # S2 = solution, S1 = stage value and slope
+            S1[:] = y
+            for i in range(self.stages):
+                if i > 0:
+                    S1 *= self.asub[i - 1] - self.bt[i - 1]
+                    S1 += S2
+                F = self.rhs(t + self.c[i] * h, S1)
+                F *= h
+                S1[:] = F
+                np.multiply(S1, self.bt[i], out=F)
+                S2 += F
+                np.multiply(S1, self.be[i], out=F)
+                e += F
+        self.nfev += self.stages
+
+        return S2, e
+
+    def keep(self, store, nsteps):
+        if store == "y":
+            return True
+        if store == "none":
+            return False
+        return nsteps % store == 0
+
+    def solve(self, t_range, yinit, abstol, reltol, store="y"):
+        # store: 'y' keeps every accepted state, 'none' the final one only,
+        # an integer k every k-th state (and the final one)
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        ss = StepSize(self.f, t, yinit, self.params, self.method, 2)
+        hh, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+
+        ya = yinit.copy()
+        self.registers(ya)
+        tsol = [t] if self.keep(store, 0) else []
+        ysol = [yinit.copy()] if self.keep(store, 0) else []
+
+        nsteps = 1
+        nfailed = 0
+
+        while tdir * (tend - t) > 0:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+            if 1.1 * hh >= abs(tend - t):
+                hh = abs(tend - t)
+
+            noFailed = True
+
+            while True:
+                h = tdir * hh
+                y, e = self.step(t, ya, h)
+                err = ctrl.error(ya, y, e)
+
+                if err > rtol:
+                    nfailed += 1
+                    if hh < hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    hh = ctrl.reject(hh, hmin, err)
+                    continue
+
+                break
+
+            if noFailed:
+                hh = ctrl.accept(hh, err)
+
+            t1 = t + h
+            t = tend if abs(tend - t1) <= hmin else t1
+            # The new solution becomes the start of the next step, and the
+            # old one its solution register, without copying
+            ya, self.S2 = self.S2, ya
+            nsteps += 1
+            if self.keep(store, nsteps - 1):
+                tsol.append(t)
+                ysol.append(ya.copy())
+
+        if not self.keep(store, nsteps - 1):
+            tsol.append(t)
+            ysol.append(ya.copy())
+
+        return (
+            np.array(tsol),
+            np.array(ysol),
+            {
+                "total steps": nsteps,
+                "failed steps": nfailed,
+                "function evaluations": self.nfev,
+                "absolute error": ctrl.atol,
+                "relative error": rtol,
+            },
+        )
@@ -0,0 +1,215 @@
+import numpy as np
+from estimation import Variables
+from step_size import StepSize, ErrorControl
+from tableaux_mri import SanduERK33
+
+
+class Multirate(Variables):
+    """
+    Multirate infinitesimal integration of fast/slow partitioned systems
+
+    The macro step H follows MRI-GARK-ERK33a (third order, tableaux_mri).
+    The slow right-hand side is evaluated at the three macro stages only.
+    Between the stages, the fast components are integrated by m sub-steps
+    of the chosen tableau, while the slow components move along the
+    polynomial forcing built from the slow stage derivatives. The fast
+    components never take a macro step, so H is limited by the accuracy of
+    the slow dynamics and not by the fast time scale.
+
+    The local error is estimated on the whole state, from an embedded second
+    order solution that repeats the fast solve of the last stage with a
+    different forcing. The number of sub-steps is adapted from the embedded
+    error of the sub-steps.
+
+    If f_fast(t, y, params) is given, it must return the derivatives of the
+    fast components only. Without it every sub-step stage evaluates the full
+    right-hand side f and discards its slow part, which costs as much as the
+    slow evaluations it replaces.
+
+    Title: A Class of Multirate Infinitesimal GARK Methods
+    Author(s): A. Sandu
+    SIAM Journal on Numerical Analysis, Vol 57, No 5, 2019
+
+    """
+
+    def __init__(self, f, f_fast, params, fast, n_odes, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.f = f
+        self.f_fast = f_fast
+        self.params = params
+        self.fast = np.array(fast, dtype=int)
+        self.slow = np.setdiff1d(np.arange(n_odes), self.fast)
+
+        mri = SanduERK33()
+        self.cm = mri.coeff_c()
+        self.gamma0 = mri.coeff_gamma0()
+        self.gamma1 = mri.coeff_gamma1()
+        self.gammahat = mri.coeff_gammahat()
+        self.q = mri.order
+
+        self.nfev_slow = 0
+        self.nfev_fast = 0
+
+    def slow_rhs(self, t, y):
+        self.nfev_slow += 1
+        return self.f(t, y, self.params)[self.slow]
+
+    def fast_rhs(self, t, y):
+        self.nfev_fast += 1
+        if self.f_fast is not None:
+            return self.f_fast(t, y, self.params)
+        return self.f(t, y, self.params)[self.fast]
+
+    def forcing(self, s0, fs, g0, g1, H, dc):
+        # Slow components at tau in [0, dc H] after the start of the stage
+        def slow_at(tau):
+            th = tau / dc
+            return s0 + (g0 * th + g1 * th**2 / (2 * H)) @ fs
+
+        return slow_at
+
+    def micro(self, t, z, h, slow_at, tau, y):
+        k = np.zeros((self.stages, len(z)))
+        for i in range(self.stages):
+            ti = tau + self.c[i] * h
+            y[self.slow] = slow_at(ti)
+            y[self.fast] = z + h * (self.a[i, :i] @ k[:i, :])
+            k[i, :] = self.fast_rhs(t + ti, y)
+        return z + h * (self.bt @ k), z + h * (self.bhat @ k)
+
+    def stage(self, t, y, H, dc, g0, g1, fs, m, ctrl):
+        # Fast problem over dc * H from y, slow components along the forcing
+        slow_at = self.forcing(y[self.slow], fs, g0, g1, H, dc)
+        h = dc * H / m
+        z = y[self.fast]
+        work = y.copy()
+        errmax = 0.0
+        for i in range(m):
+            z1, zhat = self.micro(t, z, h, slow_at, i * h, work)
+            errmax = max(errmax, ctrl.error(z, z1, z1 - zhat))
+            z = z1
+
+        y1 = y.copy()
+        y1[self.slow] = slow_at(dc * H)
+        y1[self.fast] = z
+        return y1, errmax
+
+    def macro(self, t, y, H, m, ctrl):
+        fs = np.zeros((len(self.cm) - 1, len(self.slow)))
+        fs[0, :] = self.slow_rhs(t, y)
+
+        Y = y
+        errf = 0.0
+        for i in range(len(self.cm) - 1):
+            dc = self.cm[i + 1] - self.cm[i]
+            Yprev = Y
+            Y, e = self.stage(
+                t + self.cm[i] * H,
+                Yprev,
+                H,
+                dc,
+                self.gamma0[i, : i + 1],
+                self.gamma1[i, : i + 1],
+                fs[: i + 1, :],
+                m,
+                ctrl,
+            )
+            errf = max(errf, e)
+            if i + 1 < len(fs):
+                fs[i + 1, :] = self.slow_rhs(t + self.cm[i + 1] * H, Y)
+
+        # -- Embedded solution: last stage again, second order forcing --#
+        yhat, e = self.stage(
+            t + self.cm[-2] * H,
+            Yprev,
+            H,
+            self.cm[-1] - self.cm[-2],
+            self.gammahat,
+            np.zeros(len(self.gammahat)),
+            fs,
+            m,
+            ctrl,
+        )
+        errf = max(errf, e)
+
+        return Y, yhat, errf
+
+    def solve(self, t_range, yinit, abstol, reltol, substeps=4, maxsubsteps=1024):
+        ctrl = ErrorControl(abstol, reltol, self.q)
+        inner = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        ss = StepSize(self.f, t, yinit, self.params, self.method, 2)
+        HH, Hmax = ss.init_step_v3(t_range, threshold, rtol, self.q)
+
+        ya = yinit.copy()
+        tsol = [t]
+        ysol = [ya]
+        m = substeps
+
+        nsteps = 1
+        nfailed = 0
+        nsubsteps = 0
+
+        while tdir * (tend - t) > 0:
+            Hmin = 16 * np.spacing(t)
+            HH = min(Hmax, max(Hmin, HH))
+            if 1.1 * HH >= abs(tend - t):
+                HH = abs(tend - t)
+
+            noFailed = True
+
+            while True:
+                H = tdir * HH
+                y1, yhat, errf = self.macro(t, ya, H, m, inner)
+                nsubsteps += len(self.cm) * m
+
+                # -- Fast components: more sub-steps for the same macro step --#
+                if errf > rtol and m < maxsubsteps:
+                    m = 2 * m
+                    continue
+
+                err = max(ctrl.error(ya, y1, y1 - yhat), errf)
+
+                if err > rtol:
+                    nfailed += 1
+                    if HH < Hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    HH = ctrl.reject(HH, Hmin, err)
+                    continue
+
+                break
+
+            if noFailed:
+                HH = ctrl.accept(HH, err)
+
+            # Fewer sub-steps next time if half as many would still pass
+            if m > 1 and errf * 2 ** (self.p + 1) < 0.5 * rtol:
+                m = m // 2
+
+            t1 = t + H
+            t = tend if abs(tend - t1) <= Hmin else t1
+            ya = y1
+            tsol.append(t)
+            ysol.append(ya)
+            nsteps += 1
+
+        return (
+            np.array(tsol),
+            np.array(ysol),
+            {
+                "total steps": nsteps,
+                "failed steps": nfailed,
+                "fast substeps": nsubsteps,
+                "slow evaluations": self.nfev_slow,
+                "fast evaluations": self.nfev_fast,
+                "absolute error": ctrl.atol,
+                "relative error": rtol,
+            },
+        )
@@ -0,0 +1,154 @@
+import numpy as np
+
+
+def gmres(matvec, b, tol, restart=20, maxiter=None, precond=None):
+    """
+    Restarted GMRES for A x = b with right preconditioning, x0 = 0
+
+    Only the Arnoldi basis of the current cycle is stored, (restart + 1)
+    vectors of length n. Stops when ||b - A x|| <= tol.
+
+    Title: GMRES: A generalized minimal residual algorithm for solving
+           nonsymmetric linear systems
+    Author(s): Y. Saad and M.H. Schultz
+    SIAM Journal on Scientific and Statistical Computing, Vol 7, No 3, 1986
+
+    """
+    n = len(b)
+    maxiter = 10 * n if maxiter is None else maxiter
+    prec = (lambda v: v) if precond is None else precond
+
+    x = np.zeros(n)
+    r = b.copy()
+    beta = np.sqrt(np.sum(r**2))
+    niter = 0
+
+    while beta > tol and niter < maxiter:
+        m = min(restart, maxiter - niter)
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs = np.zeros(m)
+        sn = np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+
+        k = 0
+        for k in range(m):
+            niter += 1
+            w = matvec(prec(V[k]))
+            # Modified Gram-Schmidt
+            for i in range(k + 1):
+                H[i, k] = V[i] @ w
+                w = w - H[i, k] * V[i]
+            H[k + 1, k] = np.sqrt(np.sum(w**2))
+            if H[k + 1, k] > 0.0:
+                V[k + 1] = w / H[k + 1, k]
+
+            # Givens rotations keep H upper triangular
+            for i in range(k):
+                temp = cs[i] * H[i, k] + sn[i] * H[i + 1, k]
+                H[i + 1, k] = -sn[i] * H[i, k] + cs[i] * H[i + 1, k]
+                H[i, k] = temp
+            rr = np.hypot(H[k, k], H[k + 1, k])
+            cs[k], sn[k] = (1.0, 0.0) if rr == 0.0 else (H[k, k] / rr, H[k + 1, k] / rr)
+            H[k, k] = rr
+            H[k + 1, k] = 0.0
+            g[k + 1] = -sn[k] * g[k]
+            g[k] = cs[k] * g[k]
+
+            if abs(g[k + 1]) <= tol or H[k, k] == 0.0:
+                break
+
+        kk = k + 1
+        z = np.zeros(kk)
+        for i in range(kk - 1, -1, -1):
+            if H[i, i] != 0.0:
+                z[i] = (g[i] - H[i, i + 1 : kk] @ z[i + 1 :]) / H[i, i]
+        x = x + prec(z @ V[:kk])
+
+        r = b - matvec(x)
+        beta = np.sqrt(np.sum(r**2))
+        if kk < m and beta > tol:
+            break  # breakdown, no further progress
+
+    return x, niter
+
+
+###------------------------------###
+
+
+class NewtonKrylov:
+    """
+    Jacobian-free Newton-Krylov solution of F(Y) = 0
+
+    The Newton correction J dY = -F(Y) is solved by GMRES, where the
+    products with the Jacobian are forward differences of F,
+
+        J v ~ (F(Y + eps v) - F(Y)) / eps,
+
+    so no matrix is formed and the memory is O(n * restart). The linear
+    tolerance follows the Eisenstat-Walker forcing terms (choice 2),
+    loose far from the solution and tight close to it:
+
+        eta_k = 0.9 (||F(Y_k)|| / ||F(Y_{k-1})||)^2,   eta_k <= eta_max
+
+    A user preconditioner M ~ J^{-1} is applied from the right.
+
+    Title: Choosing the forcing terms in an inexact Newton method
+    Author(s): S.C. Eisenstat and H.F. Walker
+    SIAM Journal on Scientific Computing, Vol 17, No 1, 1996
+
+    """
+
+    def __init__(self, restart=20, maxiter=10, eta_max=0.9):
+        self.restart = restart
+        self.maxiter = maxiter
+        self.eta_max = eta_max
+
+        self.nfev = 0
+        self.niter = 0
+        self.nlin = 0
+
+    def solve(self, F, Y, norm, tol, precond=None):
+        # Returns the solution, or None when the iteration does not converge
+        FY = F(Y)
+        self.nfev += 1
+        fnorm = np.sqrt(np.sum(FY**2))
+        eta = min(0.5, self.eta_max)
+
+        for it in range(self.maxiter):
+            self.niter += 1
+            ynorm = np.sqrt(np.sum(Y**2))
+
+            def jvp(v, Y=Y, FY=FY, ynorm=ynorm):
+                vnorm = np.sqrt(np.sum(v**2))
+                if vnorm == 0.0:
+                    return np.zeros_like(v)
+                eps = np.sqrt(np.finfo(float).eps) * (1.0 + ynorm) / vnorm
+                self.nfev += 1
+                return (F(Y + eps * v) - FY) / eps
+
+            dY, nlin = gmres(jvp, -FY, eta * fnorm, self.restart, None, precond)
+            self.nlin += nlin
+            Y = Y + dY
+
+            FY = F(Y)
+            self.nfev += 1
+            fnorm_old, fnorm = fnorm, np.sqrt(np.sum(FY**2))
+
+            # Inexact corrections can be small far from the solution, so
+            # convergence is decided on the residual, in units of Y
+            if norm(Y, dY) <= tol and norm(Y, FY) <= tol:
+                return Y
+            if fnorm >= fnorm_old:
+                return None
+
+            # Eisenstat-Walker choice 2, with its safeguard
+            eta_old = eta
+            eta = 0.9 * (fnorm / fnorm_old) ** 2
+            if 0.9 * eta_old**2 > 0.1:
+                eta = max(eta, 0.9 * eta_old**2)
+            eta = min(eta, self.eta_max)
+
+        return None
@@ -0,0 +1,177 @@
+import numpy as np
+from estimation import Variables
+from step_size import StepSize, ErrorControl
+from tableaux_rkn import DormandElMikkawyPrince43, DormandElMikkawyPrince64
+
+
+class Nystrom:
+    """
+    Adaptive Runge-Kutta-Nystrom integration of y'' = f(t, y, y')
+
+    One step with stage slopes k_i = f(t + c_i h, Y_i, Y'_i):
+
+        Y_i  = y + c_i h y' + h^2 sum_j a_ij k_j
+        Y'_i = y' + h sum_j abar_ij k_j
+        y1   = y + h y' + h^2 sum_i bt_i k_i
+        y1'  = y' + h sum_i bpt_i k_i
+
+    The Dormand-El-Mikkawy-Prince pairs ('rkn43', 'rkn64') are built for
+    f = f(t, y) and need no stage derivatives, which is where the saving in
+    stages comes from. Problems that depend on y' use the Nystrom form of a
+    first-order tableau (abar = A, a = A^2, bt = b A, bpt = b); the stages
+    are the same as for the first-order pair, but each one only evaluates
+    the second derivative.
+
+    Book: Solving Ordinary Differential Equations I: Nonstiff Problems (1993)
+    Author(s): E. Hairer, S.P. Norsett, G. Wanner
+    Chapter: II.14 Numerical Methods for Second Order Differential Equations
+
+    """
+
+    def __init__(self, f, params, method, velocity):
+        self.f = f
+        self.params = params
+        self.method = method
+        self.velocity = velocity
+
+        if velocity == "no":
+            if method == "default" or method == "rkn64":
+                tab = DormandElMikkawyPrince64()
+            elif method == "rkn43":
+                tab = DormandElMikkawyPrince43()
+            else:
+                raise RuntimeError(
+                    "Method is unknown. Available Nystrom methods are: 'rkn43', 'rkn64', and 'Default'."
+                )
+            self.c = tab.coeff_c()
+            self.a = tab.coeff_matA()
+            self.abar = None
+            self.bt = tab.coeff_bt()
+            self.bpt = tab.coeff_bpt()
+            self.bhat = tab.coeff_bhat()
+            self.bphat = tab.coeff_bphat()
+            self.p = tab.order
+        else:
+            if method in ("rkn43", "rkn64"):
+                raise RuntimeError(
+                    "Nystrom pairs 'rkn43' and 'rkn64' need f = f(t, y), use a first-order method when f depends on y'."
+                )
+            vals = Variables(method)
+            self.c = vals.c
+            self.abar = vals.a
+            self.a = vals.a @ vals.a
+            self.bt = vals.bt @ vals.a
+            self.bpt = vals.bt
+            self.bhat = vals.bhat @ vals.a
+            self.bphat = vals.bhat
+            self.p = vals.p
+
+        self.stages = len(self.c)
+        self.fsal = (
+            self.c[-1] == 1.0
+            and np.allclose(self.a[-1, :], self.bt)
+            and (self.abar is None or np.allclose(self.abar[-1, :], self.bpt))
+        )
+        self.nfev = 0
+
+    def rhs(self, t, y, yp):
+        self.nfev += 1
+        if self.abar is None:
+            return self.f(t, y, self.params)
+        return self.f(t, y, yp, self.params)
+
+    def first_order(self, t, z, params):
+        n = len(z) // 2
+        return np.append(z[n:], self.rhs(t, z[:n], z[n:]))
+
+    def step(self, t, y, yp, h, k0=None):
+        k = np.zeros((self.stages, len(y)))
+        for i in range(self.stages):
+            if i == 0 and k0 is not None:
+                k[0, :] = k0
+                continue
+            Y = y + self.c[i] * h * yp + h**2 * (self.a[i, :i] @ k[:i, :])
+            Yp = None
+            if self.abar is not None:
+                Yp = yp + h * (self.abar[i, :i] @ k[:i, :])
+            k[i, :] = self.rhs(t + self.c[i] * h, Y, Yp)
+
+        y1 = y + h * yp + h**2 * (self.bt @ k)
+        yp1 = yp + h * (self.bpt @ k)
+        ey = h**2 * ((self.bt - self.bhat) @ k)
+        ep = h * ((self.bpt - self.bphat) @ k)
+
+        return y1, yp1, np.append(ey, ep), k
+
+    def solve(self, t_range, yinit, ypinit, abstol, reltol):
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+        n = len(yinit)
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        za = np.append(yinit, ypinit)
+        ss = StepSize(self.first_order, t, za, self.params, self.method, 2)
+        hh, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+
+        tsol = [t]
+        zsol = [za]
+        k0 = None
+
+        nsteps = 1
+        nfailed = 0
+
+        while tdir * (tend - t) > 0:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+            if 1.1 * hh >= abs(tend - t):
+                hh = abs(tend - t)
+
+            noFailed = True
+
+            while True:
+                h = tdir * hh
+                y, yp, e, k = self.step(t, za[:n], za[n:], h, k0)
+                z = np.append(y, yp)
+                err = ctrl.error(za, z, e)
+
+                if err > rtol:
+                    nfailed += 1
+                    if hh < hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    hh = ctrl.reject(hh, hmin, err)
+                    continue
+
+                break
+
+            if noFailed:
+                hh = ctrl.accept(hh, err)
+
+            # First same as last: the last stage is f at the new solution
+            k0 = k[-1, :] if self.fsal else None
+
+            t1 = t + h
+            t = tend if abs(tend - t1) <= hmin else t1
+            za = z
+            tsol.append(t)
+            zsol.append(za)
+            nsteps += 1
+
+        zsol = np.array(zsol)
+
+        return (
+            np.array(tsol),
+            zsol[:, :n],
+            zsol[:, n:],
+            {
+                "total steps": nsteps,
+                "failed steps": nfailed,
+                "function evaluations": self.nfev,
+                "absolute error": ctrl.atol,
+                "relative error": rtol,
+            },
+        )
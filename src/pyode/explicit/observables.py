@@ -0,0 +1,192 @@
+import numpy as np
+
+
+class Observer:
+    """
+    Scalar or vector observable g(t, y) sampled on the fly
+
+    Without a grid, g is sampled at every accepted step (including the
+    initial state). With a grid, g is sampled at the grid times from the
+    cubic Hermite dense output of the accepted steps; grid times outside the
+    integration interval are ignored.
+
+    A plain Observer keeps every sample, and result() returns the sample
+    times and values as arrays (t, g): the trajectory of g without that of
+    y. The subclasses fold the samples into one value with
+    reduce(acc, t, g) instead, where acc is None for the first sample.
+
+    """
+
+    def __init__(self, g, grid=None):
+        self.g = g
+        self.grid = None if grid is None else np.sort(np.atleast_1d(grid))
+        self.value = None
+        self.nsamples = 0
+
+    def sample(self, t, y, params):
+        gy = np.asarray(self.g(t, y, params), dtype=float)
+        self.value = self.reduce(self.value, t, gy)
+        self.nsamples += 1
+
+    def reduce(self, acc, t, gy):
+        if acc is None:
+            acc = ([], [])
+        acc[0].append(t)
+        acc[1].append(gy.copy())
+        return acc
+
+    def result(self):
+        times, values = ([], []) if self.value is None else self.value
+        return np.array(times), np.array(values)
+
+
+class Reduction(Observer):
+    """
+    User reduction acc = func(acc, t, g(t, y)), starting from init
+
+    """
+
+    def __init__(self, g, func, init, grid=None):
+        super().__init__(g, grid)
+        self.func = func
+        self.value = init
+
+    def reduce(self, acc, t, gy):
+        return self.func(acc, t, gy)
+
+    def result(self):
+        return self.value
+
+
+class Minimum(Reduction):
+    """Running (elementwise) minimum of g"""
+
+    def __init__(self, g, grid=None):
+        super().__init__(g, None, None, grid)
+
+    def reduce(self, acc, t, gy):
+        return gy.copy() if acc is None else np.minimum(acc, gy)
+
+
+class Maximum(Reduction):
+    """Running (elementwise) maximum of g"""
+
+    def __init__(self, g, grid=None):
+        super().__init__(g, None, None, grid)
+
+    def reduce(self, acc, t, gy):
+        return gy.copy() if acc is None else np.maximum(acc, gy)
+
+
+class Integral:
+    """
+    Running integral of g(t, y) over the integration interval
+
+    Every accepted step adds h * sum_i b_i g(t + c_i h, Y_i) evaluated at the
+    stage values Y_i of that step, which is the same Runge-Kutta step applied
+    to the augmented equation z' = g(t, y). The quadrature has the order of
+    the propagated solution and costs one evaluation of g per stage.
+
+    """
+
+    def __init__(self, g):
+        self.g = g
+        self.value = 0.0
+        self.span = 0.0
+
+    def integrate(self, t, h, ystages, c, weights, params):
+        tmp = 0.0
+        for i in range(len(weights)):
+            if weights[i] != 0.0:
+                tmp += weights[i] * np.asarray(
+                    self.g(t + c[i] * h, ystages[i, :], params), dtype=float
+                )
+        self.value = self.value + h * tmp
+        self.span += h
+
+    def result(self):
+        return self.value
+
+
+class TimeAverage(Integral):
+    """Time average of g(t, y), the running integral over the elapsed time"""
+
+    def result(self):
+        return self.value / self.span if self.span != 0.0 else self.value
+
+
+###------------------------------###
+
+
+class Observables:
+    """
+    Reductions of the solution evaluated on accepted steps
+
+    observers is a dict of Integral, TimeAverage, Observer, Minimum,
+    Maximum and Reduction objects (or any object with the same integrate
+    or sample and result methods).
+
+    Only the state of the last accepted step is held, so the memory does not
+    grow with the trajectory length. Grid observers need the slope at the
+    end of a step for the Hermite interpolant; it is the first stage of the
+    next step, so their samples are taken one step late (the last step uses
+    one extra right-hand side evaluation).
+
+    """
+
+    def __init__(self, observers, f, params, method):
+        self.observers = observers
+        self.f = f
+        self.params = params
+        self.method = method
+        self.gridded = [
+            o for o in observers.values() if getattr(o, "grid", None) is not None
+        ]
+        self.pending = None
+
+    def start(self, t, y):
+        for o in self.observers.values():
+            if hasattr(o, "sample") and o.grid is None:
+                o.sample(t, y, self.params)
+
+    def step(self, t, y, h, k, a, c, weights, t1, y1):
+        # -- Stage-consistent quadrature --#
+        ystages = None
+        for o in self.observers.values():
+            if hasattr(o, "integrate"):
+                if ystages is None:
+                    ystages = y + h * (a @ k)
+                o.integrate(t, h, ystages, c, weights, self.params)
+
+        for o in self.observers.values():
+            if hasattr(o, "sample") and o.grid is None:
+                o.sample(t1, y1, self.params)
+
+        # -- Dense output of the previous step, completed with k[0] --#
+        if self.gridded:
+            if self.pending is not None:
+                self.dense(*self.pending, k[0, :])
+            self.pending = (t, y, k[0, :].copy(), t1, y1)
+
+    def finish(self):
+        if self.pending is not None:
+            t, y, f0, t1, y1 = self.pending
+            self.dense(t, y, f0, t1, y1, self.f(t1, y1, self.params), last=True)
+            self.pending = None
+        return {name: o.result() for name, o in self.observers.items()}
+
+    def dense(self, t, y, f0, t1, y1, f1, last=False):
+        # Each grid time belongs to one step [t, t1), the last step is closed
+        h = t1 - t
+        for o in self.gridded:
+            s = np.sign(h) * (o.grid - t)
+            e = np.sign(h) * (t1 - o.grid)
+            tq = o.grid[(s >= 0) & ((e > 0) | (last & (e == 0)))]
+            for tau in tq if h > 0 else tq[::-1]:
+                th = (tau - t) / h
+                h00 = (1 + 2 * th) * (1 - th) ** 2
+                h10 = th * (1 - th) ** 2
+                h01 = th**2 * (3 - 2 * th)
+                h11 = th**2 * (th - 1)
+                yq = h00 * y + h10 * h * f0 + h01 * y1 + h11 * h * f1
+                o.sample(tau, yq, self.params)
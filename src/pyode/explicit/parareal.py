@@ -0,0 +1,123 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from step_size import ErrorControl, propagate
+
+
+class Parareal:
+    """
+    Parallel-in-time integration
+
+    The interval is split into N slices with boundary values U_n. A cheap
+    coarse propagator G (low-order tableau, loose tolerance) runs serially,
+    the accurate fine propagator F runs on all slices at once in a process
+    pool, and the boundary values are corrected by
+
+        U_{n+1} <- G(U_n^new) + F(U_n^old) - G(U_n^old)
+
+    until they stop changing relative to the fine tolerance. After k
+    iterations the first k slices are exact, so they are not solved again.
+
+    Title: Resolution d'EDP par un schema en temps "parareel"
+    Author(s): J.-L. Lions, Y. Maday and G. Turinici
+    Comptes Rendus de l'Academie des Sciences, Vol 332, No 7, 2001
+
+    """
+
+    def __init__(self, f, params, method, coarse_method, workers=None):
+        self.f = f
+        self.params = params
+        self.method = method
+        self.coarse_method = coarse_method
+        self.workers = os.cpu_count() if workers is None else workers
+
+        self.nfev_fine = 0
+        self.nfev_coarse = 0
+
+    def coarse(self, t_range, y, abstol, reltol):
+        tsol, ysol, nfev = propagate(
+            self.f, self.params, self.coarse_method, t_range, y, abstol, reltol, True
+        )
+        self.nfev_coarse += nfev
+        return ysol[-1, :]
+
+    def fine(self, pool, slices, U, abstol, reltol):
+        args = [
+            (self.f, self.params, self.method, slices[n], U[n], abstol, reltol)
+            for n in range(len(slices))
+        ]
+        if pool is None:
+            out = [propagate(*a) for a in args]
+        else:
+            out = list(pool.map(propagate, *zip(*args)))
+        self.nfev_fine += sum(o[2] for o in out)
+        return out
+
+    def solve(self, t_range, yinit, abstol, reltol, nslices, coarse_tol, maxiter=None):
+        ctrl = ErrorControl(abstol, reltol, 1)
+        T = np.linspace(t_range[0], t_range[-1], nslices + 1)
+        slices = [(T[n], T[n + 1]) for n in range(nslices)]
+        maxiter = nslices if maxiter is None else min(maxiter, nslices)
+
+        # -- Initial coarse sweep --#
+        U = [yinit.copy()]
+        for n in range(nslices):
+            U.append(self.coarse(slices[n], U[n], coarse_tol, coarse_tol))
+        G = U[1:]
+
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=min(self.workers, nslices))
+
+        fine = [None] * nslices
+        converged = False
+        niter = 0
+
+        try:
+            while niter < maxiter:
+                # Slices before niter are exact and keep their fine solutions
+                out = self.fine(pool, slices[niter:], U[niter:-1], abstol, reltol)
+                fine[niter:] = out
+                niter += 1
+
+                # -- Serial correction, U_niter is now the fine value --#
+                Unew = U[:niter]
+                Gnew = G[: niter - 1]
+                change = 0.0
+                for n in range(niter - 1, nslices):
+                    if n == niter - 1:
+                        g = G[n]  # same start value as in the last sweep
+                    else:
+                        g = self.coarse(slices[n], Unew[n], coarse_tol, coarse_tol)
+                    Unew.append(g + fine[n][1][-1, :] - G[n])
+                    Gnew.append(g)
+                    change = max(
+                        change,
+                        ctrl.error(U[n + 1], Unew[n + 1], Unew[n + 1] - U[n + 1]),
+                    )
+                U, G = Unew, Gnew
+
+                if change <= ctrl.rtol:
+                    converged = True
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        # Fine trajectories of the last sweep, joined at the slice boundaries
+        tsol = [fine[0][0][:1]] + [o[0][1:] for o in fine]
+        ysol = [fine[0][1][:1, :]] + [o[1][1:, :] for o in fine]
+
+        return (
+            np.concatenate(tsol),
+            np.concatenate(ysol),
+            {
+                "total steps": sum(len(o[0]) - 1 for o in fine) + 1,
+                "parareal iterations": niter,
+                "converged": converged or niter == nslices,
+                "fine evaluations": self.nfev_fine,
+                "coarse evaluations": self.nfev_coarse,
+                "absolute error": ctrl.atol,
+                "relative error": ctrl.rtol,
+            },
+        )
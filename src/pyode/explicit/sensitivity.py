@@ -0,0 +1,118 @@
+import numpy as np
+from estimation import Variables
+
+
+class Jacobian:
+    """
+    Derivatives of f(t, y, params) with respect to y and params
+
+    If the user supplies jac(t, y, params) returning (df/dy, df/dparams),
+    products are formed from the matrices directly. Otherwise each column
+    J_y s_j + J_p e_j is approximated by one directional forward difference,
+    which costs a single extra function evaluation per parameter.
+
+    The adjoint needs the transposed products w^T J_y and w^T J_p only.
+    They come from vjp(t, y, params, w), returning (w^T df/dy, w^T
+    df/dparams), at the cost of about one function evaluation with reverse
+    mode differentiation, or else from the matrices of jac, which costs
+    O(n (n + n_params)) per stage. They are never approximated by
+    differences, which would take n + n_params evaluations per stage.
+
+    """
+
+    def __init__(self, f, params, jac=None, vjp=None):
+        self.f = f
+        self.params = params
+        self.jac = jac
+        self.vjp_func = vjp
+        self.n_params = len(params)
+        self.nfev = 0
+        self.nvjp = 0
+
+    def matrices(self, t, y, fy=None):
+        if self.jac is not None:
+            dfdy, dfdp = self.jac(t, y, self.params)
+            return np.atleast_2d(dfdy), np.atleast_2d(dfdp)
+
+        if fy is None:
+            fy = self.f(t, y, self.params)
+            self.nfev += 1
+
+        n = len(y)
+        eye_y = np.eye(n)
+        eye_p = np.zeros((self.n_params, n))
+        dfdy = self.product(t, y, fy, eye_y, eye_p)
+        dfdp = self.product(t, y, fy, np.zeros((n, self.n_params)))
+        return dfdy, dfdp
+
+    def vjp(self, t, y, w):
+        # (w^T J_y, w^T J_p) without forming the matrices when vjp is given
+        self.nvjp += 1
+        if self.vjp_func is not None:
+            wy, wp = self.vjp_func(t, y, self.params, w)
+            return np.asarray(wy), np.asarray(wp)
+        if self.jac is None:
+            raise ValueError("Vector-Jacobian products need vjp or jac")
+        dfdy, dfdp = self.matrices(t, y)
+        return dfdy.T @ w, dfdp.T @ w
+
+    def product(self, t, y, fy, s, sp=None):
+        if sp is None:
+            sp = np.eye(self.n_params)
+
+        if self.jac is not None:
+            dfdy, dfdp = self.matrices(t, y)
+            return dfdy @ s + dfdp @ sp
+
+        m = s.shape[1]
+        ynorm = np.sqrt(np.sum(y**2))
+        ks = np.zeros((len(y), m))
+        for j in range(m):
+            dnorm = np.sqrt(np.sum(s[:, j] ** 2) + np.sum(sp[:, j] ** 2))
+            if dnorm == 0.0:
+                continue
+            eps = np.sqrt(np.finfo(float).eps) * (1.0 + ynorm) / dnorm
+            fd = self.f(t, y + eps * s[:, j], self.params + eps * sp[:, j])
+            ks[:, j] = (fd - fy) / eps
+        self.nfev += m
+
+        return ks
+
+
+class Sensitivity(Variables):
+    """
+    Forward sensitivity equations S' = J_y S + J_p, S = dy/dparams
+
+    The sensitivity stages are evaluated at the stage values of an accepted
+    step, using the same Butcher tableau as the state, so that S is advanced
+    within the stage loop of the state integration.
+
+    """
+
+    def __init__(self, jacobian, t0, y_init, s_init, k, h, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jacobian = jacobian
+        self.t = t0
+        self.y = y_init
+        self.s = s_init
+        self.k = k
+        self.h = h
+        self.slopes()
+
+    def slopes(self):
+        self.ks = np.zeros((self.stages,) + self.s.shape)
+        for i in range(self.stages):
+            # Same accumulation as Approximation.slopes for identical stages
+            matA = 0.0
+            matS = 0.0
+            for j in range(i):
+                matA += self.a[i, j] * self.h * self.k[j, :]
+                matS += self.a[i, j] * self.h * self.ks[j]
+            self.ks[i] = self.jacobian.product(
+                self.t + self.c[i] * self.h, self.y + matA, self.k[i, :], self.s + matS
+            )
+
+        return self.ks
+
+    def s_approx(self, weights):
+        return self.s + self.h * np.tensordot(weights, self.ks, axes=1)
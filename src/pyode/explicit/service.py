@@ -0,0 +1,213 @@
+import asyncio
+import numpy as np
+from ensemble import Ensemble
+from solution import Solution
+
+
+class Request:
+    def __init__(
+        self, func, t_range, yinit, params, method, abstol, reltol, vectorized, future
+    ):
+        self.func = func
+        self.t_range = t_range
+        self.yinit = yinit
+        self.params = params
+        self.method = method
+        self.abstol = abstol
+        self.reltol = reltol
+        self.vectorized = vectorized
+        self.future = future
+
+    def group(self):
+        # Requests that can share one ensemble integration
+        return (
+            id(self.func),
+            self.method,
+            self.abstol,
+            self.reltol,
+            len(self.yinit),
+            np.shape(self.params),
+            self.vectorized,
+        )
+
+
+class SolveService:
+    """
+    Asynchronous front end that micro-batches single solves
+
+    Callers await solve(...) for one initial value problem. The requests
+    are put on a bounded queue; when it is full, solve() waits, so that a
+    burst of callers is slowed down instead of growing the backlog without
+    limit. A dispatcher collects requests for at most window seconds or
+    until max_batch of them are waiting, groups those that share the
+    right-hand side, method, tolerances and shapes, and integrates each
+    group as one Ensemble in a worker thread, so the event loop is never
+    blocked. At most max_workers batches run at the same time. Each caller
+    gets its own Solution back. A trajectory that fails raises ValueError
+    in its own caller only; an exception raised by the whole batch goes to
+    all of its callers.
+
+    Use as
+
+        async with SolveService() as service:
+            sols = await asyncio.gather(*(service.solve(f, t, y, p) for y in ys))
+
+    """
+
+    def __init__(
+        self, window=0.005, max_batch=256, max_queue=1024, max_workers=1, executor=None
+    ):
+        self.window = window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.max_workers = max_workers
+        self.executor = executor
+
+        self.queue = None
+        self.dispatcher = None
+        self.running = set()
+        self.slots = None
+
+        self.nbatches = 0
+        self.nrequests = 0
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def start(self):
+        if self.dispatcher is not None:
+            return
+        self.queue = asyncio.Queue(self.max_queue)
+        self.slots = asyncio.Semaphore(self.max_workers)
+        self.dispatcher = asyncio.get_running_loop().create_task(self.dispatch())
+
+    async def close(self):
+        # Finishes the requests already queued, then stops the dispatcher
+        if self.dispatcher is None:
+            return
+        await self.queue.put(None)
+        await self.dispatcher
+        if self.running:
+            await asyncio.gather(*self.running)
+        self.dispatcher = None
+
+    async def solve(
+        self,
+        func,
+        t_range,
+        yinit,
+        params,
+        method="Default",
+        abstol=1e-6,
+        reltol=1e-3,
+        vectorized=False,
+    ):
+        if self.dispatcher is None:
+            raise RuntimeError("Service is not running, call start() first")
+
+        future = asyncio.get_running_loop().create_future()
+        request = Request(
+            func,
+            np.asarray(t_range, dtype=float),
+            np.atleast_1d(np.asarray(yinit, dtype=float)),
+            np.asarray(params, dtype=float),
+            method.lower(),
+            abstol,
+            reltol,
+            vectorized,
+            future,
+        )
+        await self.queue.put(request)
+        return await future
+
+    async def collect(self, first):
+        # First request plus whatever arrives within the window
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    async def dispatch(self):
+        stop = False
+        while not stop:
+            first = await self.queue.get()
+            if first is None:
+                break
+            batch, stop = await self.collect(first)
+
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.group(), []).append(request)
+            for requests in groups.values():
+                await self.slots.acquire()
+                task = asyncio.get_running_loop().create_task(self.run(requests))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+    async def run(self, requests):
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                sols = await loop.run_in_executor(self.executor, integrate, requests)
+            except Exception as exc:
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+                return
+
+            self.nbatches += 1
+            self.nrequests += len(requests)
+            for request, sol in zip(requests, sols):
+                if request.future.done():
+                    continue
+                if isinstance(sol, Exception):
+                    request.future.set_exception(sol)
+                else:
+                    request.future.set_result(sol)
+        finally:
+            self.slots.release()
+
+    def stats(self):
+        return {
+            "batches": self.nbatches,
+            "requests": self.nrequests,
+            "mean batch size": self.nrequests / self.nbatches if self.nbatches else 0.0,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+        }
+
+
+def integrate(requests):
+    # Runs in a worker thread: one ensemble solve for a group of requests.
+    # Returns a Solution per request, or the error of a failed trajectory
+    first = requests[0]
+    params = np.array([r.params for r in requests])
+    ens = Ensemble(first.func, params, first.vectorized, first.method)
+    t_range = np.array([[r.t_range[0], r.t_range[-1]] for r in requests])
+    yinit = np.array([r.yinit for r in requests])
+    results = ens.solve(t_range, yinit, first.abstol, first.reltol)
+
+    sols = []
+    for r, (tsol, ysol, yhatsol, stats) in zip(requests, results):
+        if not stats["success"]:
+            sols.append(ValueError(stats["message"]))
+            continue
+        stats["batch size"] = len(requests)
+        sols.append(
+            Solution(r.func, r.params, r.method, tsol, ysol, yhatsol, stats, "y+err")
+        )
+    return sols
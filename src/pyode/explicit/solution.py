@@ -0,0 +1,123 @@
+import numpy as np
+from estimation import Approximation
+from interpolation import Resample
+
+
+class Solution:
+    """
+    Result of an integration
+
+    The stored grid and states are available as tsol, ysol and yhatsol, and
+    the integration statistics as stats. The object also behaves as the tuple
+    (tsol, ysol, yhatsol, stats) that RKExplicit used to return: it can be
+    unpacked and indexed, and its length is 4.
+
+    The storage policy decides what is kept during the integration:
+
+        'y+err' -- states and embedded states (yhatsol)
+        'y'     -- states only, yhatsol is None
+        'none'  -- the final state only
+
+    Quantities that are not stored are computed on first access and cached:
+    errsol, the per-step local error estimate y - yhat, is recomputed from
+    the stored states, and calling the object evaluates a cubic Hermite
+    dense output through the stored states and their derivatives.
+    resample(t, kind) evaluates linear, quadratic or cubic interpolation
+    at a whole array of times in one pass.
+
+    Reductions requested with the observables option of the solver are
+    collected in the observables dict. For a structured initial state,
+    ytree gives ysol in the same structure, as views with a leading time
+    axis.
+
+    The gradient drivers return a Solution as well: RKSensitivity adds the
+    sensitivities dy/dparams on the stored grid as ssol, and RKAdjoint,
+    which keeps the final state only, adds the gradients of the loss as
+    dgdp (parameters) and dgdy0 (initial state).
+
+    """
+
+    def __init__(self, f, params, method, tsol, ysol, yhatsol, stats, store="y+err"):
+        self.f = f
+        self.params = params
+        self.method = method
+        self.tsol = tsol
+        self.ysol = ysol
+        self.yhatsol = yhatsol
+        self.stats = stats
+        self.store = store
+        self.observables = None
+        self.layout = None
+
+        self._errsol = None
+        self._dysol = None
+
+    def __iter__(self):
+        return iter((self.tsol, self.ysol, self.yhatsol, self.stats))
+
+    def __getitem__(self, i):
+        return (self.tsol, self.ysol, self.yhatsol, self.stats)[i]
+
+    def __len__(self):
+        return 4
+
+    def check_stored(self, what):
+        if self.store == "none":
+            raise RuntimeError(f"{what} needs the stored trajectory, use store='y'")
+
+    @property
+    def ytree(self):
+        if self.layout is None:
+            raise RuntimeError("ytree needs a structured initial state")
+        return self.layout.unflatten(self.ysol)
+
+    @property
+    def errsol(self):
+        if self._errsol is None:
+            self.check_stored("Local error estimate")
+            if self.yhatsol is not None:
+                self._errsol = self.ysol - self.yhatsol
+            else:
+                self._errsol = self.recompute_errors()
+        return self._errsol
+
+    def recompute_errors(self):
+        err = np.zeros(self.ysol.shape)
+        for i in range(len(self.tsol) - 1):
+            h = self.tsol[i + 1] - self.tsol[i]
+            yt = Approximation(
+                self.f, self.tsol[i], self.ysol[i, :], self.params, h, self.method
+            )
+            yhat = yt.y_estimate(yt.bhat)
+            t1, y = yt.y_approx(yt.bt)
+            err[i + 1, :] = y - yhat
+        return err
+
+    @property
+    def dysol(self):
+        if self._dysol is None:
+            self.check_stored("Dense output")
+            self._dysol = np.array(
+                [self.f(t, y, self.params) for t, y in zip(self.tsol, self.ysol)]
+            )
+        return self._dysol
+
+    def __call__(self, t):
+        return self.resample(t, "cubic")
+
+    def resample(self, t, kind="Cubic"):
+        # Stored trajectory at the times t: 'Linear', 'Quadratic' or 'Cubic'
+        # (Hermite with the derivatives f(t, y), as for calling the object)
+        kind = kind.lower()
+        self.check_stored("Resampling")
+
+        if kind == "linear":
+            return Resample(self.tsol, self.ysol).linear(t)
+        elif kind == "quadratic":
+            return Resample(self.tsol, self.ysol).quadratic(t)
+        elif kind == "cubic":
+            return Resample(self.tsol, self.ysol, self.dysol).cubic(t)
+        else:
+            raise RuntimeError(
+                "Interpolation is unknown. Available kinds are: 'Linear', 'Quadratic', and 'Cubic'."
+            )
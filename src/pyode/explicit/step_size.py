@@ -1,4 +1,5 @@
 import numpy as np
+from estimation import Variables, Approximation
 
 
 class StepSize:
@@ -126,3 +127,167 @@ class StepSize:
 
         hh = max(hh, hmin)
         return hh, hmax
+
+
+class ErrorControl:
+    """
+    Error norm and step size update used by the adaptive drivers
+
+    Follows RKExplicit: the difference between the two embedded solutions is
+    scaled by sc = abstol + reltol * max(||y0||, ||y1||) (Eq. 4.10), measured
+    with the root-mean-square norm (Eq. 4.11) and compared against reltol.
+
+    """
+
+    def __init__(self, abstol, reltol, p):
+        self.atol = abs(abstol)
+        self.rtol = abs(reltol)
+        self.p = p
+
+    def norm(self, x):
+        return np.sqrt(np.sum(x**2))
+
+    def error(self, y0, y1, ydiff):
+        sc = self.atol + self.rtol * max(self.norm(y0), self.norm(y1))
+        return self.norm(ydiff) / (sc * np.sqrt(len(ydiff)))
+
+    def reject(self, hh, hmin, err):
+        opt = (1.0 / err) ** (1 / (self.p + 1))
+        return max(hmin, hh * min(0.5, max(0.1, 0.8 * opt)))
+
+    def accept(self, hh, err):
+        temp = 1.25 * (err / self.rtol) ** (1 / (self.p + 1))
+        if temp > 0.2:
+            return hh / temp
+        return 5.0 * hh
+
+
+class StepHistory:
+    """
+    Step sizes predicted from the local errors of an earlier solution
+
+    For a nearby problem (e.g. the next point of a parameter sweep), the
+    error constants of the earlier solve, C_i = err_i / h_i^(p + 1) on its
+    accepted steps, describe the new trajectory as well. They depend on the
+    solution rather than on the steps that happened to be taken, so they
+    can be reused along a whole sweep without drifting. A step proposed at
+    t is capped by the largest step the constants allow over the interval
+    it would cover,
+
+        h <= (rtol / max C_i)^(1 / (p + 1)),
+
+    which stops the step from growing into regions where the earlier solve
+    had to shrink it, before a rejection there.
+
+    """
+
+    def __init__(self, tsol, ysol, errsol, atol, rtol, p):
+        tsol = np.asarray(tsol, dtype=float)
+        self.tdir = np.sign(tsol[-1] - tsol[0])
+        self.rtol = rtol
+        self.p = p
+
+        # The last step is clipped to the end of the interval, so it is left out
+        ts = self.tdir * tsol
+        h = np.diff(ts)[:-1]
+        ynorm = np.sqrt(np.sum(ysol**2, axis=1))
+        sc = atol + rtol * np.maximum(ynorm[:-1], ynorm[1:])[:-1]
+        err = np.sqrt(np.mean(errsol[1:-1] ** 2, axis=1)) / sc
+        self.tgrid = ts[:-1]
+        self.h0 = h[0]
+        self.C = err / h ** (p + 1)
+
+    def first(self):
+        return min(self.h0, self.predict(self.tgrid[0] * self.tdir, self.h0))
+
+    def predict(self, t, hh):
+        # Intervals of the earlier grid overlapped by [t, t + hh]
+        s = self.tdir * t
+        i0 = max(np.searchsorted(self.tgrid, s, side="right") - 1, 0)
+        i1 = np.searchsorted(self.tgrid, s + hh, side="left")
+        if i0 >= len(self.C):
+            return hh
+        C = np.max(self.C[i0 : max(i1, i0 + 1)])
+        if C <= 0.0:
+            return hh
+        return min(hh, (self.rtol / C) ** (1 / (self.p + 1)))
+
+
+###------------------------------###
+
+
+class Propagator(Variables):
+    """
+    Adaptive explicit Runge-Kutta solve over one time slice
+
+    Same error control as RKExplicit, but the last step ends exactly on the
+    end of the slice. The coarse propagator lifts the usual bound of a tenth
+    of the interval on the step size (unbounded=True).
+
+    """
+
+    def __init__(self, f, params, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.f = f
+        self.params = params
+        self.nfev = 0
+
+    def solve(self, t_range, yinit, abstol, reltol, unbounded=False):
+        ctrl = ErrorControl(abstol, reltol, self.p)
+        rtol = ctrl.rtol
+        threshold = ctrl.atol / rtol
+
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+
+        ss = StepSize(self.f, t, yinit, self.params, self.method, 2)
+        hh, hmax = ss.init_step_v3(t_range, threshold, rtol, self.p)
+        if unbounded:
+            hmax = abs(tend - t)
+
+        ya = yinit.copy()
+        tsol = [t]
+        ysol = [ya]
+
+        while tdir * (tend - t) > 0:
+            hmin = 16 * np.spacing(t)
+            hh = min(hmax, max(hmin, hh))
+            if 1.1 * hh >= abs(tend - t):
+                hh = abs(tend - t)
+
+            noFailed = True
+
+            while True:
+                h = tdir * hh
+                yt = Approximation(self.f, t, ya, self.params, h, self.method)
+                self.nfev += self.stages
+                yhat = yt.y_estimate(self.bhat)
+                t1, y = yt.y_approx(self.bt)
+                err = ctrl.error(ya, y, y - yhat)
+
+                if err > rtol:
+                    if hh < hmin:
+                        raise ValueError("Integration tolerance not met!")
+                    noFailed = False
+                    hh = ctrl.reject(hh, hmin, err)
+                    continue
+
+                break
+
+            if noFailed:
+                hh = ctrl.accept(hh, err)
+
+            t = tend if abs(tend - t1) <= hmin else t1
+            ya = y
+            tsol.append(t)
+            ysol.append(ya)
+
+        return np.array(tsol), np.array(ysol)
+
+
+def propagate(f, params, method, t_range, yinit, abstol, reltol, unbounded=False):
+    # Module level, so that it can be sent to a worker process
+    prop = Propagator(f, params, method)
+    tsol, ysol = prop.solve(t_range, yinit, abstol, reltol, unbounded)
+    return tsol, ysol, prop.nfev
@@ -0,0 +1,124 @@
+import inspect
+import numpy as np
+
+
+class Layout:
+    """
+    Placement of a structured state in one contiguous vector
+
+    A state given as nested dicts, tuples and lists of arrays (a pytree)
+    is laid out leaf after leaf in a flat vector, which is what the solvers
+    integrate. unflatten(y) rebuilds the structure as reshaped views into
+    y, without copying, also for stacked states of shape (N, n) such as
+    ysol, where every leaf gets a leading axis of length N.
+
+    rhs(func) turns a right-hand side on structured states into one on flat
+    vectors. func receives views into the flat stage vector and either
+    returns its derivative as a structure of the same layout, or, when it
+    takes a fourth argument, func(t, y, params, dy), writes it in place
+    into dy, which then views the stage row of the solver (no copy at all).
+
+    """
+
+    def __init__(self, template, dtype=float):
+        self.dtype = np.dtype(dtype)
+        self.leaves = []  # (offset, shape) in the order of flatten
+        self.size = 0
+        self.tree = self.record(template)
+
+    def record(self, node):
+        # Structure with the leaves replaced by their index in self.leaves
+        if isinstance(node, dict):
+            return {key: self.record(node[key]) for key in node}
+        if isinstance(node, (tuple, list)) and not self.is_leaf(node):
+            return type(node)(self.record(v) for v in node)
+        shape = np.shape(node)
+        self.leaves.append((self.size, shape))
+        self.size += int(np.prod(shape, dtype=int))
+        return len(self.leaves) - 1
+
+    def is_leaf(self, node):
+        # Lists and tuples of numbers are arrays, not containers
+        return all(np.isscalar(v) for v in node)
+
+    def build(self, node, leaf):
+        if isinstance(node, dict):
+            return {key: self.build(node[key], leaf) for key in node}
+        if isinstance(node, (tuple, list)):
+            return type(node)(self.build(v, leaf) for v in node)
+        return leaf(node)
+
+    def walk(self, node, value, visit):
+        # Visits the leaves of value in the order of the layout
+        if isinstance(node, dict):
+            for key in node:
+                self.walk(node[key], value[key], visit)
+        elif isinstance(node, (tuple, list)):
+            for n, v in zip(node, value):
+                self.walk(n, v, visit)
+        else:
+            visit(node, value)
+
+    def flatten(self, value, out=None):
+        if out is None:
+            out = np.empty(self.size, dtype=self.dtype)
+
+        def visit(i, leaf):
+            offset, shape = self.leaves[i]
+            if np.shape(leaf) != shape:
+                raise ValueError(
+                    f"State leaf has shape {np.shape(leaf)}, the layout expects {shape}"
+                )
+            out[offset : offset + leaf_size(shape)] = np.ravel(leaf)
+
+        self.walk(self.tree, value, visit)
+        return out
+
+    def unflatten(self, y):
+        lead = y.shape[:-1]
+
+        def leaf(i):
+            offset, shape = self.leaves[i]
+            return y[..., offset : offset + leaf_size(shape)].reshape(lead + shape)
+
+        return self.build(self.tree, leaf)
+
+    def rhs(self, func):
+        inplace = len(positional(func)) >= 4
+
+        def f(t, y, params, out=None):
+            if out is None:
+                out = np.empty(self.size, dtype=y.dtype)
+            if inplace:
+                func(t, self.unflatten(y), params, self.unflatten(out))
+            else:
+                self.flatten(func(t, self.unflatten(y), params), out)
+            return out
+
+        # The stages can be handed to f for writing in place
+        f.inplace = True
+        f.layout = self
+        return f
+
+
+def leaf_size(shape):
+    return int(np.prod(shape, dtype=int))
+
+
+def positional(func):
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return []
+    return [
+        p
+        for p in params
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    ]
+
+
+def is_structured(value):
+    # dicts and tuples hold structured states; lists are flat states
+    return isinstance(value, dict) or (
+        isinstance(value, tuple) and not all(np.isscalar(v) for v in value)
+    )
@@ -0,0 +1,302 @@
+import numpy as np
+
+
+class StormerVerlet:
+    """
+    Symmetric composition weights of the Stormer-Verlet method
+
+    Book: Geometric Numerical Integration (2006)
+    Author(s): E. Hairer, C. Lubich, G. Wanner
+    Chapter: I.3 The Stormer-Verlet Scheme
+
+    """
+
+    def __init__(self):
+        self.gamma = np.zeros((1,), dtype=float)
+        self.order = 2
+
+    def coeff_gamma(self):
+        self.gamma[0] = 1.0
+        return self.gamma
+
+
+class Yoshida4:
+    """
+    Symmetric composition weights of Stormer-Verlet steps
+
+    Coefficients in this composition were developed by Yoshida in:
+
+    Title: Construction of higher order symplectic integrators
+    Author(s): H. Yoshida
+    Physics Letters A, Vol 150, No 5-7, 1990
+
+    Triple jump, order 4.
+
+    """
+
+    def __init__(self):
+        self.gamma = np.zeros((3,), dtype=float)
+        self.order = 4
+
+    def coeff_gamma(self):
+        x1 = 1 / (2 - 2 ** (1 / 3))
+        self.gamma[0] = x1
+        self.gamma[1] = 1 - 2 * x1
+        self.gamma[2] = x1
+        return self.gamma
+
+
+class Yoshida6:
+    """
+    Symmetric composition weights of Stormer-Verlet steps
+
+    Coefficients in this composition were developed by Yoshida in:
+
+    Title: Construction of higher order symplectic integrators
+    Author(s): H. Yoshida
+    Physics Letters A, Vol 150, No 5-7, 1990
+
+    Solution A, order 6 with 7 Verlet steps.
+
+    """
+
+    def __init__(self):
+        self.gamma = np.zeros((7,), dtype=float)
+        self.order = 6
+
+    def coeff_gamma(self):
+        w = [
+            -1.17767998417887,
+            0.235573213359357,
+            0.784513610477560,
+        ]
+        w0 = 1 - 2 * sum(w)
+        self.gamma[:] = w[::-1] + [w0] + w
+        return self.gamma
+
+
+class Yoshida8:
+    """
+    Symmetric composition weights of Stormer-Verlet steps
+
+    Coefficients in this composition were developed by Yoshida in:
+
+    Title: Construction of higher order symplectic integrators
+    Author(s): H. Yoshida
+    Physics Letters A, Vol 150, No 5-7, 1990
+
+    Solution D, order 8 with 15 Verlet steps.
+
+    """
+
+    def __init__(self):
+        self.gamma = np.zeros((15,), dtype=float)
+        self.order = 8
+
+    def coeff_gamma(self):
+        w = [
+            0.102799849391985,
+            -1.96061023297549,
+            1.93813913762276,
+            -0.158240635368243,
+            -1.44485223686048,
+            0.253693336566229,
+            0.914844246229740,
+        ]
+        w0 = 1 - 2 * sum(w)
+        self.gamma[:] = w[::-1] + [w0] + w
+        return self.gamma
+
+
+class ForestRuth:
+    """
+    Drift and kick coefficients of a fourth order splitting
+
+    Coefficients in this scheme were developed by Forest and Ruth in:
+
+    Title: Fourth-order symplectic integration
+    Author(s): E. Forest and R.D. Ruth
+    Physica D, Vol 43, No 1, 1990
+
+    Order 4 with 3 force evaluations; the same map as the Yoshida triple
+    jump, written as drifts (c) and kicks (d).
+
+    """
+
+    def __init__(self):
+        self.c = np.zeros((4,), dtype=float)
+        self.d = np.zeros((3,), dtype=float)
+        self.order = 4
+
+    def coeff_c(self):
+        theta = 1 / (2 - 2 ** (1 / 3))
+        self.c[0] = theta / 2
+        self.c[1] = (1 - theta) / 2
+        self.c[2] = (1 - theta) / 2
+        self.c[3] = theta / 2
+        return self.c
+
+    def coeff_d(self):
+        theta = 1 / (2 - 2 ** (1 / 3))
+        self.d[0] = theta
+        self.d[1] = 1 - 2 * theta
+        self.d[2] = theta
+        return self.d
+
+
+###------------------------------###
+
+
+class Symplectic:
+    """
+    Splitting integrators for separable Hamiltonians H = T(p) + V(q)
+
+    A step of size h is a sequence of drifts q += c_i h dT/dp(p) and kicks
+    p -= d_i h dV/dq(t, q), one force evaluation per kick. Compositions of
+    Stormer-Verlet steps with weights gamma are written in the same form,
+    adjacent half drifts being merged. All schemes are symmetric, so the
+    energy error stays bounded over long times for a fixed step.
+
+    The adaptive mode keeps this property with a time-reversible step size
+    control: with a step size function s(q, p) and rho ~ 1 / s,
+
+        rho_{n+1/2} = rho_n + eps / 2 * G(q_n, p_n)
+        (q_{n+1}, p_{n+1}) = step of size eps / rho_{n+1/2}
+        rho_{n+1} = rho_{n+1/2} + eps / 2 * G(q_{n+1}, p_{n+1})
+
+    where G = -(d/dt) log s along the flow, so the time step is h * s. The
+    default s = ||dV/dq||^(-1/2) shrinks the steps where the forces are
+    large (close encounters).
+
+    Book: Geometric Numerical Integration (2006)
+    Author(s): E. Hairer, C. Lubich, G. Wanner
+    Chapter: VIII.3 Time Transformations and Adaptive Verlet
+
+    """
+
+    def __init__(self, dvdq, dtdp, params, method):
+        self.dvdq = dvdq
+        self.dtdp = dtdp
+        self.params = params
+        self.method = method
+
+        if method == "verlet":
+            tab = StormerVerlet()
+        elif method == "default" or method == "yoshida4":
+            tab = Yoshida4()
+        elif method == "yoshida6":
+            tab = Yoshida6()
+        elif method == "yoshida8":
+            tab = Yoshida8()
+        elif method == "forest-ruth":
+            tab = ForestRuth()
+        else:
+            raise RuntimeError(
+                "Method is unknown. Available symplectic methods are: 'Verlet', 'Yoshida4', 'Yoshida6', 'Yoshida8', 'Forest-Ruth', and 'Default'."
+            )
+        self.p = tab.order
+
+        if hasattr(tab, "coeff_gamma"):
+            gamma = tab.coeff_gamma()
+            self.c = np.append(gamma / 2, 0.0) + np.append(0.0, gamma / 2)
+            self.d = gamma
+        else:
+            self.c = tab.coeff_c()
+            self.d = tab.coeff_d()
+
+        self.nfev = 0
+
+    def velocity(self, p):
+        if self.dtdp is None:
+            return p
+        return self.dtdp(p, self.params)
+
+    def force(self, t, q):
+        self.nfev += 1
+        return self.dvdq(t, q, self.params)
+
+    def step(self, t, q, p, h):
+        q = q.copy()
+        p = p.copy()
+        for i in range(len(self.d)):
+            q += self.c[i] * h * self.velocity(p)
+            t += self.c[i] * h
+            p -= self.d[i] * h * self.force(t, q)
+        q += self.c[-1] * h * self.velocity(p)
+        return q, p
+
+    def stepfun(self, t, q, p):
+        return np.sqrt(np.sum(self.force(t, q) ** 2)) ** (-1 / 2)
+
+    def control(self, stepfun, t, q, p):
+        # G = -(d/dt) log s, by a difference along the flow
+        dq = self.velocity(p)
+        dp = -self.force(t, q)
+        eps = np.sqrt(np.finfo(float).eps) * (
+            1 + np.sqrt(np.sum(q**2) + np.sum(p**2))
+        ) / max(np.sqrt(np.sum(dq**2) + np.sum(dp**2)), np.finfo(float).tiny)
+        s0 = stepfun(t, q, p)
+        s1 = stepfun(t + eps, q + eps * dq, p + eps * dp)
+        return -(np.log(s1) - np.log(s0)) / eps
+
+    def solve(self, t_range, qinit, pinit, h, adaptive=False, stepfun=None, store="y"):
+        t = t_range[0]
+        tend = t_range[-1]
+        tdir = np.sign(tend - t)
+        hh = abs(h)
+
+        if stepfun is None:
+            stepfun = lambda t, q, p: self.stepfun(t, q, p)
+
+        q = qinit.copy()
+        p = pinit.copy()
+        tsol = [t]
+        qsol = [q]
+        psol = [p]
+
+        if adaptive:
+            # rho = 1 / s; the time step is h / rho, i.e. h where s = 1.
+            # G changes sign with the direction of integration
+            rho = 1 / stepfun(t, q, p)
+            G = tdir * self.control(stepfun, t, q, p)
+
+        nsteps = 1
+
+        while tdir * (tend - t) > 0:
+            if adaptive:
+                rho = rho + hh / 2 * G
+                dt = hh / rho
+            else:
+                dt = hh
+
+            hmin = 16 * np.spacing(t)
+            last = 1.1 * dt >= abs(tend - t) if not adaptive else dt >= abs(tend - t)
+            if last:
+                dt = abs(tend - t)
+
+            q, p = self.step(t, q, p, tdir * dt)
+            t1 = t + tdir * dt
+            t = tend if abs(tend - t1) <= hmin or last else t1
+
+            if adaptive:
+                G = tdir * self.control(stepfun, t, q, p)
+                rho = rho + hh / 2 * G
+
+            if store != "none":
+                tsol.append(t)
+                qsol.append(q)
+                psol.append(p)
+            nsteps += 1
+
+        if store == "none":
+            tsol, qsol, psol = [t], [q], [p]
+
+        return (
+            np.array(tsol),
+            np.array(qsol),
+            np.array(psol),
+            {
+                "total steps": nsteps,
+                "function evaluations": self.nfev,
+            },
+        )
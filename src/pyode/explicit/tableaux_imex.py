@@ -0,0 +1,207 @@
+import numpy as np
+
+
+class KennedyCarpenter43:
+    """
+    Additive (IMEX) Runge-Kutta, explicit ERK paired with an ESDIRK
+
+    Coefficients in this tableau were developed by Kennedy and Carpenter in:
+
+    Title: Additive Runge-Kutta schemes for convection-diffusion-reaction equations
+    Author(s): C.A. Kennedy and M.H. Carpenter
+    Applied Numerical Mathematics, Vol 44, No 1-2, 2003
+
+    ARK4(3)6L[2]SA, where p = 4 and q = 3. The implicit part is stiffly
+    accurate and L-stable, with gamma = 1/4 on the diagonal.
+
+    """
+
+    def __init__(self):
+        self.a = np.zeros((6, 6), dtype=float)
+        self.ai = np.zeros((6, 6), dtype=float)
+        self.c = np.zeros((6,), dtype=float)
+        self.bt = np.zeros((6,), dtype=float)
+        self.bhat = np.zeros((6,), dtype=float)
+        self.gamma = 0.25
+        self.order = 3
+
+    # -- explicit stages --#
+    def coeff_matA(self):
+        self.a[1, 0] = 0.5
+        self.a[2, 0] = 13861 / 62500
+        self.a[2, 1] = 6889 / 62500
+        self.a[3, 0] = -116923316275 / 2393684061468
+        self.a[3, 1] = -2731218467317 / 15368042101831
+        self.a[3, 2] = 9408046702089 / 11113171139209
+        self.a[4, 0] = -451086348788 / 2902428689909
+        self.a[4, 1] = -2682348792572 / 7519795681897
+        self.a[4, 2] = 12662868775082 / 11960479115383
+        self.a[4, 3] = 3355817975965 / 11060851509271
+        self.a[5, 0] = 647845179188 / 3216320057751
+        self.a[5, 1] = 73281519250 / 8382639484533
+        self.a[5, 2] = 552539513391 / 3454668386233
+        self.a[5, 3] = 3354512671639 / 8306763924573
+        self.a[5, 4] = 4040 / 17871
+        return self.a
+
+    # -- implicit stages, gamma on the diagonal from stage 2 --#
+    def coeff_matAi(self):
+        self.ai[1, 0] = 0.25
+        self.ai[2, 0] = 8611 / 62500
+        self.ai[2, 1] = -1743 / 31250
+        self.ai[3, 0] = 5012029 / 34652500
+        self.ai[3, 1] = -654441 / 2922500
+        self.ai[3, 2] = 174375 / 388108
+        self.ai[4, 0] = 15267082809 / 155376265600
+        self.ai[4, 1] = -71443401 / 120774400
+        self.ai[4, 2] = 730878875 / 902184768
+        self.ai[4, 3] = 2285395 / 8070912
+        self.ai[5, 0] = 82889 / 524892
+        self.ai[5, 2] = 15625 / 83664
+        self.ai[5, 3] = 69875 / 102672
+        self.ai[5, 4] = -2260 / 8211
+        for i in range(1, 6):
+            self.ai[i, i] = self.gamma
+        return self.ai
+
+    def coeff_c(self):
+        self.c[1] = 0.5
+        self.c[2] = 83 / 250
+        self.c[3] = 31 / 50
+        self.c[4] = 17 / 20
+        self.c[5] = 1.0
+        return self.c
+
+    # -- 4th order weights, shared by both parts --#
+    def coeff_bt(self):
+        self.bt[0] = 82889 / 524892
+        self.bt[1] = 0.0
+        self.bt[2] = 15625 / 83664
+        self.bt[3] = 69875 / 102672
+        self.bt[4] = -2260 / 8211
+        self.bt[5] = 0.25
+        return self.bt
+
+    # -- 3rd order weights --#
+    def coeff_bhat(self):
+        self.bhat[0] = 4586570599 / 29645900160
+        self.bhat[1] = 0.0
+        self.bhat[2] = 178811875 / 945068544
+        self.bhat[3] = 814220225 / 1159782912
+        self.bhat[4] = -3700637 / 11593932
+        self.bhat[5] = 61727 / 225920
+        return self.bhat
+
+
+class KennedyCarpenter54:
+    """
+    Additive (IMEX) Runge-Kutta, explicit ERK paired with an ESDIRK
+
+    Coefficients in this tableau were developed by Kennedy and Carpenter in:
+
+    Title: Additive Runge-Kutta schemes for convection-diffusion-reaction equations
+    Author(s): C.A. Kennedy and M.H. Carpenter
+    Applied Numerical Mathematics, Vol 44, No 1-2, 2003
+
+    ARK5(4)8L[2]SA, where p = 5 and q = 4. The implicit part is stiffly
+    accurate and L-stable, with gamma = 41/200 on the diagonal.
+
+    """
+
+    def __init__(self):
+        self.a = np.zeros((8, 8), dtype=float)
+        self.ai = np.zeros((8, 8), dtype=float)
+        self.c = np.zeros((8,), dtype=float)
+        self.bt = np.zeros((8,), dtype=float)
+        self.bhat = np.zeros((8,), dtype=float)
+        self.gamma = 41 / 200
+        self.order = 4
+
+    # -- explicit stages --#
+    def coeff_matA(self):
+        self.a[1, 0] = 41 / 100
+        self.a[2, 0] = 367902744464 / 2072280473677
+        self.a[2, 1] = 677623207551 / 8224143866563
+        self.a[3, 0] = 1268023523408 / 10340822734521
+        self.a[3, 2] = 1029933939417 / 13636558850479
+        self.a[4, 0] = 14463281900351 / 6315353703477
+        self.a[4, 2] = 66114435211212 / 5879490589093
+        self.a[4, 3] = -54053170152839 / 4284798021562
+        self.a[5, 0] = 14090043504691 / 34967701212078
+        self.a[5, 2] = 15191511035443 / 11219624916014
+        self.a[5, 3] = -18461159152457 / 12425892160975
+        self.a[5, 4] = -281667163811 / 9011619295870
+        self.a[6, 0] = 19230459214898 / 13134317526959
+        self.a[6, 2] = 21275331358303 / 2942455364971
+        self.a[6, 3] = -38145345988419 / 4862620318723
+        self.a[6, 4] = -1 / 8
+        self.a[6, 5] = -1 / 8
+        self.a[7, 0] = -19977161125411 / 11928030595625
+        self.a[7, 2] = -40795976796054 / 6384907823539
+        self.a[7, 3] = 177454434618887 / 12078138498510
+        self.a[7, 4] = 782672205425 / 8267701900261
+        self.a[7, 5] = -69563011059811 / 9646580694205
+        self.a[7, 6] = 7356628210526 / 4942186776405
+        return self.a
+
+    # -- implicit stages, gamma on the diagonal from stage 2 --#
+    def coeff_matAi(self):
+        self.ai[1, 0] = 41 / 200
+        self.ai[2, 0] = 41 / 400
+        self.ai[2, 1] = -567603406766 / 11931857230679
+        self.ai[3, 0] = 683785636431 / 9252920307686
+        self.ai[3, 2] = -110385047103 / 1367015193373
+        self.ai[4, 0] = 3016520224154 / 10081342136671
+        self.ai[4, 2] = 30586259806659 / 12414158314087
+        self.ai[4, 3] = -22760509404356 / 11113319521817
+        self.ai[5, 0] = 218866479029 / 1489978393911
+        self.ai[5, 2] = 638256894668 / 5436446318841
+        self.ai[5, 3] = -1179710474555 / 5321154724896
+        self.ai[5, 4] = -60928119172 / 8023461067671
+        self.ai[6, 0] = 1020004230633 / 5715676835656
+        self.ai[6, 2] = 25762820946817 / 25263940353407
+        self.ai[6, 3] = -2161375909145 / 9755907335909
+        self.ai[6, 4] = -211217309593 / 5846859502534
+        self.ai[6, 5] = -4269925059573 / 7827059040719
+        self.ai[7, 0] = -872700587467 / 9133579230613
+        self.ai[7, 3] = 22348218063261 / 9555858737531
+        self.ai[7, 4] = -1143369518992 / 8141816002931
+        self.ai[7, 5] = -39379526789629 / 19018526304540
+        self.ai[7, 6] = 32727382324388 / 42900044865799
+        for i in range(1, 8):
+            self.ai[i, i] = self.gamma
+        return self.ai
+
+    def coeff_c(self):
+        self.c[1] = 41 / 100
+        self.c[2] = 2935347310677 / 11292855782101
+        self.c[3] = 1426016391358 / 7196633302097
+        self.c[4] = 92 / 100
+        self.c[5] = 24 / 100
+        self.c[6] = 3 / 5
+        self.c[7] = 1.0
+        return self.c
+
+    # -- 5th order weights, shared by both parts --#
+    def coeff_bt(self):
+        self.bt[0] = -872700587467 / 9133579230613
+        self.bt[1] = 0.0
+        self.bt[2] = 0.0
+        self.bt[3] = 22348218063261 / 9555858737531
+        self.bt[4] = -1143369518992 / 8141816002931
+        self.bt[5] = -39379526789629 / 19018526304540
+        self.bt[6] = 32727382324388 / 42900044865799
+        self.bt[7] = 41 / 200
+        return self.bt
+
+    # -- 4th order weights --#
+    def coeff_bhat(self):
+        self.bhat[0] = -975461918565 / 9796059967033
+        self.bhat[1] = 0.0
+        self.bhat[2] = 0.0
+        self.bhat[3] = 78070527104295 / 32432590147079
+        self.bhat[4] = -548382580838 / 3424219808633
+        self.bhat[5] = -33438840321285 / 15594753105479
+        self.bhat[6] = 3629800801594 / 4656183773603
+        self.bhat[7] = 4035322873751 / 18575991585200
+        return self.bhat
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class SanduERK33:
+    """
+    Explicit multirate infinitesimal GARK method (MRI-GARK)
+
+    Coefficients of MRI-GARK-ERK33a were developed by Sandu in:
+
+    Title: A Class of Multirate Infinitesimal GARK Methods
+    Author(s): A. Sandu
+    SIAM Journal on Numerical Analysis, Vol 57, No 5, 2019
+
+    Stage i + 1 solves the fast problem from stage i over (c[i+1] - c[i]) H,
+    forced by the slow right-hand sides of the stages 0..i with the weights
+    gamma0[i, :] + gamma1[i, :] * theta / H. The method is third order when
+    the fast problems are solved exactly.
+
+    The embedded second order solution replaces the forcing of the last
+    stage by gammahat (constant in time). It satisfies the conditions
+    sum_j b_j = 1 and sum_j b_j c_j = 1/2 of the slow weights accumulated
+    over the stages.
+
+    """
+
+    def __init__(self):
+        self.c = np.zeros((4,), dtype=float)
+        self.gamma0 = np.zeros((3, 3), dtype=float)
+        self.gamma1 = np.zeros((3, 3), dtype=float)
+        self.gammahat = np.zeros((3,), dtype=float)
+        self.order = 2
+
+    def coeff_c(self):
+        self.c[1] = 1 / 3
+        self.c[2] = 2 / 3
+        self.c[3] = 1.0
+        return self.c
+
+    def coeff_gamma0(self):
+        self.gamma0[0, 0] = 1 / 3
+        self.gamma0[1, 0] = -1 / 3
+        self.gamma0[1, 1] = 2 / 3
+        self.gamma0[2, 1] = -2 / 3
+        self.gamma0[2, 2] = 1.0
+        return self.gamma0
+
+    def coeff_gamma1(self):
+        self.gamma1[2, 0] = 1 / 2
+        self.gamma1[2, 2] = -1 / 2
+        return self.gamma1
+
+    # -- 2nd order forcing of the last stage, error estimate --#
+    def coeff_gammahat(self):
+        self.gammahat[1] = -1 / 6
+        self.gammahat[2] = 1 / 2
+        return self.gammahat
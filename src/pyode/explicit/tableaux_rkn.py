@@ -0,0 +1,165 @@
+import numpy as np
+
+
+class DormandElMikkawyPrince43:
+    """
+    Embedded Runge-Kutta-Nystrom for y'' = f(t, y)
+
+    Coefficients in this tableau were developed by Dormand, El-Mikkawy and
+    Prince in:
+
+    Title: Families of Runge-Kutta-Nystrom Formulae
+    Author(s): J.R. Dormand, M.E.A. El-Mikkawy and P.J. Prince
+    IMA Journal of Numerical Analysis, Vol 7, No 2, 1987
+
+    RKN4(3)4FM, where p = 4 and q = 3. The last stage is evaluated at the new
+    solution (FSAL), so a step costs three evaluations of f.
+
+    """
+
+    def __init__(self):
+        self.a = np.zeros((4, 4), dtype=float)
+        self.c = np.zeros((4,), dtype=float)
+        self.bt = np.zeros((4,), dtype=float)
+        self.bpt = np.zeros((4,), dtype=float)
+        self.bhat = np.zeros((4,), dtype=float)
+        self.bphat = np.zeros((4,), dtype=float)
+        self.order = 3
+
+    def coeff_matA(self):
+        self.a[1, 0] = 1 / 32
+        self.a[2, 0] = 7 / 1000
+        self.a[2, 1] = 119 / 500
+        self.a[3, 0] = 1 / 14
+        self.a[3, 1] = 8 / 27
+        self.a[3, 2] = 25 / 189
+        return self.a
+
+    def coeff_c(self):
+        self.c[1] = 1 / 4
+        self.c[2] = 7 / 10
+        self.c[3] = 1.0
+        return self.c
+
+    # -- 4th order weights, solution --#
+    def coeff_bt(self):
+        self.bt[0] = 1 / 14
+        self.bt[1] = 8 / 27
+        self.bt[2] = 25 / 189
+        self.bt[3] = 0.0
+        return self.bt
+
+    # -- 4th order weights, derivative --#
+    def coeff_bpt(self):
+        self.bpt[0] = 1 / 14
+        self.bpt[1] = 32 / 81
+        self.bpt[2] = 250 / 567
+        self.bpt[3] = 5 / 54
+        return self.bpt
+
+    # -- 3rd order weights, solution --#
+    def coeff_bhat(self):
+        self.bhat[0] = -7 / 150
+        self.bhat[1] = 67 / 150
+        self.bhat[2] = 3 / 20
+        self.bhat[3] = -1 / 20
+        return self.bhat
+
+    # -- 3rd order weights, derivative --#
+    def coeff_bphat(self):
+        self.bphat[0] = 13 / 21
+        self.bphat[1] = -20 / 27
+        self.bphat[2] = 275 / 189
+        self.bphat[3] = -1 / 3
+        return self.bphat
+
+
+class DormandElMikkawyPrince64:
+    """
+    Embedded Runge-Kutta-Nystrom for y'' = f(t, y)
+
+    Coefficients in this tableau were developed by Dormand, El-Mikkawy and
+    Prince in:
+
+    Title: High-Order Embedded Runge-Kutta-Nystrom Formulae
+    Author(s): J.R. Dormand, M.E.A. El-Mikkawy and P.J. Prince
+    IMA Journal of Numerical Analysis, Vol 7, No 4, 1987
+
+    RKN6(4)6FD, where p = 6 and q = 4. The last stage is evaluated at the new
+    solution (FSAL), so a step costs five evaluations of f. The 4th order
+    weights here solve the order conditions on stages 1-4 (solution) and
+    1-4, 6 (derivative).
+
+    """
+
+    def __init__(self):
+        self.a = np.zeros((6, 6), dtype=float)
+        self.c = np.zeros((6,), dtype=float)
+        self.bt = np.zeros((6,), dtype=float)
+        self.bpt = np.zeros((6,), dtype=float)
+        self.bhat = np.zeros((6,), dtype=float)
+        self.bphat = np.zeros((6,), dtype=float)
+        self.order = 4
+
+    def coeff_matA(self):
+        self.a[1, 0] = 1 / 200
+        self.a[2, 0] = -1 / 2200
+        self.a[2, 1] = 1 / 22
+        self.a[3, 0] = 637 / 6600
+        self.a[3, 1] = -7 / 110
+        self.a[3, 2] = 7 / 33
+        self.a[4, 0] = 225437 / 1968750
+        self.a[4, 1] = -30073 / 281250
+        self.a[4, 2] = 65569 / 281250
+        self.a[4, 3] = -9367 / 984375
+        self.a[5, 0] = 151 / 2142
+        self.a[5, 1] = 5 / 116
+        self.a[5, 2] = 385 / 1368
+        self.a[5, 3] = 55 / 168
+        self.a[5, 4] = -6250 / 28101
+        return self.a
+
+    def coeff_c(self):
+        self.c[1] = 1 / 10
+        self.c[2] = 3 / 10
+        self.c[3] = 7 / 10
+        self.c[4] = 17 / 25
+        self.c[5] = 1.0
+        return self.c
+
+    # -- 6th order weights, solution --#
+    def coeff_bt(self):
+        self.bt[0] = 151 / 2142
+        self.bt[1] = 5 / 116
+        self.bt[2] = 385 / 1368
+        self.bt[3] = 55 / 168
+        self.bt[4] = -6250 / 28101
+        self.bt[5] = 0.0
+        return self.bt
+
+    # -- 6th order weights, derivative --#
+    def coeff_bpt(self):
+        self.bpt[0] = 151 / 2142
+        self.bpt[1] = 25 / 522
+        self.bpt[2] = 275 / 684
+        self.bpt[3] = 275 / 252
+        self.bpt[4] = -78125 / 112404
+        self.bpt[5] = 1 / 12
+        return self.bpt
+
+    # -- 4th order weights, solution --#
+    def coeff_bhat(self):
+        self.bhat[0] = 1 / 42
+        self.bhat[1] = 5 / 36
+        self.bhat[2] = 5 / 24
+        self.bhat[3] = 65 / 504
+        return self.bhat
+
+    # -- 4th order weights, derivative --#
+    def coeff_bphat(self):
+        self.bphat[0] = -19 / 252
+        self.bphat[1] = 25 / 72
+        self.bphat[2] = 25 / 144
+        self.bphat[3] = 475 / 1008
+        self.bphat[5] = 1 / 12
+        return self.bphat
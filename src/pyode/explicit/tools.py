@@ -1,5 +1,5 @@
 import numpy as np
-from interpolation import SecondOrder
+from interpolation import Resample
 
 
 class Interpolate:
@@ -10,20 +10,12 @@ class Interpolate:
         self.tend = tend
 
     def calculate(self):
-        xx = np.array([self.t[-3], self.t[-2], self.t[-1]])
-        yy = np.array([self.y[-3, :], self.y[-2, :], self.y[-1, :]])
-        yyhat = np.array([self.yhat[-3, :], self.yhat[-2, :], self.yhat[-1, :]])
-        n = self.y.shape[1]
+        # Quadratic through the last three points, all components at once
+        xx = self.t[-3:]
         xp = np.array([self.tend])
 
-        res = np.zeros((n,))
-        reshat = np.zeros((n,))
-
-        for i in range(n):
-            q = SecondOrder(xx, yy[:, i], xp)
-            qhat = SecondOrder(xx, yyhat[:, i], xp)
-            res[i] = q.quadratic()
-            reshat[i] = qhat.quadratic()
+        res = Resample(xx, self.y[-3:, :]).quadratic(xp)[0]
+        reshat = Resample(xx, self.yhat[-3:, :]).quadratic(xp)[0]
 
         return xp, res, reshat
 
@@ -1,11 +1,75 @@
+import os
+import multiprocessing
 import numpy
 import numpy as np
 
 np.seterr(divide="ignore", invalid="ignore")
-from explicit.step_size import StepSize
+from explicit.step_size import StepSize, StepHistory, ErrorControl
 from explicit.initialization import ArrayInitialization
 from explicit.estimation import Variables, Approximation
 from explicit.tools import Interpolate
+from explicit.global_error import GlobalError
+from explicit.sensitivity import Jacobian, Sensitivity
+from explicit.adjoint import Checkpoints
+from explicit.fixed_step import FixedStep
+from explicit.multirate import Multirate
+from explicit.low_storage import LowStorage
+from explicit.solution import Solution
+from explicit.structured import Layout, is_structured
+from explicit.cache import ResultCache
+from explicit.autotune import Autotune
+from explicit.observables import (
+    Observables,
+    Observer,
+    Integral,
+    TimeAverage,
+    Minimum,
+    Maximum,
+    Reduction,
+)
+from explicit.nystrom import Nystrom
+from explicit.symplectic import Symplectic
+from explicit.delay import Delay
+from explicit.parareal import Parareal
+from explicit.extrapolation import Extrapolation
+from explicit.chebyshev import Chebyshev
+from explicit.exponential import Exponential
+from explicit.imex import IMEX
+from explicit.ensemble import Ensemble
+from explicit.service import SolveService
+from explicit.distributed import Coordinator, work
+
+# Public interface: the solver drivers, and the classes that are passed to
+# them (ResultCache, the observables) or used next to them (SolveService,
+# work for remote sweep workers)
+__all__ = [
+    "RKExplicit",
+    "RKTarget",
+    "RKSensitivity",
+    "RKAdjoint",
+    "RKMultirate",
+    "RKLowStorage",
+    "RKNystrom",
+    "RKSymplectic",
+    "RKDelay",
+    "RKParareal",
+    "RKExtrapolation",
+    "RKChebyshev",
+    "RKExponential",
+    "RKIMEX",
+    "RKEnsemble",
+    "RKSweep",
+    "Solution",
+    "ResultCache",
+    "Observer",
+    "Integral",
+    "TimeAverage",
+    "Minimum",
+    "Maximum",
+    "Reduction",
+    "SolveService",
+    "work",
+]
 
 ###-------------------------###
 
@@ -46,35 +110,145 @@ def RKExplicit(
     abstol=1e-6,
     reltol=1e-3,
     interp="Yes",
+    global_error="No",
+    fixed_step=None,
+    store="y+err",
+    observables=None,
+    cache=None,
+    warm_start=None,
+    autotune_store=None,
+    precision="Double",
 ):
     method = method.lower()
     interp = interp.lower()
+    global_error = global_error.lower()
+    store = store.lower()
+    precision = precision.lower()
 
     if reltol == 0.0:
         raise Exception("RelTol cannot be zero")
 
+    if store not in ("y+err", "y", "none"):
+        raise RuntimeError(
+            "Storage policy is unknown. Available policies are: 'y+err', 'y', and 'none'."
+        )
+
+    if store == "none" and global_error == "yes":
+        raise ValueError("Global error estimation needs the stored trajectory")
+
+    if observables is not None and fixed_step is not None:
+        raise ValueError("Observables are only available with adaptive steps")
+
+    if observables is not None and cache is not None:
+        raise ValueError("Results with observables are not cached")
+
+    if warm_start is not None and (warm_start.store == "none" or len(warm_start.tsol) < 3):
+        raise ValueError("Warm start needs the stored time grid of the previous solution")
+
     atol = abs(abstol)
     rtol = abs(reltol)
     threshold = atol / rtol
 
     init = ArrayInitialization()
 
-    yinit = init.array_check(yinit)
-    t_range = init.array_check(t_range)
-    params = init.array_check(params)
+    # States and stages in dtype; time and error norms in acc
+    dtype, acc = init.precision(precision)
+    # Single precision states cannot resolve tighter tolerances; double
+    # precision keeps accepting any nonzero tolerance, as it always has
+    if dtype != np.float64 and rtol < 100 * np.finfo(dtype).eps:
+        raise ValueError("RelTol is below the resolution of the state precision")
+
+    # -- Structured states: a flat vector is integrated, the RHS sees views --#
+    layout = None
+    if is_structured(yinit):
+        layout = Layout(yinit, dtype)
+        yinit = layout.flatten(yinit)
+        func = layout.rhs(func)
+
+    yinit = init.array_check(yinit, dtype)
+    t_range = init.array_check(t_range, acc)
+    params = init.array_check(params, dtype)
+
+    # -- Content-addressed lookup of an identical earlier solve --#
+    if cache is not None:
+        key = cache.key(
+            func,
+            t_range,
+            yinit,
+            params,
+            method,
+            atol,
+            rtol,
+            interp,
+            global_error,
+            fixed_step,
+            store,
+            precision,
+            # A warm start changes the steps taken, so its grid is part of the key
+            None if warm_start is None else (warm_start.tsol, warm_start.errsol),
+        )
+        hit = cache.get(key)
+        if hit is not None:
+            sol = Solution(
+                func,
+                params,
+                method,
+                hit["tsol"],
+                hit["ysol"],
+                hit.get("yhatsol"),
+                dict(hit["stats"]),
+                hit["store"],
+            )
+            sol.layout = layout
+            return sol
+
+    # -- Pick the cheapest tableau by pilot runs on the first part --#
+    tuning = None
+    if method == "autotune":
+        tuner = Autotune(func, params, store=autotune_store)
+        method, tuning = tuner.choose(t_range, yinit, atol, rtol)
+
+    # -- Constant step size: no error estimate, no embedded solution --#
+    if fixed_step is not None:
+        if fixed_step <= 0.0:
+            raise ValueError("Fixed step size must be positive")
+        fs = FixedStep(func, params, len(yinit), method, dtype=dtype)
+        tsol, ysol = fs.solve(t_range, yinit, fixed_step)
+        stats = {
+            "total steps": len(tsol),
+            "failed steps": 0,
+            "function evaluations": fs.nfev,
+        }
+        if tuning is not None:
+            stats["autotune"] = tuning
+        if store == "none":
+            tsol, ysol = tsol[-1:], ysol[-1:, :]
+        sol = Solution(
+            func, params, method, tsol, ysol, None, stats, "none" if store == "none" else "y"
+        )
+        sol.layout = layout
+        if cache is not None:
+            cache.put(key, {"tsol": tsol, "ysol": ysol, "stats": stats, "store": sol.store})
+        return sol
 
     t = t_range[0]
     nord = 2
     n = len(yinit)
 
-    tsol, ysol, yhatsol = init.gen_init_arrays(t, yinit)
+    # Accepted steps are collected in lists and stacked once at the end;
+    # the last three are always kept for the final interpolation
+    tsol = [t]
+    ysol = [yinit.copy()]
+    yhatsol = [yinit.copy()]
+    tail = [(t, yinit.copy(), yinit.copy())]
 
     # -- Get Butcher tableau coefficients --#
-    vals = Variables(method)
-    vals.coefficients()
+    vals = Variables(method, dtype)
     b = vals.bt
     bhat = vals.bhat
     p = vals.p
+    wd = Variables(method)
+    bdiff = (wd.bt - wd.bhat).astype(acc)  # error weights, for float32 states
 
     ya = yinit.copy()
     tspan = t_range[0]
@@ -85,30 +259,55 @@ def RKExplicit(
     ss = StepSize(func, t, yinit, params, method, nord)
     hh, hmax = ss.init_step_v3(t_range, threshold, rtol, p)
 
+    # -- Warm start: step sizes forecast by an earlier solution's grid --#
+    history = None
+    if warm_start is not None:
+        history = StepHistory(
+            warm_start.tsol, warm_start.ysol, warm_start.errsol, atol, rtol, p
+        )
+        hh = history.first()
+
     nsteps = 1
     nfailed = 0
 
     rejectStep = False
 
+    # -- Reductions on accepted steps; the last step ends on t_range[1] --#
+    obs = None
+    if observables is not None:
+        obs = Observables(observables, func, params, method)
+        obs.start(t, ya)
+
     while tspan <= t_range[1]:
+        if history is not None and nsteps > 1:
+            hh = history.predict(t, hh)
+
         # Step size is bounded by lower (hmin) and upper (hmax)
         hmin = 16 * np.spacing(t)
         hh = min(hmax, max(hmin, hh))
-        h = tdir * hh
+        if obs is not None and 1.1 * hh >= abs(t_range[1] - t):
+            hh = abs(t_range[1] - t)
+        h = acc(tdir * hh)
 
         noFailed = True  # no failed attempts
 
         # Loop for moving 1 step forward
         while True:
+            # One set of stages serves both weights
             yt1 = Approximation(func, t, ya, params, h, method)
+            yhat = yt1.y_estimate(bhat)
             t1, y = yt1.y_approx(b)
 
-            yt2 = Approximation(func, t, ya, params, h, method)
-            t2, yhat = yt2.y_approx(bhat)
-
             # Estimate error
-            ydiff = y - yhat
-            sc = atol + rtol * max(norm(ya, nord), norm(y, nord))  # Eq. (4.10)
+            if dtype == np.float64:
+                ydiff = y - yhat
+            else:
+                # From the weight differences, free of the rounding of y and
+                # yhat, which would swamp the estimate in single precision
+                ydiff = acc(h) * (bdiff @ yt1.k.astype(acc))
+            sc = atol + rtol * max(
+                norm(np.asarray(ya, acc), nord), norm(np.asarray(y, acc), nord)
+            )  # Eq. (4.10)
             err = ((1 / n) * (norm(ydiff, nord) / sc) ** 2) ** (
                 1 / 2
             )  # norm following Eq (4.11)
@@ -127,7 +326,7 @@ def RKExplicit(
                 rejectStep = True
 
                 hh = calculateStepSize(rejectStep, hh, hmin, err, p)
-                h = tdir * hh
+                h = acc(tdir * hh)
                 continue
             else:
                 break
@@ -144,38 +343,814 @@ def RKExplicit(
 
         nsteps += 1
 
-        ysol = np.vstack((ysol, y))
-        yhatsol = np.vstack((yhatsol, yhat))
-
         tspan += h
-        tsol = np.append(tsol, tspan)
+        if obs is not None:
+            obs.step(t, ya, h, yt1.k, vals.a, vals.c, b, t1, y)
+            if abs(t_range[1] - t1) <= hmin:
+                t1 = tspan = t_range[1]
+        if store != "none":
+            tsol.append(tspan)
+            ysol.append(y)
+        if store == "y+err":
+            yhatsol.append(yhat)
+        tail = tail[-2:] + [(tspan, y, yhat)]
 
         ya = y
         t = t1
         rejectStep = False
 
-    if interp == "yes":
-        intp = Interpolate(tsol, ysol, yhatsol, t_range[1])
+        if obs is not None and t == t_range[1]:
+            break
+
+    if store == "none":
+        tsol = [tail[-1][0]]
+        ysol = [tail[-1][1]]
+        yhatsol = [tail[-1][2]]
+
+    tsol = np.array(tsol)
+    ysol = np.array(ysol)
+    yhatsol = np.array(yhatsol) if store != "y" else None
+
+    # -- Richardson estimate of the global error on the accepted grid --#
+    # Taken before interpolation, so that the last row is the error at the
+    # last accepted step and not that of the interpolated end point
+    if global_error == "yes":
+        ge = GlobalError(func, tsol, ysol, params, method, b, p)
+        esol = ge.estimate()
+        enorm = ge.relative(threshold)
+
+    if interp == "yes" and obs is None:
+        intp = Interpolate(
+            np.array([s[0] for s in tail]),
+            np.array([s[1] for s in tail]),
+            np.array([s[2] for s in tail]),
+            t_range[1],
+        )
         ti, yi, yhi = intp.calculate()
         ysol[-1, :] = yi
-        yhatsol[-1, :] = yhi
-        tsol[-1] = ti
-    elif interp == "no":
-        tsol = tsol
-        ysol = ysol
-        yhatsol = yhatsol
-
-    return (
-        tsol,
-        ysol,
-        yhatsol,
-        {
-            "total steps": nsteps,
-            "failed steps": nfailed,
-            "absolute error": atol,
-            "relative error": rtol,
-        },
+        if yhatsol is not None:
+            yhatsol[-1, :] = yhi
+        tsol[-1] = ti[0]
+
+    stats = {
+        "total steps": nsteps,
+        "failed steps": nfailed,
+        "absolute error": atol,
+        "relative error": rtol,
+    }
+    if tuning is not None:
+        stats["autotune"] = tuning
+
+    if global_error == "yes":
+        stats["global error"] = esol
+        stats["global error norm"] = enorm
+
+    sol = Solution(func, params, method, tsol, ysol, yhatsol, stats, store)
+    sol.layout = layout
+    if obs is not None:
+        sol.observables = obs.finish()
+
+    if cache is not None:
+        entry = {"tsol": tsol, "ysol": ysol, "stats": stats, "store": store}
+        if yhatsol is not None:
+            entry["yhatsol"] = yhatsol
+        cache.put(key, entry)
+
+    return sol
+
+
+def RKTarget(
+    func,
+    t_range,
+    yinit,
+    params,
+    target,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    interp="Yes",
+    maxiter=8,
+):
+    if target <= 0.0:
+        raise Exception("Target global error must be positive")
+
+    atol = abs(abstol)
+    rtol = abs(reltol)
+    p = Variables(method.lower()).p
+
+    # Tolerance proportionality: global error ~ C * rtol^(p / (p + 1))
+    q = p / (p + 1)
+
+    for niter in range(1, maxiter + 1):
+        sol = RKExplicit(
+            func,
+            t_range,
+            yinit,
+            params,
+            method=method,
+            abstol=atol,
+            reltol=rtol,
+            interp=interp,
+            global_error="Yes",
+        )
+        gerr = sol.stats["global error norm"]
+        if gerr <= target:
+            break
+
+        fac = max(1e-3, (0.8 * target / gerr) ** (1 / q))
+        if rtol * fac < 100 * np.spacing(1.0):
+            break
+        atol = atol * fac
+        rtol = rtol * fac
+
+    sol.stats["tolerance iterations"] = niter
+    sol.stats["target met"] = gerr <= target
+
+    return sol
+
+
+def RKSensitivity(
+    func,
+    t_range,
+    yinit,
+    params,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    jac=None,
+    errcon="No",
+):
+    method = method.lower()
+    errcon = errcon.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    t = t_range[0]
+    nord = 2
+    n = len(yinit)
+    m = len(params)
+
+    vals = Variables(method)
+    b = vals.bt
+    bhat = vals.bhat
+    p = vals.p
+
+    ctrl = ErrorControl(abstol, reltol, p)
+    atol = ctrl.atol
+    rtol = ctrl.rtol
+    threshold = atol / rtol
+
+    jacobian = Jacobian(func, params, jac)
+
+    ya = yinit.copy()
+    sa = np.zeros((n, m))
+    tsol = [t]
+    ysol = [ya]
+    ssol = [sa]
+
+    tdir = np.sign(t_range[-1] - t_range[0])
+
+    ss = StepSize(func, t, yinit, params, method, nord)
+    hh, hmax = ss.init_step_v3(t_range, threshold, rtol, p)
+
+    nsteps = 1
+    nfailed = 0
+    nsfailed = 0
+
+    while tdir * (t_range[-1] - t) > 0:
+        hmin = 16 * np.spacing(t)
+        hh = min(hmax, max(hmin, hh))
+        if 1.1 * hh >= abs(t_range[-1] - t):
+            hh = abs(t_range[-1] - t)
+
+        noFailed = True
+
+        while True:
+            h = tdir * hh
+
+            # -- State step: one stage evaluation serves both weights --#
+            yt = Approximation(func, t, ya, params, h, method)
+            yhat = yt.y_estimate(bhat)
+            t1, y = yt.y_approx(b)
+            err = ctrl.error(ya, y, y - yhat)
+
+            # -- Staggered: sensitivities only for an accepted state step --#
+            if err <= rtol:
+                st = Sensitivity(jacobian, t, ya, sa, yt.k, h, method)
+                s = st.s_approx(b)
+
+                if errcon == "yes":
+                    shat = st.s_approx(bhat)
+                    ssc = atol + rtol * np.maximum(abs(sa), abs(s))
+                    serr = np.sqrt(np.mean(((s - shat) / ssc) ** 2))
+                    if serr > rtol:
+                        nsfailed += 1
+                        err = max(err, serr)
+
+            if err > rtol:
+                nfailed += 1
+                if hh < hmin:
+                    raise ValueError("Integration tolerance not met!")
+                noFailed = False
+                hh = ctrl.reject(hh, hmin, err)
+                continue
+
+            break
+
+        if noFailed:
+            hh = ctrl.accept(hh, err)
+
+        nsteps += 1
+
+        t = t_range[-1] if abs(t_range[-1] - t1) <= hmin else t1
+        ya = y
+        sa = s
+        tsol.append(t)
+        ysol.append(ya)
+        ssol.append(sa)
+
+    stats = {
+        "total steps": nsteps,
+        "failed steps": nfailed,
+        "sensitivity failed steps": nsfailed,
+        "sensitivity evaluations": jacobian.nfev,
+        "absolute error": atol,
+        "relative error": rtol,
+    }
+    sol = Solution(
+        func, params, method, np.array(tsol), np.array(ysol), None, stats, "y"
+    )
+    sol.ssol = np.array(ssol)
+    return sol
+
+
+def RKAdjoint(
+    func,
+    t_range,
+    yinit,
+    params,
+    dgdy,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    jac=None,
+    checkpoint=50,
+    vjp=None,
+):
+    method = method.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    # The backward pass needs w^T df/dy and w^T df/dparams at every stage:
+    # vjp(t, y, params, w) costs about one RHS evaluation per stage, while
+    # jac(t, y, params) forms both matrices, O(n (n + n_params)) per stage.
+    # Finite differences would take n + n_params evaluations per stage, so
+    # one of the two is required.
+    if vjp is None and jac is None:
+        raise ValueError("Adjoint sensitivities need vjp or jac")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    t = t_range[0]
+    nord = 2
+
+    vals = Variables(method)
+    b = vals.bt
+    bhat = vals.bhat
+    p = vals.p
+
+    ctrl = ErrorControl(abstol, reltol, p)
+    atol = ctrl.atol
+    rtol = ctrl.rtol
+    threshold = atol / rtol
+
+    # -- Forward pass: keep the accepted grid and checkpointed states only --#
+    chk = Checkpoints(func, params, method, b, checkpoint)
+
+    ya = yinit.copy()
+    tsol = [t]
+    hsol = []
+    chk.store(0, ya)
+
+    tdir = np.sign(t_range[-1] - t_range[0])
+
+    ss = StepSize(func, t, yinit, params, method, nord)
+    hh, hmax = ss.init_step_v3(t_range, threshold, rtol, p)
+
+    nsteps = 1
+    nfailed = 0
+
+    while tdir * (t_range[-1] - t) > 0:
+        hmin = 16 * np.spacing(t)
+        hh = min(hmax, max(hmin, hh))
+        if 1.1 * hh >= abs(t_range[-1] - t):
+            hh = abs(t_range[-1] - t)
+
+        noFailed = True
+
+        while True:
+            h = tdir * hh
+            yt = Approximation(func, t, ya, params, h, method)
+            yhat = yt.y_estimate(bhat)
+            t1, y = yt.y_approx(b)
+            err = ctrl.error(ya, y, y - yhat)
+
+            if err > rtol:
+                nfailed += 1
+                if hh < hmin:
+                    raise ValueError("Integration tolerance not met!")
+                noFailed = False
+                hh = ctrl.reject(hh, hmin, err)
+                continue
+
+            break
+
+        if noFailed:
+            hh = ctrl.accept(hh, err)
+
+        t = t_range[-1] if abs(t_range[-1] - t1) <= hmin else t1
+        ya = y
+        hsol.append(h)
+        tsol.append(t)
+        chk.store(nsteps, ya)
+        nsteps += 1
+
+    # -- Backward pass: pull dG/dy(T) back to t0 through every step --#
+    jacobian = Jacobian(func, params, jac, vjp)
+    lam = np.array(dgdy(t, ya, params), dtype=float)
+    lam, mu = chk.reverse(jacobian, tsol, hsol, lam)
+
+    stats = {
+        "total steps": nsteps,
+        "failed steps": nfailed,
+        "recomputed steps": chk.nrecomputed,
+        "stored states": chk.nstored,
+        "adjoint evaluations": jacobian.nfev,
+        "vector-jacobian products": jacobian.nvjp,
+        "absolute error": atol,
+        "relative error": rtol,
+    }
+    sol = Solution(
+        func, params, method, np.array([t]), ya[None, :], None, stats, "none"
     )
+    sol.dgdp = mu
+    sol.dgdy0 = lam
+    return sol
+
+
+def RKMultirate(
+    func,
+    t_range,
+    yinit,
+    params,
+    fast,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    func_fast=None,
+    substeps=4,
+):
+    method = method.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    fast = np.unique(np.array(fast, dtype=int))
+    if len(fast) == 0 or len(fast) >= len(yinit):
+        raise ValueError("Fast components must be a non-empty proper subset of y")
+
+    mr = Multirate(func, func_fast, params, fast, len(yinit), method)
+    return mr.solve(t_range, yinit, abstol, reltol, substeps)
+
+
+def RKLowStorage(
+    func,
+    t_range,
+    yinit,
+    params,
+    method="2N-RK4",
+    abstol=1e-6,
+    reltol=1e-3,
+    store="y",
+):
+    method = method.lower()
+    if type(store) == str:
+        store = store.lower()
+        if store not in ("y", "none"):
+            raise RuntimeError(
+                "Storage policy is unknown. Available policies are: 'y', 'none', or an integer stride."
+            )
+    elif int(store) < 1:
+        raise ValueError("Storage stride must be at least 1")
+    else:
+        store = int(store)
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    ls = LowStorage(func, params, method)
+    return ls.solve(t_range, yinit, abstol, reltol, store)
+
+
+def RKNystrom(
+    func,
+    t_range,
+    yinit,
+    ypinit,
+    params,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    velocity="No",
+):
+    method = method.lower()
+    velocity = velocity.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    ypinit = init.array_check(ypinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    if len(yinit) != len(ypinit):
+        raise ValueError("Initial values and derivatives must have the same size")
+
+    rkn = Nystrom(func, params, method, velocity)
+    return rkn.solve(t_range, yinit, ypinit, abstol, reltol)
+
+
+def RKSymplectic(
+    dvdq,
+    t_range,
+    qinit,
+    pinit,
+    params,
+    h,
+    method="Default",
+    dtdp=None,
+    adaptive="No",
+    stepfun=None,
+    store="y",
+):
+    method = method.lower()
+    adaptive = adaptive.lower()
+    store = store.lower()
+
+    if h <= 0.0:
+        raise ValueError("Step size must be positive")
+
+    if store not in ("y", "none"):
+        raise RuntimeError(
+            "Storage policy is unknown. Available policies are: 'y' and 'none'."
+        )
+
+    init = ArrayInitialization()
+
+    qinit = init.array_check(qinit)
+    pinit = init.array_check(pinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    sy = Symplectic(dvdq, dtdp, params, method)
+    return sy.solve(t_range, qinit, pinit, h, adaptive == "yes", stepfun, store)
+
+
+def RKDelay(
+    func,
+    t_range,
+    history,
+    lags,
+    params,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    capacity=4096,
+):
+    method = method.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    lags = list(lags) if np.ndim(lags) > 0 or type(lags) == list else [lags]
+    for lag in lags:
+        if not callable(lag) and lag < 0.0:
+            raise ValueError("Lags must be non-negative")
+
+    if callable(history):
+        yinit = init.array_check(history(t_range[0], params))
+    else:
+        history = init.array_check(history)
+        yinit = history.copy()
+
+    dde = Delay(func, lags, history, params, method)
+    return dde.solve(t_range, yinit, abstol, reltol, capacity)
+
+
+def RKParareal(
+    func,
+    t_range,
+    yinit,
+    params,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    slices=None,
+    workers=None,
+    coarse_method="Cash-Karp",
+    coarse_tol=1e-2,
+    maxiter=None,
+):
+    method = method.lower()
+    coarse_method = coarse_method.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    # Validate both tableaux before any work is sent to the pool
+    Variables(method)
+    Variables(coarse_method)
+
+    pr = Parareal(func, params, method, coarse_method, workers)
+    if slices is None:
+        slices = pr.workers
+    if slices < 1:
+        raise ValueError("Number of time slices must be at least 1")
+
+    return pr.solve(t_range, yinit, abstol, reltol, slices, coarse_tol, maxiter)
+
+
+def RKExtrapolation(
+    func,
+    t_range,
+    yinit,
+    params,
+    abstol=1e-6,
+    reltol=1e-3,
+    kmax=9,
+    workers=None,
+):
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    if kmax < 3:
+        raise ValueError("Extrapolation needs at least 3 columns")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    ex = Extrapolation(func, params, kmax, workers)
+    return ex.solve(t_range, yinit, abstol, reltol)
+
+
+def RKChebyshev(
+    func,
+    t_range,
+    yinit,
+    params,
+    abstol=1e-6,
+    reltol=1e-3,
+    spectral_radius=None,
+    refresh=25,
+    smax=250,
+):
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    if smax < 2:
+        raise ValueError("Chebyshev methods need at least 2 stages")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    ch = Chebyshev(func, params, spectral_radius, refresh, smax)
+    return ch.solve(t_range, yinit, abstol, reltol)
+
+
+def RKExponential(
+    lin,
+    nonlin,
+    t_range,
+    yinit,
+    params,
+    h=None,
+    abstol=1e-6,
+    reltol=1e-3,
+    krylov="No",
+    krylov_dim=30,
+):
+    krylov = krylov.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    if krylov != "yes" and krylov != "no":
+        raise ValueError("krylov must be 'Yes' or 'No'")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+    if not callable(lin):
+        lin = np.asarray(lin)
+
+    ex = Exponential(lin, nonlin, params, krylov == "yes", krylov_dim)
+    return ex.solve(t_range, yinit, h, abstol, reltol)
+
+
+def RKIMEX(
+    func_explicit,
+    func_implicit,
+    t_range,
+    yinit,
+    params,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    jac=None,
+    newton="Direct",
+    precond=None,
+    restart=20,
+):
+    method = method.lower()
+    newton = newton.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    params = init.array_check(params)
+
+    im = IMEX(
+        func_explicit, func_implicit, params, method, jac, newton, precond, restart
+    )
+    return im.solve(t_range, yinit, abstol, reltol)
+
+
+def RKEnsemble(
+    func,
+    t_range,
+    yinit,
+    params,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    vectorized=False,
+    precision="Double",
+):
+    # yinit (M, n) holds one trajectory per row. params is either shared, or
+    # given per trajectory as an (M, n_params) array, and t_range is either
+    # shared, (2,), or given per trajectory, (M, 2). A trajectory that fails
+    # does not stop the others: its stats report success False and a message
+    method = method.lower()
+    precision = precision.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    dtype, acc = ArrayInitialization().precision(precision)
+    if dtype != np.float64 and abs(reltol) < 100 * np.finfo(dtype).eps:
+        raise ValueError("RelTol is below the resolution of the state precision")
+
+    yinit = np.atleast_2d(np.asarray(yinit, dtype=dtype))
+    params = np.asarray(params, dtype=dtype)
+    M = yinit.shape[0]
+    if params.ndim != 2 or len(params) != M:
+        params = np.broadcast_to(params, (M,) + params.shape)
+    t_range = np.asarray(t_range, dtype=acc)
+    if t_range.ndim == 1:
+        t_range = np.broadcast_to(t_range[[0, -1]], (M, 2))
+    if t_range.shape != (M, 2):
+        raise ValueError("t_range must have shape (2,) or (M, 2)")
+
+    ens = Ensemble(func, params, vectorized, method, dtype=dtype, accumulate=acc)
+    return [
+        Solution(func, params[i], method, tsol, ysol, yhatsol, stats)
+        for i, (tsol, ysol, yhatsol, stats) in enumerate(
+            ens.solve(t_range, yinit, abstol, reltol)
+        )
+    ]
+
+
+def RKSweep(
+    func,
+    t_range,
+    yinit,
+    param_grid,
+    store,
+    method="Default",
+    abstol=1e-6,
+    reltol=1e-3,
+    workers=None,
+    address=("127.0.0.1", 0),
+    authkey=None,
+    target=1.0,
+    retries=3,
+    lease=600.0,
+    timeout=None,
+):
+    # One solve per row of param_grid, distributed over worker processes.
+    # Local workers are started on this machine (workers=0 for none); remote
+    # ones join with work(address, authkey, store) on the coordinator's
+    # address. Returns a dict of arrays over the grid: final states y, step
+    # counts, function evaluations, seconds and ok. A 1-D param_grid holds
+    # one parameter per grid point.
+    method = method.lower()
+
+    if reltol == 0.0:
+        raise Exception("RelTol cannot be zero")
+
+    init = ArrayInitialization()
+
+    yinit = init.array_check(yinit)
+    t_range = init.array_check(t_range)
+    param_grid = np.asarray(param_grid, dtype=float)
+    if param_grid.ndim == 1:
+        param_grid = param_grid.reshape(-1, 1)
+    if param_grid.ndim != 2:
+        raise ValueError("param_grid must have shape (npoints,) or (npoints, n_params)")
+
+    Variables(method)
+
+    co = Coordinator(
+        func,
+        t_range,
+        yinit,
+        param_grid,
+        store,
+        method,
+        abstol,
+        reltol,
+        target=target,
+        retries=retries,
+        lease=lease,
+        address=address,
+        authkey=authkey,
+    )
+    co.start()
+
+    workers = os.cpu_count() if workers is None else workers
+    procs = [
+        multiprocessing.Process(target=work, args=(co.address, co.authkey, store))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    try:
+        return co.wait(timeout)
+    finally:
+        for p in procs:
+            p.join(5.0)
+            if p.is_alive():
+                p.terminate()
 
 
 ###-------------------------###
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# pyode.py imports its submodules as explicit.<module>, and the submodules
+# import their siblings by name, so both directories have to be importable
+src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "pyode")
+sys.path.append(src)
+sys.path.append(os.path.join(src, "explicit"))
+
+# Right-hand sides and parameters shared by the tests, not tests themselves
+collect_ignore = ["test_functions.py"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from pyode import pyode
+
+
+def decay_func(t, y, p):
+    return np.array([-p[0] * y[0], p[1] * y[0] - y[1]])
+
+
+def decay_jac(t, y, p):
+    dfdy = np.array([[-p[0], 0.0], [p[1], -1.0]])
+    dfdp = np.array([[-y[0], 0.0], [0.0, y[0]]])
+    return dfdy, dfdp
+
+
+def decay_vjp(t, y, p, w):
+    return w @ np.array([[-p[0], 0.0], [p[1], -1.0]]), np.array([-y[0] * w[0], y[0] * w[1]])
+
+
+def loss_grad(t, y, p):
+    # G = y_0(T)
+    return np.array([1.0, 0.0])
+
+
+def test_adjoint_matches_analytic_gradient():
+    T, y0, k = 2.0, 1.0, 1.5
+    for kwargs in ({"jac": decay_jac}, {"vjp": decay_vjp}):
+        sol = pyode.RKAdjoint(
+            decay_func,
+            [0.0, T],
+            [y0, 0.0],
+            [k, 0.7],
+            loss_grad,
+            abstol=1e-8,
+            reltol=1e-6,
+            checkpoint=5,
+            **kwargs
+        )
+        assert sol.tsol[-1] == T
+        assert abs(sol.ysol[-1, 0] - y0 * np.exp(-k * T)) < 1e-8
+        assert abs(sol.dgdp[0] + T * y0 * np.exp(-k * T)) < 1e-7
+        assert abs(sol.dgdp[1]) < 1e-12
+        assert abs(sol.dgdy0[0] - np.exp(-k * T)) < 1e-7
+
+
+def test_adjoint_matches_forward_sensitivity():
+    args = (decay_func, [0.0, 2.0], [1.0, 0.5], [1.5, 0.7])
+    adj = pyode.RKAdjoint(*args, lambda t, y, p: np.array([0.0, 1.0]), jac=decay_jac)
+    fwd = pyode.RKSensitivity(*args, jac=decay_jac)
+    assert np.allclose(adj.dgdp, fwd.ssol[-1, 1, :], atol=1e-5)
+
+
+def test_adjoint_needs_derivatives():
+    with pytest.raises(ValueError):
+        pyode.RKAdjoint(decay_func, [0.0, 1.0], [1.0, 0.0], [1.5, 0.7], loss_grad)
@@ -0,0 +1,39 @@
+import numpy as np
+from pyode import pyode
+import test_functions as tf
+from step_size import Propagator
+
+
+def test_propagator_ends_on_slice():
+    t_range, y_init, params = tf.simple_params()
+    prop = Propagator(tf.simple_func, params, "default")
+    tsol, ysol = prop.solve(np.array(t_range), np.array(y_init), 1e-8, 1e-6)
+    assert tsol[-1] == t_range[-1]
+    assert abs(ysol[-1, 0] - tf.simple_exact(t_range[-1])) < 1e-6
+    assert prop.nfev > 0
+
+
+def test_autotune_picks_a_candidate_and_solves():
+    t_range, y_init, params = tf.vdp_params()
+    sol = pyode.RKExplicit(tf.vdp_func, t_range, y_init, params, method="Autotune")
+    tuning = sol.stats["autotune"]
+    assert tuning["method"] in tuning["pilots"]
+    assert not tuning["stored"]
+    ref = pyode.RKExplicit(
+        tf.vdp_func, t_range, y_init, params, method=tuning["method"]
+    )
+    assert np.array_equal(sol.ysol, ref.ysol)
+
+
+def test_stored_decision_skips_pilots(tmp_path):
+    store = str(tmp_path / "autotune.json")
+    t_range, y_init, params = tf.vdp_params()
+    first = pyode.RKExplicit(
+        tf.vdp_func, t_range, y_init, params, method="Autotune", autotune_store=store
+    )
+    # Other parameters, same problem: the decision is reused
+    second = pyode.RKExplicit(
+        tf.vdp_func, t_range, y_init, [1.1], method="Autotune", autotune_store=store
+    )
+    assert second.stats["autotune"]["stored"]
+    assert second.stats["autotune"]["method"] == first.stats["autotune"]["method"]
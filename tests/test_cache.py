@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+rate = 0.8
+
+
+def counted_func(t, y, p):
+    counted_func.calls += 1
+    return np.array([rate * y[0]])
+
+
+counted_func.calls = 0
+
+
+def test_hit_skips_integration():
+    cache = pyode.ResultCache()
+    args = (counted_func, [0.0, 1.0], [1.0], [])
+    sol1 = pyode.RKExplicit(*args, cache=cache)
+    calls = counted_func.calls
+    sol2 = pyode.RKExplicit(*args, cache=cache)
+    assert counted_func.calls == calls
+    assert cache.hits == 1 and cache.misses == 1
+    assert np.array_equal(sol1.tsol, sol2.tsol)
+    assert np.array_equal(sol1.ysol, sol2.ysol)
+    assert not sol2.ysol.flags.writeable
+
+
+def test_key_follows_inputs_and_code():
+    global rate
+    cache = pyode.ResultCache()
+    args = (counted_func, [0.0, 1.0], [1.0], [])
+    pyode.RKExplicit(*args, cache=cache)
+    pyode.RKExplicit(*args, reltol=1e-4, cache=cache)
+    pyode.RKExplicit(counted_func, [0.0, 1.0], [2.0], [], cache=cache)
+    old = rate
+    try:
+        # A global read by the right-hand side is part of its fingerprint
+        rate = 0.5
+        sol = pyode.RKExplicit(*args, cache=cache)
+    finally:
+        rate = old
+    assert cache.hits == 0 and cache.misses == 4
+    assert sol.ysol[-1, 0] < np.exp(0.6)
+
+
+def test_directory_store_is_shared(tmp_path):
+    t_range, y_init, params = tf.simple_params()
+    sol1 = pyode.RKExplicit(
+        tf.simple_func,
+        t_range,
+        y_init,
+        params,
+        cache=pyode.ResultCache(directory=str(tmp_path)),
+    )
+    # A fresh cache on the same directory, as in another process
+    cache = pyode.ResultCache(directory=str(tmp_path))
+    sol2 = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, cache=cache)
+    assert cache.hits == 1
+    assert isinstance(sol2.ysol, np.memmap)
+    assert np.array_equal(sol1.ysol, sol2.ysol)
+    assert sol1.stats["total steps"] == sol2.stats["total steps"]
+
+
+def test_memory_budget_drops_least_recently_used():
+    cache = pyode.ResultCache(max_bytes=1000)
+    cache.put("a", {"x": np.zeros(50)})
+    cache.put("b", {"x": np.zeros(50)})
+    assert cache.get("a") is not None
+    cache.put("c", {"x": np.zeros(50)})
+    assert cache.nbytes <= 1000
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_observables_are_not_cached():
+    t_range, y_init, params = tf.simple_params()
+    with pytest.raises(ValueError):
+        pyode.RKExplicit(
+            tf.simple_func,
+            t_range,
+            y_init,
+            params,
+            observables={"max": pyode.Maximum(lambda t, y: y[0])},
+            cache=pyode.ResultCache(),
+        )
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def heat_func(t, y, p):
+    # Semi-discrete heat equation on (0, 1) with zero boundary values
+    n = len(y)
+    dx = 1.0 / (n + 1)
+    yp = np.concatenate(([0.0], y, [0.0]))
+    return p[0] * (yp[:-2] - 2 * yp[1:-1] + yp[2:]) / dx**2
+
+
+def heat_exact(t, n, d):
+    # The initial state sin(pi x) is an eigenvector of the discrete operator
+    dx = 1.0 / (n + 1)
+    x = dx * np.arange(1, n + 1)
+    lam = -4 * d * np.sin(np.pi * dx / 2) ** 2 / dx**2
+    return np.exp(lam * t) * np.sin(np.pi * x)
+
+
+def test_chebyshev_matches_exact_solution():
+    t_range, y_init, params = tf.simple_params()
+    errs = []
+    for tol in (1e-3, 1e-6):
+        tsol, ysol, stats = pyode.RKChebyshev(
+            tf.simple_func, t_range, y_init, params, abstol=tol, reltol=tol
+        )
+        assert tsol[-1] == t_range[-1]
+        errs.append(np.max(np.abs(ysol[:, 0] - tf.simple_exact(tsol))))
+    assert errs[1] < errs[0]
+    assert errs[1] < 1e-5
+
+
+def test_stiff_heat_equation():
+    n, d = 50, 1.0
+    x = np.arange(1, n + 1) / (n + 1)
+    tsol, ysol, stats = pyode.RKChebyshev(
+        heat_func, [0.0, 0.1], np.sin(np.pi * x), [d], abstol=1e-8, reltol=1e-3
+    )
+    assert np.max(np.abs(ysol[-1] - heat_exact(0.1, n, d))) < 1e-4
+    # rho ~ 4 / dx^2 ~ 1e4: the explicit solvers would need h < 2e-4
+    assert stats["total steps"] < 100
+    assert 2 < stats["max stages"] <= 250
+    single = pyode.RKExplicit(heat_func, [0.0, 0.1], np.sin(np.pi * x), [d])
+    assert 5 * stats["total steps"] < single.stats["total steps"]
+    # RKExplicit takes several evaluations of f per step
+    assert stats["function evaluations"] < 2 * single.stats["total steps"]
+
+
+def test_given_spectral_radius():
+    n, d = 50, 1.0
+    x = np.arange(1, n + 1) / (n + 1)
+    radius = lambda t, y, p: 4 * p[0] * (n + 1) ** 2
+    tsol, ysol, stats = pyode.RKChebyshev(
+        heat_func, [0.0, 0.1], np.sin(np.pi * x), [d], spectral_radius=radius
+    )
+    assert np.max(np.abs(ysol[-1] - heat_exact(0.1, n, d))) < 1e-3
+
+
+def test_chebyshev_needs_two_stages():
+    t_range, y_init, params = tf.simple_params()
+    with pytest.raises(ValueError):
+        pyode.RKChebyshev(tf.simple_func, t_range, y_init, params, smax=1)
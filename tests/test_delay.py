@@ -0,0 +1,40 @@
+import numpy as np
+from pyode import pyode
+
+
+def delayed_decay(t, y, Z, p):
+    return -p[0] * Z[0, :]
+
+
+def delayed_decay_exact(t):
+    # Method of steps for y' = -y(t - 1), y = 1 before t = 0
+    y = 1 - t
+    y = y + np.where(t > 1, (t - 1) ** 2 / 2, 0.0)
+    y = y - np.where(t > 2, (t - 2) ** 3 / 6, 0.0)
+    return y
+
+
+def test_delay_matches_method_of_steps():
+    tsol, ysol, stats = pyode.RKDelay(
+        delayed_decay, [0.0, 3.0], [1.0], 1.0, [1.0], abstol=1e-8, reltol=1e-6
+    )
+    assert tsol[-1] == 3.0
+    # The propagated discontinuities are steps of the grid
+    assert 1.0 in tsol and 2.0 in tsol
+    assert np.max(np.abs(ysol[:, 0] - delayed_decay_exact(tsol))) < 1e-6
+
+
+def test_history_function():
+    hist = lambda t, p: np.array([1.0])
+    t1, y1, _ = pyode.RKDelay(delayed_decay, [0.0, 3.0], hist, [1.0], [1.0])
+    t2, y2, _ = pyode.RKDelay(delayed_decay, [0.0, 3.0], [1.0], [1.0], [1.0])
+    assert np.array_equal(t1, t2)
+    assert np.allclose(y1, y2)
+
+
+def test_ring_buffer_capacity_does_not_change_result():
+    t1, y1, _ = pyode.RKDelay(delayed_decay, [0.0, 20.0], [1.0], [1.0], [1.0], capacity=16)
+    t2, y2, _ = pyode.RKDelay(delayed_decay, [0.0, 20.0], [1.0], [1.0], [1.0])
+    assert len(t1) > 16
+    assert np.array_equal(t1, t2)
+    assert np.array_equal(y1, y2)
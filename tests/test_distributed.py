@@ -0,0 +1,108 @@
+import threading
+import numpy as np
+import pytest
+from multiprocessing.connection import Client
+from pyode import pyode
+from distributed import Coordinator, ChunkStore, solve_chunk, work
+
+
+def decay(t, y, p):
+    return -p[0] * y
+
+
+def exact(rates, t=1.0):
+    return np.exp(-np.asarray(rates) * t)
+
+
+def coordinator(store, grid, **kwargs):
+    return Coordinator(
+        decay, np.array([0.0, 1.0]), np.array([1.0]), grid, store, **kwargs
+    )
+
+
+def local_worker(co, store):
+    thread = threading.Thread(target=work, args=(co.address, co.authkey, store))
+    thread.start()
+    return thread
+
+
+def take_chunk(co):
+    # A worker that takes one chunk and does nothing with it
+    conn = Client(co.address, authkey=co.authkey)
+    conn.recv()
+    conn.send(("ready",))
+    return conn, conn.recv()[1]
+
+
+def test_sweep_over_1d_grid(tmp_path):
+    rates = [1.0, 2.0, 3.0]
+    out = pyode.RKSweep(decay, [0.0, 1.0], [1.0], rates, str(tmp_path), workers=2)
+    assert out["y"].shape == (3, 1)
+    assert np.all(out["ok"])
+    assert np.allclose(out["y"][:, 0], exact(rates), rtol=1e-3)
+
+
+def test_disconnected_worker_chunk_is_retried(tmp_path):
+    grid = np.linspace(1.0, 2.0, 6)[:, None]
+    co = coordinator(str(tmp_path), grid)
+    co.start()
+    conn, chunk = take_chunk(co)
+    conn.close()
+    thread = local_worker(co, str(tmp_path))
+    out = co.wait(timeout=30)
+    thread.join()
+    assert co.attempts[chunk] == 2
+    assert np.all(out["ok"])
+    assert np.allclose(out["y"][:, 0], exact(grid[:, 0]), rtol=1e-3)
+
+
+def test_expired_lease_is_retried(tmp_path):
+    grid = np.linspace(1.0, 2.0, 6)[:, None]
+    co = coordinator(str(tmp_path), grid, lease=0.2)
+    co.start()
+    # Stays connected, but never finishes its chunk
+    conn, chunk = take_chunk(co)
+    thread = local_worker(co, str(tmp_path))
+    out = co.wait(timeout=30)
+    thread.join()
+    conn.close()
+    assert co.attempts[chunk] >= 2
+    assert np.all(out["ok"])
+
+
+def test_chunk_failing_too_often_stops_the_sweep(tmp_path):
+    co = coordinator(str(tmp_path), np.ones((4, 1)), retries=1)
+    co.start()
+    conn = Client(co.address, authkey=co.authkey)
+    conn.recv()
+    conn.send(("ready",))
+    msg = conn.recv()
+    while msg[0] == "chunk":
+        conn.send(("failed", msg[1], "broken worker"))
+        msg = conn.recv()
+    conn.close()
+    with pytest.raises(RuntimeError):
+        co.wait(timeout=30)
+
+
+def test_restart_skips_completed_chunks(tmp_path):
+    store = str(tmp_path)
+    grid = np.linspace(1.0, 2.0, 6)[:, None]
+    co = coordinator(store, grid)
+    # A first run got as far as the first two points
+    co.store.write(0, 2, solve_chunk(co.job, grid, 0, 2))
+    co.listener.close()
+
+    co = coordinator(store, grid)
+    assert co.done == [(0, 2)]
+    assert co.pending == [[2, 6]]
+    co.start()
+    thread = local_worker(co, store)
+    out = co.wait(timeout=30)
+    thread.join()
+    assert (0, 2) not in co.attempts
+    assert np.allclose(out["y"][:, 0], exact(grid[:, 0]), rtol=1e-3)
+
+    # The directory belongs to this sweep
+    with pytest.raises(ValueError):
+        coordinator(store, grid[:3])
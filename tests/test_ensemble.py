@@ -0,0 +1,53 @@
+import asyncio
+import numpy as np
+from pyode import pyode
+import test_functions as tf
+
+
+def blowup(t, y, p):
+    # y = y0 / (1 - y0 t) blows up at t = 1 / y0
+    return y**2
+
+
+def test_ensemble_matches_single_solves():
+    t_range, y_init, params = tf.simple_params()
+    y0 = np.array([[2.0], [1.0], [0.5]])
+    sols = pyode.RKEnsemble(tf.simple_func, t_range, y0, params)
+    for y, sol in zip(y0, sols):
+        single = pyode.RKExplicit(tf.simple_func, t_range, y, params, interp="No")
+        # Same steps, except that the ensemble ends exactly on t_range[-1]
+        assert np.allclose(sol.tsol[:-1], single.tsol[:-1], rtol=1e-12)
+        assert np.allclose(sol.ysol[:-1], single.ysol[:-1], rtol=1e-10)
+        assert sol.tsol[-1] == t_range[-1]
+        assert sol.stats["success"]
+
+
+def test_failing_row_does_not_stop_the_others():
+    y0 = np.array([[0.1], [1.0], [0.2]])
+    with np.errstate(all="ignore"):
+        sols = pyode.RKEnsemble(blowup, [0.0, 2.0], y0, [])
+    assert [sol.stats["success"] for sol in sols] == [True, False, True]
+    assert sols[1].stats["message"]
+    # The failed row stopped at its singularity
+    assert abs(sols[1].tsol[-1] - 1.0) < 1e-3
+    for i in (0, 2):
+        assert sols[i].tsol[-1] == 2.0
+        assert abs(sols[i].ysol[-1, 0] - y0[i, 0] / (1 - 2 * y0[i, 0])) < 1e-4
+
+
+def test_service_fails_only_the_failing_request():
+    async def main():
+        async with pyode.SolveService(window=0.05) as service:
+            out = await asyncio.gather(
+                *(service.solve(blowup, [0.0, 2.0], [y], []) for y in (0.1, 1.0, 0.2)),
+                return_exceptions=True,
+            )
+            return out, service.stats()
+
+    with np.errstate(all="ignore"):
+        out, stats = asyncio.run(main())
+    assert stats["batches"] == 1
+    assert isinstance(out[1], ValueError)
+    for i, y in ((0, 0.1), (2, 0.2)):
+        assert out[i].stats["batch size"] == 3
+        assert abs(out[i].ysol[-1, 0] - y / (1 - 2 * y)) < 1e-4
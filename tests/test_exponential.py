@@ -0,0 +1,75 @@
+import numpy as np
+from pyode import pyode
+from exponential import Krylov, phi_dense
+
+
+def forced(t, y, p):
+    return np.cos(t) * np.ones_like(y)
+
+
+def forced_exact(t, lam, y0):
+    # y' = lam y + cos(t), componentwise
+    A = -lam / (lam**2 + 1)
+    B = 1 / (lam**2 + 1)
+    return np.exp(lam * t) * (y0 - A) + A * np.cos(t) + B * np.sin(t)
+
+
+def laplacian(n):
+    dx = 1.0 / (n + 1)
+    return (
+        np.diag(-2 * np.ones(n)) + np.diag(np.ones(n - 1), 1) + np.diag(np.ones(n - 1), -1)
+    ) / dx**2
+
+
+def test_exponential_matches_exact_solution():
+    lam = np.array([-1000.0, -1.0])
+    y0 = np.array([1.0, 1.0])
+    errs = []
+    for tol in (1e-3, 1e-6):
+        tsol, ysol, stats = pyode.RKExponential(
+            lam, forced, [0.0, 2.0], y0, [], abstol=tol, reltol=tol
+        )
+        assert tsol[-1] == 2.0
+        errs.append(np.max(np.abs(ysol[-1] - forced_exact(2.0, lam, y0))))
+    assert errs[0] < 1e-4
+    assert errs[1] < errs[0]
+
+
+def test_krylov_matches_dense_on_stiff_diagonal():
+    L = np.diag([-1000.0, -1.0])
+    tau = 0.1
+    w0 = np.array([1.0, 1.0])
+    w1 = np.array([1.0, 1.0])
+    P = phi_dense(tau * L)
+    dense = P[0] @ w0 + tau * P[1] @ w1
+    assert np.allclose(dense, [1e-3, 1.0], rtol=1e-6)
+    kry = Krylov(L, None).phiv(tau, [w0, w1])
+    assert np.allclose(kry, dense, rtol=1e-8, atol=1e-12)
+    # The residual of a single vector must not pass for converged
+    assert Krylov(L, None).phiv(tau, [w0])[1] > 0.9
+
+
+def test_krylov_matches_dense_on_laplacian_operator():
+    n = 50
+    A = laplacian(n)
+    x = np.arange(1, n + 1) / (n + 1)
+    ws = [np.sin(np.pi * x) + x * (1 - x), np.cos(x), x]
+    for tau in (1e-3, 0.1):
+        P = phi_dense(tau * A)
+        dense = P[0] @ ws[0] + tau * P[1] @ ws[1] + tau**2 * P[2] @ ws[2]
+        kry = Krylov(lambda v, p: A @ v, None).phiv(tau, ws)
+        assert np.max(np.abs(kry - dense)) < 1e-8
+
+
+def test_krylov_solver_matches_dense_solver():
+    n = 50
+    A = laplacian(n)
+    x = np.arange(1, n + 1) / (n + 1)
+    args = (forced, [0.0, 0.5], np.sin(np.pi * x), [])
+    t1, y1, s1 = pyode.RKExponential(A, *args, h=0.05)
+    t2, y2, s2 = pyode.RKExponential(lambda v, p: A @ v, *args, h=0.05)
+    t3, y3, s3 = pyode.RKExponential(A, *args, h=0.05, krylov="Yes")
+    assert np.array_equal(t1, t2)
+    assert np.max(np.abs(y1 - y2)) < 1e-8
+    assert np.max(np.abs(y1 - y3)) < 1e-8
+    assert s2["operator products"] > 0
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def test_extrapolation_matches_exact_solution():
+    t_range, y_init, params = tf.simple_params()
+    errs = []
+    for tol in (1e-4, 1e-8):
+        tsol, ysol, stats = pyode.RKExtrapolation(
+            tf.simple_func, t_range, y_init, params, abstol=tol, reltol=tol, workers=1
+        )
+        assert tsol[-1] == t_range[-1]
+        errs.append(np.max(np.abs(ysol[:, 0] - tf.simple_exact(tsol))))
+    assert errs[0] < 1e-4
+    assert errs[1] < errs[0]
+
+
+def test_threaded_columns_match_serial():
+    t_range, y_init, params = tf.vdp_params()
+    t1, y1, s1 = pyode.RKExtrapolation(tf.vdp_func, t_range, y_init, params, workers=1)
+    t2, y2, s2 = pyode.RKExtrapolation(tf.vdp_func, t_range, y_init, params, workers=4)
+    assert np.array_equal(t1, t2)
+    assert np.array_equal(y1, y2)
+
+
+def test_extrapolation_needs_three_columns():
+    t_range, y_init, params = tf.simple_params()
+    with pytest.raises(ValueError):
+        pyode.RKExtrapolation(tf.simple_func, t_range, y_init, params, kmax=2)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def test_fixed_step_convergence_order():
+    t_range, y_init, params = tf.simple_params()
+    errs = []
+    for h in (0.4, 0.2, 0.1):
+        sol = pyode.RKExplicit(
+            tf.simple_func, t_range, y_init, params, fixed_step=h
+        )
+        assert sol.tsol[-1] == t_range[-1]
+        assert sol.stats["failed steps"] == 0
+        errs.append(abs(sol.ysol[-1, 0] - tf.simple_exact(sol.tsol[-1])))
+    order = np.log2(np.array(errs[:-1]) / np.array(errs[1:]))
+    assert np.all(order > 4.5)
+
+
+def test_fixed_step_stores_final_state_only():
+    t_range, y_init, params = tf.simple_params()
+    full = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, fixed_step=0.1)
+    last = pyode.RKExplicit(
+        tf.simple_func, t_range, y_init, params, fixed_step=0.1, store="none"
+    )
+    assert last.ysol.shape == (1, 1)
+    assert last.ysol[-1, 0] == full.ysol[-1, 0]
+
+
+def test_fixed_step_must_be_positive():
+    t_range, y_init, params = tf.simple_params()
+    with pytest.raises(ValueError):
+        pyode.RKExplicit(tf.simple_func, t_range, y_init, params, fixed_step=0.0)
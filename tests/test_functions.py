@@ -28,6 +28,10 @@ def simple_params():
     params = [4., 0.8, 0.5]
     return t_range, y_init, params
 
+def simple_exact(t):
+    c = 4. / 1.3
+    return c * np.exp(0.8 * t) + (2. - c) * np.exp(-0.5 * t)
+
 
 ###------------------------------###
 
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def test_estimate_matches_true_error():
+    t_range, y_init, params = tf.simple_params()
+    for tol in (1e-3, 1e-5):
+        sol = pyode.RKExplicit(
+            tf.simple_func,
+            t_range,
+            y_init,
+            params,
+            abstol=tol,
+            reltol=tol,
+            interp="No",
+            global_error="Yes",
+        )
+        true = sol.ysol[1:, 0] - tf.simple_exact(sol.tsol[1:])
+        est = sol.stats["global error"][1:, 0]
+        assert np.all(np.abs(est / true - 1) < 0.2)
+
+
+def test_estimate_ignores_interpolated_end_point():
+    t_range, y_init, params = tf.simple_params()
+    norms = [
+        pyode.RKExplicit(
+            tf.simple_func, t_range, y_init, params, interp=interp, global_error="Yes"
+        ).stats["global error norm"]
+        for interp in ("No", "Yes")
+    ]
+    assert norms[0] == norms[1]
+
+
+def test_target_error_is_met():
+    t_range, y_init, params = tf.simple_params()
+    for target in (1e-6, 1e-9):
+        sol = pyode.RKTarget(
+            tf.simple_func, t_range, y_init, params, target, interp="No"
+        )
+        assert sol.stats["target met"]
+        rel = np.abs(sol.ysol[:, 0] - tf.simple_exact(sol.tsol)) / np.abs(sol.ysol[:, 0])
+        assert np.max(rel) < 10 * target
+
+
+def test_global_error_needs_stored_trajectory():
+    t_range, y_init, params = tf.simple_params()
+    with pytest.raises(ValueError):
+        pyode.RKExplicit(
+            tf.simple_func, t_range, y_init, params, store="none", global_error="Yes"
+        )
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from pyode import pyode
+
+lam = np.array([-1000.0, -1.0])
+
+
+def forcing(t, y, p):
+    return np.cos(t) * np.ones_like(y)
+
+
+def stiff(t, y, p):
+    return lam * y
+
+
+def stiff_jac(t, y, p):
+    return np.diag(lam)
+
+
+def exact(t, y0):
+    # y' = lam y + cos(t), componentwise
+    A = -lam / (lam**2 + 1)
+    B = 1 / (lam**2 + 1)
+    return np.exp(lam * t) * (y0 - A) + A * np.cos(t) + B * np.sin(t)
+
+
+@pytest.mark.parametrize("method", ["ARK43", "ARK54"])
+def test_imex_matches_exact_solution(method):
+    y0 = np.array([1.0, 1.0])
+    errs = []
+    for tol in (1e-3, 1e-4):
+        tsol, ysol, stats = pyode.RKIMEX(
+            forcing, stiff, [0.0, 2.0], y0, [], method=method, abstol=tol, reltol=tol
+        )
+        assert tsol[-1] == 2.0
+        errs.append(np.max(np.abs(ysol - np.array([exact(t, y0) for t in tsol]))))
+    assert errs[0] < 1e-3
+    assert errs[1] < errs[0]
+
+
+def test_step_size_is_not_limited_by_stiff_part():
+    y0 = np.array([1.0, 1.0])
+    tsol, ysol, stats = pyode.RKIMEX(forcing, stiff, [0.0, 2.0], y0, [])
+    single = pyode.RKExplicit(
+        lambda t, y, p: forcing(t, y, p) + stiff(t, y, p), [0.0, 2.0], y0, []
+    )
+    assert 2 * stats["total steps"] < single.stats["total steps"]
+    # The linear stiff part needs one Jacobian, factors are reused across steps
+    assert stats["jacobian evaluations"] == 1
+    assert stats["factorizations"] < stats["total steps"]
+
+
+def test_jacobian_and_newton_krylov_agree():
+    y0 = np.array([1.0, 1.0])
+    args = (forcing, stiff, [0.0, 2.0], y0, [])
+    t1, y1, s1 = pyode.RKIMEX(*args)
+    t2, y2, s2 = pyode.RKIMEX(*args, jac=stiff_jac)
+    t3, y3, s3 = pyode.RKIMEX(*args, newton="Krylov")
+    assert s2["implicit evaluations"] < s1["implicit evaluations"]
+    for t, y in ((t1, y1), (t2, y2), (t3, y3)):
+        assert np.max(np.abs(y[-1] - exact(2.0, y0))) < 1e-4
+    assert s3["linear iterations"] > 0
+
+
+def test_unknown_method_and_solver():
+    args = (forcing, stiff, [0.0, 1.0], [1.0, 1.0], [])
+    with pytest.raises(RuntimeError):
+        pyode.RKIMEX(*args, method="ARK32")
+    with pytest.raises(RuntimeError):
+        pyode.RKIMEX(*args, newton="GMRES")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+from interpolation import Resample
+
+
+def trajectory():
+    t = np.linspace(0.0, 1.0, 11)
+    y = np.stack((t**2, t**3), axis=1)
+    return t, y, np.stack((2 * t, 3 * t**2), axis=1)
+
+
+def test_methods_reproduce_polynomials():
+    t, y, dy = trajectory()
+    tq = np.array([0.05, 0.33, 0.999])
+    rs = Resample(t, y, dy)
+    assert np.allclose(rs.linear(tq)[:, 0], tq**2, atol=3e-3)
+    assert np.allclose(rs.quadratic(tq)[:, 0], tq**2, atol=1e-12)
+    assert np.allclose(rs.cubic(tq), np.stack((tq**2, tq**3), axis=1), atol=1e-12)
+
+
+@pytest.mark.parametrize("kind", ["linear", "quadratic", "cubic"])
+def test_query_shape_is_kept(kind):
+    t, y, dy = trajectory()
+    rs = Resample(t, y, dy)
+    method = getattr(rs, kind)
+    assert method(0.5).shape == (2,)
+    assert method([0.5]).shape == (1, 2)
+    grid = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+    yq = method(grid)
+    assert yq.shape == (2, 3, 2)
+    assert np.allclose(yq[1, 1], method(0.5))
+
+
+def test_solution_resample():
+    t_range, y_init, params = tf.simple_params()
+    sol = pyode.RKExplicit(
+        tf.simple_func, t_range, y_init, params, abstol=1e-8, reltol=1e-6, interp="No"
+    )
+    tq = np.linspace(0.0, 2.0, 7)
+    for kind in ("Linear", "Quadratic", "Cubic"):
+        assert sol.resample(1.0, kind).shape == (1,)
+        yq = sol.resample(tq, kind)
+        assert np.allclose(yq[:, 0], tf.simple_exact(tq), rtol=1e-2)
+    assert np.allclose(sol(tq)[:, 0], tf.simple_exact(tq), rtol=1e-5)
+    with pytest.raises(RuntimeError):
+        sol.resample(tq, "Spline")
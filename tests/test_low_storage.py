@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+METHODS = ("2N-RK3", "2N-RK4", "2R-RK4", "2R-RK5")
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_low_storage_matches_exact_solution(method):
+    t_range, y_init, params = tf.simple_params()
+    errs = []
+    for tol in (1e-3, 1e-5):
+        tsol, ysol, stats = pyode.RKLowStorage(
+            tf.simple_func, t_range, y_init, params, method=method, abstol=tol, reltol=tol
+        )
+        assert tsol[-1] == t_range[-1]
+        errs.append(np.max(np.abs(ysol[:, 0] - tf.simple_exact(tsol))))
+    assert errs[0] < 1e-5
+    assert errs[1] < errs[0]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_low_storage_store_policies(method):
+    t_range, y_init, params = tf.simple_params()
+    args = (tf.simple_func, t_range, y_init, params, method)
+    tsol, ysol, stats = pyode.RKLowStorage(*args, store="y")
+    tlast, ylast, _ = pyode.RKLowStorage(*args, store="none")
+    tk, yk, _ = pyode.RKLowStorage(*args, store=3)
+
+    assert len(tsol) == stats["total steps"]
+    assert ylast.shape == (1, 1)
+    assert ylast[0, 0] == ysol[-1, 0]
+    assert np.array_equal(tk[:-1], tsol[::3][: len(tk) - 1])
+    assert tk[-1] == tsol[-1]
+
+
+def test_low_storage_rejects_unknown_store():
+    t_range, y_init, params = tf.simple_params()
+    with pytest.raises(RuntimeError):
+        pyode.RKLowStorage(tf.simple_func, t_range, y_init, params, store="all")
+    with pytest.raises(ValueError):
+        pyode.RKLowStorage(tf.simple_func, t_range, y_init, params, store=0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from pyode import pyode
+
+
+def relax_func(t, y, p):
+    # Slow y[0] driven by the fast y[1], which relaxes onto cos(t) at rate p[0]
+    return np.array([y[1] - y[0], -p[0] * (y[1] - np.cos(t))])
+
+
+def relax_fast(t, y, p):
+    return np.array([-p[0] * (y[1] - np.cos(t))])
+
+
+def relax_exact(t, k, s0=1.0, z0=0.0):
+    A = k * k / (k * k + 1)
+    B = k / (k * k + 1)
+    C = z0 - A
+    z = A * np.cos(t) + B * np.sin(t) + C * np.exp(-k * t)
+
+    def I(t):
+        return (
+            A * np.exp(t) * (np.cos(t) + np.sin(t)) / 2
+            + B * np.exp(t) * (np.sin(t) - np.cos(t)) / 2
+            + C * np.exp((1 - k) * t) / (1 - k)
+        )
+
+    s = np.exp(-t) * (s0 + I(t) - I(0))
+    return np.array([s, z])
+
+
+def test_multirate_matches_exact_solution():
+    k = 1000.0
+    tsol, ysol, stats = pyode.RKMultirate(
+        relax_func, [0.0, 2.0], [1.0, 0.0], [k], [1], func_fast=relax_fast
+    )
+    assert tsol[-1] == 2.0
+    exact = np.array([relax_exact(t, k) for t in tsol])
+    assert np.max(np.abs(ysol - exact)) < 1e-5
+
+
+def test_macro_step_is_not_tied_to_fast_scale():
+    k = 1000.0
+    tsol, ysol, stats = pyode.RKMultirate(
+        relax_func, [0.0, 2.0], [1.0, 0.0], [k], [1], func_fast=relax_fast
+    )
+    single = pyode.RKExplicit(relax_func, [0.0, 2.0], [1.0, 0.0], [k])
+    assert 5 * stats["total steps"] < single.stats["total steps"]
+    # Each step of RKExplicit takes several evaluations of the full f
+    assert stats["slow evaluations"] < single.stats["total steps"]
+
+
+def test_fast_rhs_from_full_rhs():
+    args = (relax_func, [0.0, 1.0], [1.0, 0.0], [100.0], [1])
+    t1, y1, s1 = pyode.RKMultirate(*args, func_fast=relax_fast)
+    t2, y2, s2 = pyode.RKMultirate(*args)
+    assert np.array_equal(t1, t2)
+    assert np.allclose(y1, y2, rtol=1e-12, atol=1e-14)
+
+
+def test_fast_components_must_be_proper_subset():
+    with pytest.raises(ValueError):
+        pyode.RKMultirate(relax_func, [0.0, 1.0], [1.0, 0.0], [1.0], [0, 1])
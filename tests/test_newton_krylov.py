@@ -0,0 +1,59 @@
+import numpy as np
+from pyode import pyode
+from newton_krylov import gmres, NewtonKrylov
+
+
+def laplacian(n):
+    dx = 1.0 / (n + 1)
+    return (
+        np.diag(-2 * np.ones(n)) + np.diag(np.ones(n - 1), 1) + np.diag(np.ones(n - 1), -1)
+    ) / dx**2
+
+
+def test_gmres_solves_nonsymmetric_system():
+    rng = np.random.default_rng(1)
+    n = 40
+    A = np.eye(n) * 4 + rng.standard_normal((n, n)) / np.sqrt(n)
+    b = rng.standard_normal(n)
+    for restart in (5, 40):
+        x, niter = gmres(lambda v: A @ v, b, 1e-10, restart)
+        assert np.sqrt(np.sum((A @ x - b) ** 2)) <= 1e-10
+    # Exact preconditioner: one iteration
+    Ainv = np.linalg.inv(A)
+    x, niter = gmres(lambda v: A @ v, b, 1e-8, precond=lambda v: Ainv @ v)
+    assert niter == 1
+    assert np.allclose(A @ x, b)
+
+
+def test_newton_krylov_solves_nonlinear_system():
+    # x + x^3 = c componentwise
+    c = np.linspace(0.5, 10.0, 20)
+    nk = NewtonKrylov()
+    F = lambda Y: Y + Y**3 - c
+    norm = lambda Y, dY: np.max(np.abs(dY))
+    # Newton without line search needs a start near the root, as a stage
+    # predictor gives it
+    Y = nk.solve(F, np.cbrt(c), norm, 1e-10)
+    assert Y is not None
+    assert np.max(np.abs(F(Y))) < 1e-9
+    assert nk.nlin > 0
+
+
+def test_newton_krylov_stages_match_direct_stages():
+    n = 50
+    A = laplacian(n)
+    x = np.arange(1, n + 1) / (n + 1)
+    fe = lambda t, y, p: p[0] * y * (1 - y)
+    fi = lambda t, y, p: A @ y
+    args = (fe, fi, [0.0, 0.05], np.sin(np.pi * x), [1.0])
+    t1, y1, s1 = pyode.RKIMEX(*args, jac=lambda t, y, p: A)
+    t2, y2, s2 = pyode.RKIMEX(*args, newton="Krylov")
+    assert abs(t1[-1] - t2[-1]) == 0.0
+    assert np.max(np.abs(y1[-1] - y2[-1])) < 1e-5
+    assert s2["jacobian evaluations"] == 0
+
+    # (I - hg A)^{-1} as preconditioner cuts the linear iterations
+    precond = lambda t, y, hg, v, p: np.linalg.solve(np.eye(n) - hg * A, v)
+    t3, y3, s3 = pyode.RKIMEX(*args, newton="Krylov", precond=precond)
+    assert np.max(np.abs(y1[-1] - y3[-1])) < 1e-5
+    assert s3["linear iterations"] < s2["linear iterations"]
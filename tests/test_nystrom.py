@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from pyode import pyode
+
+
+def spring(t, y, p):
+    return -p[0] * y
+
+
+def damped(t, y, yp, p):
+    return -p[0] * y - p[1] * yp
+
+
+@pytest.mark.parametrize("method", ("Default", "rkn43"))
+def test_nystrom_matches_harmonic_oscillator(method):
+    errs = []
+    for tol in (1e-4, 1e-6):
+        tsol, ysol, ypsol, stats = pyode.RKNystrom(
+            spring, [0.0, 10.0], [1.0], [0.0], [4.0], method=method, abstol=tol, reltol=tol
+        )
+        assert tsol[-1] == 10.0
+        err = max(
+            np.max(np.abs(ysol[:, 0] - np.cos(2 * tsol))),
+            np.max(np.abs(ypsol[:, 0] + 2 * np.sin(2 * tsol))),
+        )
+        errs.append(err)
+    assert errs[0] < 1e-4
+    assert errs[1] < errs[0]
+
+
+def test_nystrom_with_velocity_dependence():
+    k, c = 4.0, 0.5
+    tsol, ysol, ypsol, stats = pyode.RKNystrom(
+        damped, [0.0, 5.0], [1.0], [0.0], [k, c], abstol=1e-8, reltol=1e-6, velocity="Yes"
+    )
+    w = np.sqrt(k - c**2 / 4)
+    exact = np.exp(-c * tsol / 2) * (np.cos(w * tsol) + c / (2 * w) * np.sin(w * tsol))
+    assert np.max(np.abs(ysol[:, 0] - exact)) < 1e-6
+
+
+def test_nystrom_pairs_need_position_only_rhs():
+    with pytest.raises(RuntimeError):
+        pyode.RKNystrom(damped, [0.0, 1.0], [1.0], [0.0], [4.0, 0.5], method="rkn43", velocity="Yes")
@@ -0,0 +1,60 @@
+import numpy as np
+from pyode import pyode
+import test_functions as tf
+
+
+def first(t, y, p):
+    return y[0]
+
+
+def simple_integral(T):
+    c = 4.0 / 1.3
+    return c / 0.8 * (np.exp(0.8 * T) - 1) + (2.0 - c) / 0.5 * (1 - np.exp(-0.5 * T))
+
+
+def solve(observables, **kwargs):
+    t_range, y_init, params = tf.simple_params()
+    return pyode.RKExplicit(
+        tf.simple_func,
+        t_range,
+        y_init,
+        params,
+        abstol=1e-8,
+        reltol=1e-6,
+        observables=observables,
+        **kwargs
+    )
+
+
+def test_integral_and_time_average():
+    sol = solve({"int": pyode.Integral(first), "avg": pyode.TimeAverage(first)})
+    exact = simple_integral(2.0)
+    assert abs(sol.observables["int"] - exact) < 1e-6 * exact
+    assert abs(sol.observables["avg"] - exact / 2.0) < 1e-6 * exact
+
+
+def test_extrema_over_accepted_steps():
+    sol = solve({"min": pyode.Minimum(first), "max": pyode.Maximum(first)})
+    assert sol.observables["min"] == np.min(sol.ysol[:, 0])
+    assert sol.observables["max"] == np.max(sol.ysol[:, 0])
+
+
+def test_plain_observer_keeps_every_sample():
+    sol = solve({"y": pyode.Observer(first)})
+    times, values = sol.observables["y"]
+    assert np.array_equal(times, sol.tsol)
+    assert np.array_equal(values, sol.ysol[:, 0])
+
+
+def test_grid_samples_from_dense_output():
+    grid = np.linspace(0.0, 2.0, 9)
+    sol = solve({"y": pyode.Observer(first, grid=grid)}, store="none")
+    times, values = sol.observables["y"]
+    assert np.array_equal(times, grid)
+    assert np.max(np.abs(values - tf.simple_exact(grid))) < 1e-6
+
+
+def test_user_reduction():
+    count = pyode.Reduction(first, lambda acc, t, g: acc + 1, 0)
+    sol = solve({"n": count})
+    assert sol.observables["n"] == len(sol.tsol)
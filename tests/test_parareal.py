@@ -0,0 +1,39 @@
+import numpy as np
+from pyode import pyode
+import test_functions as tf
+
+
+def test_parareal_matches_exact_solution():
+    t_range, y_init, params = tf.simple_params()
+    tsol, ysol, stats = pyode.RKParareal(
+        tf.simple_func,
+        t_range,
+        y_init,
+        params,
+        abstol=1e-8,
+        reltol=1e-6,
+        slices=4,
+        workers=1,
+    )
+    assert stats["converged"]
+    assert tsol[0] == t_range[0] and tsol[-1] == t_range[-1]
+    assert np.all(np.diff(tsol) > 0)
+    assert np.max(np.abs(ysol[:, 0] - tf.simple_exact(tsol))) < 1e-6 * np.max(ysol)
+
+
+def test_parareal_process_pool_matches_serial():
+    t_range, y_init, params = tf.vdp_params()
+    args = (tf.vdp_func, [0.0, 4.0], y_init, params)
+    t1, y1, s1 = pyode.RKParareal(*args, slices=4, workers=1)
+    t2, y2, s2 = pyode.RKParareal(*args, slices=4, workers=2)
+    assert np.array_equal(t1, t2)
+    assert np.allclose(y1, y2, rtol=1e-12, atol=1e-12)
+    assert s1["parareal iterations"] == s2["parareal iterations"]
+
+
+def test_parareal_iterations_bounded_by_slices():
+    t_range, y_init, params = tf.vdp_params()
+    tsol, ysol, stats = pyode.RKParareal(
+        tf.vdp_func, t_range, y_init, params, slices=3, workers=1, maxiter=2
+    )
+    assert stats["parareal iterations"] <= 2
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def ramp(t, y, p):
+    # Integrated exactly by every tableau, so any tolerance is met
+    return np.ones_like(y)
+
+
+def test_single_and_mixed_track_double():
+    t_range, y_init, params = tf.simple_params()
+    ref = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, interp="No")
+    for precision in ("Single", "Mixed"):
+        sol = pyode.RKExplicit(
+            tf.simple_func, t_range, y_init, params, interp="No", precision=precision
+        )
+        assert sol.ysol.dtype == np.float32
+        assert abs(sol.ysol[-1, 0] / ref.ysol[-1, 0] - 1) < 1e-3
+
+
+def test_double_accepts_tight_tolerance():
+    sol = pyode.RKExplicit(ramp, [0.0, 1.0], [0.0], [], reltol=1e-15, interp="No")
+    assert abs(sol.ysol[-1, 0] - sol.tsol[-1]) < 1e-12
+    sols = pyode.RKEnsemble(ramp, [0.0, 1.0], [[0.0], [1.0]], [], reltol=1e-15)
+    assert all(s.stats["success"] for s in sols)
+
+
+@pytest.mark.parametrize("precision", ["Single", "Mixed"])
+def test_single_rejects_unresolvable_tolerance(precision):
+    with pytest.raises(ValueError):
+        pyode.RKExplicit(ramp, [0.0, 1.0], [0.0], [], reltol=1e-6, precision=precision)
+    with pytest.raises(ValueError):
+        pyode.RKEnsemble(ramp, [0.0, 1.0], [[0.0]], [], reltol=1e-6, precision=precision)
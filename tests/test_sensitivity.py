@@ -0,0 +1,43 @@
+import numpy as np
+from pyode import pyode
+import test_functions as tf
+
+
+def decay_func(t, y, p):
+    return np.array([-p[0] * y[0], p[1] * y[0] - y[1]])
+
+
+def test_sensitivity_matches_analytic():
+    sol = pyode.RKSensitivity(
+        decay_func, [0.0, 2.0], [1.0, 0.0], [1.5, 0.7], abstol=1e-6, reltol=1e-4
+    )
+    t = sol.tsol
+    assert sol.ssol.shape == (len(t), 2, 2)
+    exact = -t * np.exp(-1.5 * t)
+    assert np.max(np.abs(sol.ssol[:, 0, 0] - exact)) < 1e-7
+    assert np.all(sol.ssol[:, 0, 1] == 0.0)
+
+
+def simple_end(p, t=2.0, y0=2.0):
+    c = p[0] / (p[1] + p[2])
+    return c * (np.exp(p[1] * t) - np.exp(-p[2] * t)) + y0 * np.exp(-p[2] * t)
+
+
+def test_sensitivity_matches_finite_differences():
+    t_range, y_init, params = tf.simple_params()
+    for errcon in ("No", "Yes"):
+        sol = pyode.RKSensitivity(
+            tf.simple_func,
+            t_range,
+            y_init,
+            params,
+            abstol=1e-6,
+            reltol=1e-4,
+            errcon=errcon,
+        )
+        assert sol.tsol[-1] == t_range[-1]
+        for j in range(len(params)):
+            dp = np.zeros(len(params))
+            dp[j] = 1e-6
+            fd = (simple_end(params + dp) - simple_end(params - dp)) / 2e-6
+            assert abs(sol.ssol[-1, 0, j] - fd) < 1e-6 * max(1.0, abs(fd))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def test_solution_behaves_as_result_tuple():
+    t_range, y_init, params = tf.simple_params()
+    sol = pyode.RKExplicit(tf.simple_func, t_range, y_init, params)
+    tsol, ysol, yhatsol, stats = sol
+    assert len(sol) == 4
+    assert sol[0] is tsol and sol[1] is ysol and sol[2] is yhatsol and sol[3] is stats
+    assert sol[-1] is stats
+    assert tuple(sol[1:3]) == (ysol, yhatsol)
+
+
+def test_error_estimate_without_stored_yhat():
+    t_range, y_init, params = tf.simple_params()
+    full = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, interp="No")
+    lean = pyode.RKExplicit(
+        tf.simple_func, t_range, y_init, params, interp="No", store="y"
+    )
+    assert lean.yhatsol is None
+    assert np.array_equal(lean.ysol, full.ysol)
+    assert np.allclose(lean.errsol, full.ysol - full.yhatsol, rtol=1e-10, atol=1e-14)
+
+
+def test_dense_output():
+    t_range, y_init, params = tf.simple_params()
+    sol = pyode.RKExplicit(
+        tf.simple_func, t_range, y_init, params, abstol=1e-8, reltol=1e-6, interp="No"
+    )
+    tq = np.linspace(0.0, 2.0, 41)
+    assert sol(tq).shape == (41, 1)
+    assert np.max(np.abs(sol(tq)[:, 0] - tf.simple_exact(tq))) < 1e-6
+    assert np.shape(sol(1.0)) == (1,)
+    assert abs(sol(1.0)[0] - tf.simple_exact(1.0)) < 1e-6
+
+
+def test_final_state_only():
+    t_range, y_init, params = tf.simple_params()
+    sol = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, store="none")
+    assert sol.ysol.shape == (1, 1)
+    with pytest.raises(RuntimeError):
+        sol.errsol
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from pyode import pyode
+from structured import Layout
+
+
+def oscillator(t, y, p):
+    return {"x": y["v"], "v": -p[0] * y["x"]}
+
+
+def oscillator_inplace(t, y, p, dy):
+    dy["x"][:] = y["v"]
+    dy["v"][:] = -p[0] * y["x"]
+
+
+def oscillator_flat(t, y, p):
+    return np.concatenate((y[2:], -p[0] * y[:2]))
+
+
+def state():
+    return {"x": np.array([1.0, 0.0]), "v": np.array([0.0, 1.0])}
+
+
+def test_layout_round_trip():
+    tree = ({"a": np.arange(6.0).reshape(2, 3)}, [1.0, 2.0], 3.0)
+    layout = Layout(tree)
+    y = layout.flatten(tree)
+    assert y.shape == (9,)
+    back = layout.unflatten(y)
+    assert np.array_equal(back[0]["a"], tree[0]["a"])
+    assert np.array_equal(back[1], [1.0, 2.0])
+    # Views, not copies, also with a leading axis
+    ys = np.stack([y, 2 * y])
+    leaves = layout.unflatten(ys)
+    assert leaves[0]["a"].shape == (2, 2, 3)
+    assert np.shares_memory(leaves[0]["a"], ys)
+    with pytest.raises(ValueError):
+        layout.flatten(({"a": np.zeros(3)}, [1.0, 2.0], 3.0))
+
+
+def test_structured_solve_matches_flat_solve():
+    flat = pyode.RKExplicit(
+        oscillator_flat, [0.0, 2.0], [1.0, 0.0, 0.0, 1.0], [4.0], interp="No"
+    )
+    for func in (oscillator, oscillator_inplace):
+        sol = pyode.RKExplicit(func, [0.0, 2.0], state(), [4.0], interp="No")
+        assert np.array_equal(sol.tsol, flat.tsol)
+        assert np.allclose(sol.ysol, flat.ysol, rtol=1e-13, atol=1e-15)
+        tree = sol.ytree
+        assert tree["x"].shape == (len(sol.tsol), 2)
+        assert np.allclose(tree["x"][:, 0], np.cos(2 * sol.tsol), atol=1e-4)
+
+
+def test_ytree_needs_structured_state():
+    sol = pyode.RKExplicit(oscillator_flat, [0.0, 1.0], [1.0, 0.0, 0.0, 1.0], [4.0])
+    with pytest.raises(RuntimeError):
+        sol.ytree
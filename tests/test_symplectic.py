@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from pyode import pyode
+
+
+def spring_force(t, q, p):
+    return p[0] * q
+
+
+def energy(q, p, k=1.0):
+    return 0.5 * np.sum(p**2, axis=-1) + 0.5 * k * np.sum(q**2, axis=-1)
+
+
+@pytest.mark.parametrize(
+    "method, order",
+    (("Verlet", 2), ("Yoshida4", 4), ("Forest-Ruth", 4), ("Yoshida6", 6)),
+)
+def test_symplectic_convergence_order(method, order):
+    errs = []
+    for h in (0.2, 0.1):
+        tsol, qsol, psol, stats = pyode.RKSymplectic(
+            spring_force, [0.0, 2.0], [1.0], [0.0], [1.0], h, method=method
+        )
+        assert tsol[-1] == 2.0
+        errs.append(abs(qsol[-1, 0] - np.cos(2.0)))
+    assert np.log2(errs[0] / errs[1]) > order - 0.5
+
+
+def test_energy_error_stays_bounded():
+    tsol, qsol, psol, stats = pyode.RKSymplectic(
+        spring_force, [0.0, 1000.0], [1.0], [0.0], [1.0], 0.1, method="Verlet"
+    )
+    drift = np.abs(energy(qsol, psol) - 0.5)
+    # Bounded oscillation, no secular growth
+    assert np.max(drift) < 0.01
+    assert np.max(drift[-1000:]) < 1.5 * np.max(drift[:1000])
+
+
+def test_symplectic_rejects_unknown_method():
+    with pytest.raises(RuntimeError):
+        pyode.RKSymplectic(spring_force, [0.0, 1.0], [1.0], [0.0], [1.0], 0.1, method="euler")
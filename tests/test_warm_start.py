@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from pyode import pyode
+import test_functions as tf
+
+
+def test_sweep_with_warm_start_rejects_fewer_steps():
+    t_range, y_init, params = tf.vdp_params()
+    cold = warm = 0
+    prev = None
+    for mu in np.linspace(1.0, 1.2, 11):
+        sol = pyode.RKExplicit(tf.vdp_func, t_range, y_init, [mu], interp="No")
+        cold += sol.stats["failed steps"]
+        if prev is not None:
+            sol = pyode.RKExplicit(
+                tf.vdp_func, t_range, y_init, [mu], interp="No", warm_start=prev
+            )
+            warm += sol.stats["failed steps"]
+        prev = sol
+    assert 2 * warm < cold
+
+
+def test_warm_start_keeps_accuracy():
+    t_range, y_init, params = tf.simple_params()
+    cold = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, interp="No")
+    warm = pyode.RKExplicit(
+        tf.simple_func, t_range, y_init, params, interp="No", warm_start=cold
+    )
+    for sol in (cold, warm):
+        i = sol.tsol <= t_range[-1]
+        err = np.abs(sol.ysol[i, 0] - tf.simple_exact(sol.tsol[i]))
+        assert np.max(err / np.abs(sol.ysol[i, 0])) < 1e-4
+
+
+def test_warm_start_needs_stored_trajectory():
+    t_range, y_init, params = tf.simple_params()
+    sol = pyode.RKExplicit(tf.simple_func, t_range, y_init, params, store="none")
+    with pytest.raises(ValueError):
+        pyode.RKExplicit(tf.simple_func, t_range, y_init, params, warm_start=sol)